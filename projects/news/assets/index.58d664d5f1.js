@@ -0,0 +1,33 @@
+// 互動效果
+document.addEventListener('DOMContentLoaded', function() {
+    // 統計數字動畫
+    const statNumbers = document.querySelectorAll('.stat-number');
+    statNumbers.forEach(stat => {
+        stat.addEventListener('mouseenter', function() {
+            this.style.transform = 'scale(1.1)';
+        });
+        stat.addEventListener('mouseleave', function() {
+            this.style.transform = 'scale(1)';
+        });
+    });
+
+    // 禁用連結點擊
+    const disabledLinks = document.querySelectorAll('.news-link.disabled');
+    disabledLinks.forEach(link => {
+        link.addEventListener('click', function(e) {
+            e.preventDefault();
+        });
+    });
+
+    // 頁面載入動畫
+    const newsItems = document.querySelectorAll('.news-item');
+    newsItems.forEach((item, index) => {
+        item.style.opacity = '0';
+        item.style.transform = 'translateY(20px)';
+        setTimeout(() => {
+            item.style.transition = 'all 0.6s ease';
+            item.style.opacity = '1';
+            item.style.transform = 'translateY(0)';
+        }, index * 200);
+    });
+});
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+錄製基準測試用的 fixture
+- --rss：從 RSS_SOURCES 下載目前的 feed，存成 fixtures/rss/<來源>.xml
+- --llm：從 execution_log.json 取出數據煉金術師 / 科技導讀人 / 總編輯的輸出，存成 fixtures/llm/<階段>.txt
+
+錄製 RSS 時會同時更新 fixtures/fixtures.json 的 target_date（錄製當天的台灣日期），
+讓篩選器把剛錄下的新聞視為昨天的新聞
+
+使用方式（在 projects/news 目錄下）：
+    python benchmarks/record_fixtures.py --rss technews techcrunch bair
+    python benchmarks/record_fixtures.py --llm --execution-log execution_log.json
+"""
+
+import sys
+import json
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import requests
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / 'scripts'))
+
+from rss_fetcher import RSS_SOURCES, RSS_FETCH_TIMEOUT
+from utils import get_taiwan_date
+
+FIXTURES_DIR = BENCH_DIR / 'fixtures'
+FIXTURES_META = FIXTURES_DIR / 'fixtures.json'
+
+# execution_log.json 的節點名稱 → fixture 名稱
+LLM_NODES = {
+    '數據煉金術師 (Gemini)': 'alchemist',
+    '科技導讀人 (OpenAI)': 'narrator',
+    '總編輯 (OpenAI)': 'editor',
+}
+
+
+def load_meta() -> Dict:
+    if not FIXTURES_META.exists():
+        return {}
+    with open(FIXTURES_META, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_meta(meta: Dict):
+    with open(FIXTURES_META, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def record_rss(sources: List[str]):
+    """下載 feed 原始內容（不解析，保留真實的 XML 結構）"""
+    (FIXTURES_DIR / 'rss').mkdir(parents=True, exist_ok=True)
+    recorded = {}
+    for source in sources:
+        response = requests.get(RSS_SOURCES[source], timeout=RSS_FETCH_TIMEOUT)
+        response.raise_for_status()
+        (FIXTURES_DIR / 'rss' / f"{source}.xml").write_bytes(response.content)
+        recorded[source] = RSS_SOURCES[source]
+        print(f"✅ {source}: {len(response.content):,} bytes")
+
+    meta = load_meta()
+    meta['target_date'] = get_taiwan_date()
+    meta['recorded_at'] = datetime.now().isoformat(timespec='seconds')
+    meta.setdefault('rss', {}).update(recorded)
+    save_meta(meta)
+
+
+def strip_truncation(data):
+    """移除 ExecutionLogger 截斷列表時加入的「... 還有 N 項」標記"""
+    if isinstance(data, dict):
+        return {key: strip_truncation(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [strip_truncation(item) for item in data if not (isinstance(item, str) and item.startswith('... 還有'))]
+    return data
+
+
+def record_llm(execution_log: Path):
+    """以 LLM 回應的格式（```json 區塊）保存各 AI 節點的輸出"""
+    with open(execution_log, 'r', encoding='utf-8') as f:
+        nodes = json.load(f)['nodes']
+
+    (FIXTURES_DIR / 'llm').mkdir(parents=True, exist_ok=True)
+    for node in nodes:
+        stage = LLM_NODES.get(node['name'])
+        if stage is None or not isinstance(node.get('output'), dict):
+            continue
+        output = json.dumps(strip_truncation(node['output']), ensure_ascii=False, indent=2)
+        (FIXTURES_DIR / 'llm' / f"{stage}.txt").write_text(f"```json\n{output}\n```\n", encoding='utf-8')
+        print(f"✅ {stage}: {node['name']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="錄製基準測試 fixture")
+    parser.add_argument('--rss', nargs='*', metavar='SOURCE', choices=sorted(RSS_SOURCES),
+                        help="下載指定來源（不指定則為 fixtures/rss 中已有的來源）")
+    parser.add_argument('--llm', action='store_true', help="從執行日誌取出 AI 節點輸出")
+    parser.add_argument('--execution-log', default='execution_log.json', help="執行日誌路徑")
+    args = parser.parse_args(argv)
+
+    if args.rss is None and not args.llm:
+        parser.error("請指定 --rss 或 --llm")
+
+    if args.rss is not None:
+        sources = args.rss or sorted(path.stem for path in (FIXTURES_DIR / 'rss').glob('*.xml'))
+        record_rss(sources)
+    if args.llm:
+        record_llm(Path(args.execution_log))
+
+
+if __name__ == "__main__":
+    main()
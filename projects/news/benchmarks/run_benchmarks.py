@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+流程各階段的基準測試
+以錄製的 RSS XML 與 LLM 輸出為基礎，放大到不同的新聞數量，分別量測各階段耗時，
+並與 baselines.json 比較；任何階段比基準慢超過門檻時以非 0 結束
+
+量測的階段：
+- fetch_single_feed           RSS 下載（本機 HTTP）+ feedparser 完整解析
+- fetch_single_feed[stream]   同上，串流解析目標日期區間
+- filter_and_score_news       篩選與評分
+- validate_json_output        數據煉金術師輸出的 JSON 驗證
+- generate_daily_html         今日頁面（本地 Markdown 轉換）
+- update_index_html           首頁（一年份的 archive_manifest.json，與新聞數量無關，只量一次）
+- render_daily_pages          批次重建 BULK_RENDER_PAGES 天的歷史頁面（回報 pages/秒）
+- precompress                 PRECOMPRESS_PAGES 個頁面的 .gz / .br（每次先刪除壓縮檔，回報 pages/秒）
+- ExecutionLogger.save        執行日誌寫檔
+
+使用方式（在 projects/news 目錄下）：
+    python benchmarks/run_benchmarks.py                     # 全部大小（300 ~ 100k）
+    python benchmarks/run_benchmarks.py --sizes 300,3000    # 快速檢查
+    python benchmarks/run_benchmarks.py --update-baseline   # 以本次結果更新基準
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import logging
+import argparse
+import platform
+import statistics
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / 'scripts'))
+
+from rss_fetcher import fetch_single_feed, target_date_window, _parse_body
+from news_filter import filter_and_score_news
+from utils import validate_json_output
+from html_generator import generate_daily_html, update_index_html, render_daily_pages
+from precompress import precompress
+from execution_logger import ExecutionLogger
+
+FIXTURES_DIR = BENCH_DIR / 'fixtures'
+BASELINES_PATH = BENCH_DIR / 'baselines.json'
+
+# 從約 300 則（平日的 RSS 量）到 100k 則
+DEFAULT_SIZES = (300, 3000, 30000, 100000)
+
+FIXTURES_META = FIXTURES_DIR / 'fixtures.json'
+
+# 篩選器的今日日期（錄製的 RSS 為前一天的新聞），由 record_fixtures.py 記錄
+TARGET_DATE = json.loads(FIXTURES_META.read_text(encoding='utf-8'))['target_date']
+
+# 比基準慢超過 25% 視為退步；差距小於 MIN_REGRESSION_SECONDS 的視為雜訊
+DEFAULT_THRESHOLD = 0.25
+MIN_REGRESSION_SECONDS = 0.005
+
+# 批次渲染量測的頁數（每頁為錄製日報的一般大小，約 30 則新聞）
+BULK_RENDER_PAGES = 200
+BULK_RENDER_ITEMS_PER_PAGE = 30
+PRECOMPRESS_PAGES = 50
+
+# 每個量測至少重複到 MIN_SAMPLES 次或累計 MIN_TOTAL_SECONDS 秒（先到者為準）
+MIN_SAMPLES = 5
+MIN_TOTAL_SECONDS = 2.0
+
+ENTRY_PATTERN = re.compile(rb'<(item|entry)\b.*?</\1>', re.DOTALL)
+
+
+# ============================================
+# 工作負載
+# ============================================
+
+def load_feed_templates() -> Dict[str, bytes]:
+    """讀取錄製的 RSS / Atom（檔名即來源名稱）"""
+    return {path.stem: path.read_bytes() for path in sorted((FIXTURES_DIR / 'rss').glob('*.xml'))}
+
+
+def scale_feed(body: bytes, count: int) -> bytes:
+    """
+    將錄製的 feed 放大為 count 則新聞：依序複製原有的 <item> / <entry>，
+    連結與標題加上序號，讓每則新聞都不重複
+
+    Args:
+        body: 錄製的 RSS / Atom 內容
+        count: 目標新聞數
+
+    Returns:
+        放大後的 feed 內容
+    """
+    entries = [match.group(0) for match in ENTRY_PATTERN.finditer(body)]
+    head = body[:body.index(entries[0])]
+    tail = body[body.rindex(entries[-1]) + len(entries[-1]):]
+
+    copies = []
+    for index in range(count):
+        entry = entries[index % len(entries)]
+        if index >= len(entries):
+            suffix = f"-{index}".encode()
+            entry = re.sub(rb'(<link>[^<]*?)/?(</link>)', rb'\1' + suffix + rb'\2', entry, count=1)
+            entry = re.sub(rb'(<link href="[^"]*?)/?(")', rb'\1' + suffix + rb'\2', entry, count=1)
+            entry = re.sub(rb'(<title>[^<]*)(</title>)', rb'\1 #' + str(index).encode() + rb'\2', entry, count=1)
+        copies.append(entry)
+    return head + b'\n'.join(copies) + tail
+
+
+def build_feeds(size: int) -> Dict[str, bytes]:
+    """把 size 則新聞平均分配到各個錄製的來源"""
+    templates = load_feed_templates()
+    per_source, remainder = divmod(size, len(templates))
+    return {
+        source: scale_feed(body, per_source + (1 if index < remainder else 0))
+        for index, (source, body) in enumerate(templates.items())
+    }
+
+
+def load_llm_fixture(stage: str) -> str:
+    """錄製的 LLM 原始輸出（含 ```json 標記）"""
+    return (FIXTURES_DIR / 'llm' / f"{stage}.txt").read_text(encoding='utf-8')
+
+
+def parse_llm_fixture(stage: str) -> Dict:
+    raw = load_llm_fixture(stage)
+    return json.loads(raw[raw.index('{'):raw.rindex('}') + 1])
+
+
+def scale_alchemist(size: int) -> Dict:
+    """數據煉金術師的輸出放大為 size 則新聞（依序複製錄製的各分類項目）"""
+    recorded = parse_llm_fixture('alchemist')
+    categories = list(recorded.keys())
+    scaled = {category: [] for category in categories}
+    templates = [(category, item) for category in categories for item in recorded[category]]
+    for index in range(size):
+        category, item = templates[index % len(templates)]
+        scaled[category].append({
+            **item,
+            'rank': len(scaled[category]) + 1,
+            'link': f"{item.get('link', '')}#{index}"
+        })
+    return scaled
+
+
+def scale_final_output(size: int) -> Dict:
+    """
+    組出 generate_daily_html 的輸入：科技導讀人的日報內容放大到約 size 則新聞
+
+    Returns:
+        main.py 組裝的 final_output
+    """
+    notion = parse_llm_fixture('narrator')['notion_daily_report_text']
+    editor = parse_llm_fixture('editor')
+
+    # 日報由標頭、各則新聞（每則一個 🔗 原文連結）與 --- 之後的後記組成
+    first_section = notion.index('\n### ')
+    postscript = notion.rfind('\n---')
+    postscript = postscript if postscript > first_section else len(notion)
+    header, body, footer = notion[:first_section], notion[first_section:postscript], notion[postscript:]
+    per_copy = max(1, body.count('🔗'))
+    notion_content = header + body * math.ceil(size / per_copy) + footer
+
+    return {
+        'final_date': TARGET_DATE,
+        'notion_content': notion_content,
+        'line_content': editor.get('line_message_text', ''),
+        'learning_focus': editor.get('learning_focus_text', ''),
+        'website_url': f"https://thinkercafe-tw.github.io/thinker-news/{TARGET_DATE}.html"
+    }
+
+
+def build_execution_logger(size: int) -> ExecutionLogger:
+    """組出與 main.py 相同節點結構的執行日誌，AI 節點的輸出依 size 放大"""
+    exec_logger = ExecutionLogger()
+    final_output = scale_final_output(size)
+    nodes = [
+        ("生成台灣時間日期", "date", TARGET_DATE),
+        ("RSS Feed 讀取", "rss", {"total_items": size}),
+        ("台灣本地化篩選", "filter", {"filtered_items": size}),
+        ("數據煉金術師 (Gemini)", "ai", scale_alchemist(size)),
+        ("科技導讀人 (OpenAI)", "ai", {"notion_daily_report_text": final_output['notion_content']}),
+        ("總編輯 (OpenAI)", "ai", parse_llm_fixture('editor')),
+        ("HTML 生成", "html", {"files": [f"{TARGET_DATE}.html", "index.html", "latest.json"]}),
+    ]
+    for name, node_type, output in nodes:
+        exec_logger.log_node_start(name, node_type)
+        exec_logger.log_node_success(name, output, {"benchmark": True})
+    exec_logger.complete_execution("success")
+    return exec_logger
+
+
+class FeedServer:
+    """在本機以 HTTP 提供放大後的 feed（fetch_single_feed 走完整的下載 + 解析路徑）"""
+
+    def __init__(self, feeds: Dict[str, bytes]):
+        bodies = {f"/{source}.xml": body for source, body in feeds.items()}
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                body = bodies.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def url(self, source: str) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/{source}.xml"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# ============================================
+# 各階段的量測
+# ============================================
+
+# 每個階段：setup(size) 回傳 (要計時的函數, 清理函數)；size 為 None 代表與新聞數無關
+Stage = Callable[[Optional[int]], Tuple[Callable[[], object], Callable[[], None]]]
+
+
+def bench_fetch(streaming: bool) -> Stage:
+    def setup(size):
+        feeds = build_feeds(size)
+        server = FeedServer(feeds)
+        window = target_date_window(TARGET_DATE) if streaming else None
+
+        def run():
+            items = []
+            for source in feeds:
+                items.extend(fetch_single_feed(source, server.url(source), window=window))
+            return items
+
+        return run, server.close
+    return setup
+
+
+def bench_filter(size):
+    items = []
+    for source, body in build_feeds(size).items():
+        items.extend(_parse_body(source, body, {}, None))
+    return (lambda: filter_and_score_news(items, TARGET_DATE)), (lambda: None)
+
+
+def bench_validate(size):
+    raw = f"```json\n{json.dumps(scale_alchemist(size), ensure_ascii=False, indent=2)}\n```"
+    return (lambda: validate_json_output(raw, "數據煉金術師")), (lambda: None)
+
+
+def bench_daily_html(size):
+    final_output = scale_final_output(size)
+    return (lambda: generate_daily_html(final_output)), (lambda: None)
+
+
+def bench_index_html(size):
+    # 一年份的 archive_manifest.json（首頁列出近期各期與每月歷史日報頁的連結）
+    target = datetime.strptime(TARGET_DATE, '%Y-%m-%d')
+    issues = [
+        {'date': (target - timedelta(days=offset)).strftime('%Y-%m-%d'), 'title': f"第 {offset} 期標題"}
+        for offset in range(365)
+    ]
+    return (lambda: update_index_html(TARGET_DATE, issues)), (lambda: None)
+
+
+def bench_render_pages(size):
+    page = scale_final_output(BULK_RENDER_ITEMS_PER_PAGE)
+    final_outputs = [{**page, 'final_date': f"{TARGET_DATE}#{index}"} for index in range(BULK_RENDER_PAGES)]
+    return (lambda: sum(1 for _ in render_daily_pages(final_outputs))), (lambda: None)
+
+
+def bench_precompress(size):
+    page = scale_final_output(BULK_RENDER_ITEMS_PER_PAGE)
+    directory = Path('precompress')
+    directory.mkdir(exist_ok=True)
+    paths = []
+    for index, html in enumerate(render_daily_pages({**page, 'final_date': f"{TARGET_DATE}#{index}"}
+                                                    for index in range(PRECOMPRESS_PAGES))):
+        path = directory / f"{index}.html"
+        path.write_text(html, encoding='utf-8')
+        paths.append(path)
+
+    def run():
+        for sibling in directory.glob('*.html.*'):
+            sibling.unlink()
+        precompress(paths)
+
+    return run, (lambda: None)
+
+
+def bench_logger_save(size):
+    exec_logger = build_execution_logger(size)
+    return (lambda: exec_logger.save_to_file("execution_log.json")), (lambda: None)
+
+
+# (階段名稱, setup, 是否依新聞數量放大)
+STAGES: List[Tuple[str, Stage, bool]] = [
+    ('fetch_single_feed', bench_fetch(streaming=False), True),
+    ('fetch_single_feed[stream]', bench_fetch(streaming=True), True),
+    ('filter_and_score_news', bench_filter, True),
+    ('validate_json_output', bench_validate, True),
+    ('generate_daily_html', bench_daily_html, True),
+    ('update_index_html', bench_index_html, False),
+    ('render_daily_pages', bench_render_pages, False),
+    ('precompress', bench_precompress, False),
+    ('ExecutionLogger.save', bench_logger_save, True),
+]
+
+# 與新聞數無關、但一次處理多個單位的階段：{階段: (單位, 數量)}
+STAGE_UNITS: Dict[str, Tuple[str, int]] = {
+    'render_daily_pages': ('pages', BULK_RENDER_PAGES),
+    'precompress': ('pages', PRECOMPRESS_PAGES),
+}
+
+
+def measure(run: Callable[[], object]) -> Dict:
+    """
+    重複執行並取中位數
+
+    Returns:
+        {'median', 'min', 'samples'}（秒）
+    """
+    samples = []
+    started_at = time.perf_counter()
+    while len(samples) < MIN_SAMPLES and (not samples or time.perf_counter() - started_at < MIN_TOTAL_SECONDS):
+        run_started_at = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - run_started_at)
+    return {
+        'median': round(statistics.median(samples), 6),
+        'min': round(min(samples), 6),
+        'samples': len(samples)
+    }
+
+
+def run_benchmarks(sizes: List[int], stage_names: Optional[List[str]] = None) -> Dict[str, Dict[str, Dict]]:
+    """
+    執行基準測試（在暫存目錄中執行，頁面與日誌不會寫入專案）
+
+    Args:
+        sizes: 新聞數量
+        stage_names: 只執行這些階段（None 為全部）
+
+    Returns:
+        {階段: {新聞數（字串，與數量無關時為 "-"）: 量測結果}}
+    """
+    results: Dict[str, Dict[str, Dict]] = {}
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='news-bench-') as workdir:
+        os.chdir(workdir)
+        try:
+            for name, setup, sized in STAGES:
+                if stage_names and name not in stage_names:
+                    continue
+                for size in (sizes if sized else [None]):
+                    run, cleanup = setup(size)
+                    try:
+                        result = measure(run)
+                    finally:
+                        cleanup()
+                    unit, count = ('items', size) if size else STAGE_UNITS.get(name, (None, None))
+                    throughput = ''
+                    if count:
+                        rate = round(count / result['median'], 1) if result['median'] else None
+                        result[f"{unit}_per_second"] = rate
+                        throughput = f"  {rate} {unit}/秒" if rate and not size else ''
+                    results.setdefault(name, {})[str(size) if size else '-'] = result
+                    print(f"  ⏱️  {name:<28} {str(size or '-'):>7}  {result['median'] * 1000:10.2f} ms"
+                          f"  ({result['samples']} 次){throughput}", flush=True)
+        finally:
+            os.chdir(original_cwd)
+    return results
+
+
+# ============================================
+# 基準比較
+# ============================================
+
+def machine_info() -> Dict:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> Dict:
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baselines(results: Dict, threshold: float, path: Path = BASELINES_PATH):
+    """以本次結果更新基準（保留本次沒有執行的階段與大小）"""
+    baselines = load_baselines(path)
+    merged = baselines.get('results', {})
+    for stage, by_size in results.items():
+        for size, result in by_size.items():
+            merged.setdefault(stage, {})[size] = {'median': result['median']}
+    baselines = {
+        'threshold': threshold,
+        'updated_at': datetime.now().isoformat(timespec='seconds'),
+        'machine': machine_info(),
+        'results': merged
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def compare(results: Dict, baselines: Dict, threshold: float) -> List[Dict]:
+    """
+    與基準比較
+
+    Returns:
+        每個量測的比較結果 {'stage', 'size', 'median', 'baseline', 'ratio', 'regressed'}
+    """
+    rows = []
+    for stage, by_size in results.items():
+        for size, result in by_size.items():
+            baseline = baselines.get('results', {}).get(stage, {}).get(size, {}).get('median')
+            ratio = result['median'] / baseline if baseline else None
+            regressed = bool(
+                baseline
+                and ratio > 1 + threshold
+                and result['median'] - baseline > MIN_REGRESSION_SECONDS
+            )
+            rows.append({
+                'stage': stage, 'size': size, 'median': result['median'],
+                'baseline': baseline, 'ratio': ratio, 'regressed': regressed
+            })
+    return rows
+
+
+def print_report(rows: List[Dict], threshold: float):
+    print(f"\n{'階段':<30}{'新聞數':>8}{'本次 (ms)':>14}{'基準 (ms)':>14}{'變化':>10}")
+    for row in rows:
+        baseline = f"{row['baseline'] * 1000:.2f}" if row['baseline'] else '-'
+        change = f"{(row['ratio'] - 1) * 100:+.1f}%" if row['ratio'] else '新增'
+        flag = '  ❌ 退步' if row['regressed'] else ''
+        print(f"{row['stage']:<30}{row['size']:>8}{row['median'] * 1000:>14.2f}{baseline:>14}{change:>10}{flag}")
+    regressions = [row for row in rows if row['regressed']]
+    if regressions:
+        print(f"\n❌ {len(regressions)} 項比基準慢超過 {threshold:.0%}")
+    else:
+        print(f"\n✅ 沒有階段比基準慢超過 {threshold:.0%}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Thinker News 流程各階段基準測試")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="逗號分隔的新聞數量（預設 300,3000,30000,100000）")
+    parser.add_argument('--stage', action='append', choices=[name for name, _, _ in STAGES],
+                        help="只執行指定階段（可重複指定）")
+    parser.add_argument('--threshold', type=float, default=None,
+                        help=f"退步門檻（比例，預設依 baselines.json，未記錄時為 {DEFAULT_THRESHOLD}）")
+    parser.add_argument('--update-baseline', action='store_true', help="以本次結果更新 baselines.json")
+    parser.add_argument('--output', help="另存本次結果（JSON）")
+    args = parser.parse_args(argv)
+
+    # 被量測的模組會大量輸出 INFO 日誌
+    logging.basicConfig(level=logging.ERROR)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    baselines = load_baselines()
+    threshold = args.threshold if args.threshold is not None else baselines.get('threshold', DEFAULT_THRESHOLD)
+
+    print(f"🏁 基準測試：新聞數 {sizes}")
+    results = run_benchmarks(sizes, args.stage)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'machine': machine_info(), 'results': results}, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        save_baselines(results, threshold)
+        print(f"💾 已更新基準: {BASELINES_PATH}")
+        return 0
+
+    if baselines.get('machine') and baselines['machine'] != machine_info():
+        print(f"⚠️  基準是在不同環境量測的（{baselines['machine'].get('platform')}），比較結果僅供參考")
+
+    rows = compare(results, baselines, threshold)
+    print_report(rows, threshold)
+    return 1 if any(row['regressed'] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
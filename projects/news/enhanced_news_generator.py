@@ -8,13 +8,21 @@ import feedparser
 import json
 import requests
 import re
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Dict, Any
-from openai import OpenAI
 import os
+import sys
 from dotenv import load_dotenv
 import subprocess
 
+# 共用 scripts/ 的項目儲存與 LLM 客戶端，重用每日流程已讀取的 RSS 與連線池
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scripts'))
+from item_store import ItemStore, ITEM_STORE_PATH
+from llm_clients import clients
+
+# 項目儲存中的新聞只在發布後幾小時內使用（每日流程太久沒有執行時改為下載 RSS）
+STORE_MAX_AGE_HOURS = int(os.getenv('STORE_MAX_AGE_HOURS', '48'))
+
 class AveryNewsGenerator:
     def __init__(self):
         # 載入.env文件
@@ -35,12 +43,17 @@ class AveryNewsGenerator:
         if not self.openai_api_key:
             raise ValueError("❌ 找不到 OpenAI API key，請檢查 .env 文件")
         
-        # 初始化 OpenAI 客戶端
-        self.openai_client = OpenAI(api_key=self.openai_api_key)
+        # 取得共用的 OpenAI 客戶端（同一程序內重複使用連線池）
+        clients.configure(openai_api_key=self.openai_api_key)
+        self.openai_client = clients.openai()
         print(f"🔑 Using OpenAI API key: {self.openai_api_key[:10]}...")
         
     def fetch_rss_feeds(self) -> List[Dict[str, Any]]:
         """抓取RSS並初步篩選"""
+        stored_articles = self._load_from_item_store()
+        if stored_articles:
+            return stored_articles
+
         all_articles = []
         
         for source, url in self.feeds.items():
@@ -64,6 +77,36 @@ class AveryNewsGenerator:
                 
         return all_articles
     
+    def _load_from_item_store(self) -> List[Dict[str, Any]]:
+        """
+        從每日流程的項目儲存讀取新聞，不必重新下載
+        只使用 STORE_MAX_AGE_HOURS 內發布的新聞；儲存不存在、或任一來源沒有夠新的新聞時回傳空列表（改為下載 RSS）
+        """
+        store_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ITEM_STORE_PATH)
+        if not os.path.exists(store_path):
+            return []
+
+        since = (datetime.now() - timedelta(hours=STORE_MAX_AGE_HOURS)).isoformat()
+        all_articles = []
+        with ItemStore(store_path) as store:
+            for source in self.feeds:
+                items = store.latest_items(source, limit=15, since_iso=since)
+                if not items:
+                    print(f"⚠️  項目儲存中沒有 {STORE_MAX_AGE_HOURS} 小時內的 {source} 新聞，改為下載 RSS")
+                    return []
+                print(f"🗄️  從項目儲存讀取 {source}: {len(items)} 篇文章")
+                for item in items:
+                    all_articles.append({
+                        'title': item['title'],
+                        'link': item['link'],
+                        'content': self._clean_content(item['content']),
+                        'source': source,
+                        'published': item['pubDate'],
+                        'relevance_score': 0
+                    })
+
+        return all_articles
+
     def _clean_content(self, content: str) -> str:
         """清理HTML標籤和多餘空白"""
         # 移除HTML標籤
@@ -191,68 +191,26 @@ class ThinkerNewsPublisher:
             return False
     
     def update_index_page(self, date_str: str, title: str) -> bool:
-        """更新首頁的新聞列表"""
-        index_path = self.repo_path / 'index.html'
-        
-        if not index_path.exists():
-            print("❌ index.html 不存在")
-            return False
-        
+        """
+        更新首頁的新聞列表
+        今日一期加入 archive_manifest.json，首頁與當月的歷史日報頁由 manifest 重新產生
+        （與 scripts/main.py 相同，不再掃描、改寫現有的 index.html）
+        """
+        sys.path.insert(0, str(Path(__file__).resolve().parent / 'scripts'))
+        from html_generator import update_archive_pages, update_index_html
+        from site_archive import ARCHIVE_MANIFEST, backfill_manifest, month_of, record_issue
+        from templates import publish_assets
+
         try:
-            # 讀取現有內容
-            content = index_path.read_text(encoding='utf-8')
-            
-            # 新的新聞項目HTML
-            new_item = f'''            <div class="news-item">
-                <div class="news-date">📅 {date_str} (今日)</div>
-                <div class="news-title">🚀 {title}</div>
-                <div class="news-description">
-                    今日AI科技重點新聞精選，涵蓋最新的工具應用、產業趨勢與安全警報。
-                </div>
-                <a href="./{date_str}.html" class="news-link">閱讀完整報告 📖</a>
-            </div>'''
-            
-            # 替換第一個新聞項目
-            start_marker = '<div class="news-item">'
-            start_idx = content.find(start_marker)
-            
-            if start_idx != -1:
-                # 找到第一個news-item的結束位置
-                temp_content = content[start_idx:]
-                count = 0
-                end_idx = start_idx
-                
-                for i, char in enumerate(temp_content):
-                    if temp_content[i:i+5] == '<div ':
-                        count += 1
-                    elif temp_content[i:i+6] == '</div>':
-                        count -= 1
-                        if count == 0:
-                            end_idx = start_idx + i + 6
-                            break
-                
-                # 替換內容
-                updated_content = content[:start_idx] + new_item + content[end_idx:]
-                
-                # 更新明日日期顯示
-                tomorrow = datetime.strptime(date_str, '%Y-%m-%d')
-                tomorrow = tomorrow.replace(day=tomorrow.day + 1)
-                tomorrow_str = tomorrow.strftime('%Y-%m-%d')
-                
-                # 修復「明日精彩內容」的錯誤顯示
-                updated_content = updated_content.replace(
-                    '📅 2025-09-26\n🔄 明日精彩內容準備中...',
-                    f'📅 {tomorrow_str}\n🔄 明日精彩內容準備中...'
-                )
-                
-                # 寫回檔案
-                index_path.write_text(updated_content, encoding='utf-8')
-                print("✅ 首頁已更新")
-                return True
-            
-            print("❌ 無法找到要替換的新聞項目")
-            return False
-            
+            publish_assets(self.repo_path)
+            if not (self.repo_path / ARCHIVE_MANIFEST).exists():
+                backfill_manifest(self.repo_path)
+            issues = record_issue({'date': date_str, 'title': title}, self.repo_path)['issues']
+            update_index_html(date_str, issues, self.repo_path)
+            update_archive_pages(issues, months=[month_of(date_str)], site_dir=self.repo_path)
+            print("✅ 首頁已更新")
+            return True
+
         except Exception as e:
             print(f"❌ 首頁更新失敗: {e}")
             return False
@@ -18,6 +18,10 @@ except ImportError:
     print("❌ 請安裝 google-generativeai: pip install google-generativeai")
     sys.exit(1)
 
+# 共用 scripts/ 的 LLM 客戶端（Gemini 只 configure 一次）
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scripts'))
+from llm_clients import clients
+
 def md2html(markdown_path, output_date=None, gemini_api_key=None):
     """
     將 n8n 生成的 markdown 內容轉換為 2025-09-23.html 標準格式
@@ -48,9 +52,9 @@ def md2html(markdown_path, output_date=None, gemini_api_key=None):
         print("請在 .env 文件中添加: GEMINI_API_KEY=your_key_here")
         return None
         
-    # 初始化 Gemini
-    genai.configure(api_key=gemini_api_key)
-    model = genai.GenerativeModel('gemini-2.5-flash')
+    # 取得共用的 Gemini 模型
+    clients.configure(gemini_api_key=gemini_api_key)
+    model = clients.gemini_model('gemini-2.5-flash')
     
     # 讀取 n8n 生成的 markdown 內容
     try:
@@ -116,7 +120,10 @@ def md2html(markdown_path, output_date=None, gemini_api_key=None):
     try:
         print("🎯 版面管理 Agent 正在確保格式完全一致...")
         
-        response = model.generate_content([layout_agent_prompt, user_prompt])
+        response = model.generate_content(
+            [layout_agent_prompt, user_prompt],
+            request_options=clients.gemini_request_options()
+        )
         html_content = response.text
         
         # 清理可能的 markdown 代碼塊標記
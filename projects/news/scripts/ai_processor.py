@@ -12,42 +12,42 @@ import os
 import logging
 import json
 import time
-from typing import List, Dict, Callable, Any
-from functools import wraps
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Callable, Any, Optional
 import google.generativeai as genai
 from openai import OpenAI
 
-logger = logging.getLogger(__name__)
-
-# ============================================
-# 重試裝飾器
-# ============================================
-
-def retry_on_failure(max_retries: int = 2, delay: int = 3):
-    """
-    重試裝飾器
+from llm_cache import LLMCache, cache_key
+from llm_clients import clients, OPENAI_TIMEOUT, GEMINI_TIMEOUT
+from json_stream import IncrementalJSONValidator, MalformedJSONError
+from prompt_budget import compact_news_items, estimate_tokens, estimate_cost
+from prompts import (
+    get_prompt,
+    DATA_ALCHEMIST_SYSTEM_PROMPT,
+    TECH_NARRATOR_SYSTEM_PROMPT,
+    EDITOR_IN_CHIEF_SYSTEM_PROMPT,
+)
+from output_schemas import (
+    ALCHEMIST_CATEGORIES,
+    OutputSchemaError,
+    apply_defaults,
+    apply_patch,
+    gemini_response_schema,
+    get_schema,
+    invalid_units,
+    openai_response_format,
+    output_quality,
+    patch_schema,
+    unit_key,
+    validate,
+)
+from hedging import Attempt, HedgeCancelled, hedged_call, timed_call
+from item_store import ItemStore, link_hash
+from retry_policy import retry_on_failure as _retry_on_failure, call_timeout, pipeline_deadline, status_code
+from utils import validate_json_output, parse_json_output
 
-    Args:
-        max_retries: 最大重試次數
-        delay: 重試延遲（秒）
-    """
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> Any:
-            for attempt in range(max_retries + 1):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    if attempt < max_retries:
-                        logger.warning(f"⚠️  {func.__name__} 第 {attempt + 1} 次嘗試失敗: {str(e)}")
-                        logger.info(f"🔄 等待 {delay} 秒後重試...")
-                        time.sleep(delay)
-                    else:
-                        logger.error(f"❌ {func.__name__} 在 {max_retries + 1} 次嘗試後仍然失敗")
-                        raise
-            return None
-        return wrapper
-    return decorator
+logger = logging.getLogger(__name__)
 
 # ============================================
 # 環境變數配置
@@ -71,384 +71,752 @@ GEMINI_HTML_TEMP = float(os.getenv('GEMINI_HTML_TEMP', '0.3'))
 AI_MAX_RETRIES = int(os.getenv('AI_MAX_RETRIES', '2'))
 AI_RETRY_DELAY = int(os.getenv('AI_RETRY_DELAY', '3'))
 
+# 結構化輸出：向 provider 要求符合 output_schemas 的 JSON（0 = 只做本地驗證）
+AI_STRUCTURED_OUTPUT = os.getenv('AI_STRUCTURED_OUTPUT', '1') == '1'
+# 只重新生成無效欄位的最多輪數，仍無效時整段重新生成
+AI_FIELD_REGENERATION_ROUNDS = int(os.getenv('AI_FIELD_REGENERATION_ROUNDS', '2'))
+
+
+def retry_on_failure(max_retries: int = 2, delay: int = 3):
+    """
+    AI 呼叫的重試裝飾器（retry_policy：指數退避、Retry-After、流程截止時間）
+    串流中途中止的格式錯誤、欄位重新生成後仍不符合 schema，都與服務端無關，立即重新生成
+
+    Args:
+        max_retries: 最大重試次數
+        delay: 退避的基礎延遲（秒）
+    """
+    return _retry_on_failure(
+        max_retries, delay, immediate=lambda e: isinstance(e, (MalformedJSONError, OutputSchemaError))
+    )
+
+# 對沖請求（逗號分隔的階段；主要 provider 超過歷史 p95 延遲仍未回應時，同時請求備用 provider）
+AI_HEDGE_STAGES = os.getenv('AI_HEDGE_STAGES', '')
+AI_HEDGE_OPENAI_MODEL = os.getenv('AI_HEDGE_OPENAI_MODEL', OPENAI_TECH_MODEL)
+AI_HEDGE_GEMINI_MODEL = os.getenv('AI_HEDGE_GEMINI_MODEL', GEMINI_MODEL)
+
+# Data Alchemist 分片（新聞數超過分片大小時並行處理，0 = 不分片）
+ALCHEMIST_SHARD_SIZE = int(os.getenv('ALCHEMIST_SHARD_SIZE', '12'))
+ALCHEMIST_MAX_CONCURRENCY = int(os.getenv('ALCHEMIST_MAX_CONCURRENCY', '4'))
+
+# 翻譯備忘：連結與標題都沒變、且在保存天數內翻譯過的新聞直接重用，不再送給模型（0 = 關閉）
+ALCHEMIST_TRANSLATION_MEMO = os.getenv('ALCHEMIST_TRANSLATION_MEMO', '1') == '1'
+ALCHEMIST_MEMO_MAX_AGE_DAYS = int(os.getenv('ALCHEMIST_MEMO_MAX_AGE_DAYS', '7'))
+
+
 # ============================================
 # API 配置
 # ============================================
 
 def setup_apis():
-    """設置 API keys"""
+    """
+    檢查 API keys 並取得共用的 OpenAI 客戶端
+    客戶端由 llm_clients.clients 管理，重複呼叫不會建立新連線
+    """
     if not GEMINI_API_KEY:
         raise ValueError("❌ GEMINI_API_KEY 環境變數未設置")
     if not OPENAI_API_KEY:
         raise ValueError("❌ OPENAI_API_KEY 環境變數未設置")
 
-    # 配置 Gemini
-    genai.configure(api_key=GEMINI_API_KEY)
+    clients.configure(openai_api_key=OPENAI_API_KEY, gemini_api_key=GEMINI_API_KEY)
+    return clients.openai()
+
+
+# ============================================
+# 回應快取
+# ============================================
+
+# 四個處理階段的名稱（--refresh-stage 的選項）
+AI_STAGES = ('alchemist', 'narrator', 'editor', 'html')
+
+# main.py 依 --no-cache / --refresh-stage 呼叫 llm_cache.configure()
+llm_cache = LLMCache()
 
-    # 配置 OpenAI
-    openai_client = OpenAI(api_key=OPENAI_API_KEY)
 
-    return openai_client
+def cached_generate(stage: str, provider: str, model: str, system_prompt: str, user_prompt: str,
+                    temperature: Any, generate: Callable[[], str]) -> str:
+    """
+    prompt 完全相同時重用快取的回應，否則呼叫 generate() 並寫入快取
+
+    Args:
+        stage: 處理階段（AI_STAGES 之一）
+        provider: gemini / openai
+        model: 模型名稱
+        system_prompt: 系統提示詞
+        user_prompt: 使用者提示詞
+        temperature: 溫度（未指定時為 None）
+        generate: 實際呼叫 API 並回傳文字的函數
+
+    Returns:
+        AI 回應文字（對沖時可能來自備用 provider，仍以主要 provider 的 key 保存）
+    """
+    key = cache_key(provider, model, system_prompt, user_prompt, temperature)
+    cached = llm_cache.get(stage, key)
+    if cached is not None:
+        return cached
+
+    output = generate()
+    llm_cache.put(stage, key, output, provider, model)
+    return output
 
 
 # ============================================
-# 系統提示詞（與 n8n 完全一致）
+# 串流回應
 # ============================================
 
-DATA_ALCHEMIST_SYSTEM_PROMPT = """# 數據煉金術師 (Data Alchemist)
-
----
-
-## ROLE (人格設定)
-你是一位資深的「數據煉金術師」兼「新聞內容策展師」。你同時具備:
-- 數據科學家的嚴謹分析能力  
-- 頂尖內容策略師對市場脈動的敏銳嗅覺
-- **新聞編輯的內容整理能力** (新增)
-
-你的任務是將每日雜亂的 AI 新聞原料,提煉成**既有深度又易讀**的完整新聞內容。
-
-## TARGET AUDIENCE PROFILE (目標讀者輪廓)
-- **年齡:** 30 - 60 歲
-- **背景:** 曾有 R 或 Python 資料分析經驗
-- **興趣:** 對資料科學充滿好奇,渴望踏入 AI 領域
-- **程度:** 入門級、小白 (Beginner)
-- **閱讀需求:** 希望直接在網站獲得完整資訊,而非只看標題
-
-## CORE MISSION (核心任務)
-請嚴格遵循以下步驟,處理我提供的「原始新聞列表」:
-
-1. **標題轉譯 (Headline Translation):** 將每一則英文標題,轉譯為繁體中文。風格必須「高度吸引人、符合台灣網路社群語感、能激發點擊慾望」。
-
-2. **📰 完整內容摘要 (Detailed Content Summary)**
-   為每篇文章生成 **3-4 個段落的完整新聞摘要**,包含:
-   - **發生了什麼** (What happened)
-   - **具體細節** (Key details) 
-   - **影響範圍** (Impact scope)
-   - **為什麼重要** (Significance)
-
-2. **🎯 實用要點 (Practical Takeaways)** 
-   為每篇新聞提煉出 2-3 個學員可直接應用的要點
-
-3. **智慧分類 (Smart Categorization):** 歸入指定分類
-
-4. **價值排序 (Value-based Ranking):** 根據對目標群體的價值排序
-
-5. **JSON 輸出 (JSON Output):** 封裝成JSON格式
-
-## AVAILABLE CATEGORIES (可用分類)
-- "ai_applications_and_tools"
-- "industry_trends_and_news"  
-- "security_alerts"
-- "perspectives_and_analysis"
-- "other"
-
-## OUTPUT FORMAT (JSON 結構)
-```json
-{
-  "ai_applications_and_tools": [
-    {
-      "rank": 1,
-      "title": "[轉譯後的中文標題]",
-      "detailed_content": "[3-4段完整新聞內容摘要,讓讀者無需外跳就能完全理解新聞]",
-      "practical_takeaways": [
-        "學員可直接應用的要點1",
-        "學員可直接應用的要點2"  
-      ],
-      "link": "[原文連結]"
+# 各階段最近一次呼叫的統計（首字延遲、生成速度），main.py 寫入執行日誌
+STAGE_TELEMETRY: Dict[str, Dict] = {}
+
+# JSON 結束後還願意讀取的文字量（``` 結尾標記與空白），超過就關閉串流
+STREAM_TRAILING_CHARS = 16
+
+# 各次呼叫 provider 回報的輸入 tokens 與其中命中 prompt 快取的部分（分片為 <stage>#<n>）
+TOKEN_USAGE: Dict[str, Dict] = {}
+
+
+def record_token_usage(stage: str, provider: str, model: str, prompt_tokens: Optional[int],
+                       cached_tokens: Optional[int], output_tokens: Optional[int]):
+    """
+    記錄 provider 回報的 token 用量（回應中沒有 usage 時不記錄）
+
+    Args:
+        stage: 處理階段
+        provider: openai / gemini
+        model: 模型名稱
+        prompt_tokens: 輸入 tokens（含快取命中）
+        cached_tokens: 命中 prompt 快取的輸入 tokens
+        output_tokens: 輸出 tokens
+    """
+    if prompt_tokens is None:
+        return
+    TOKEN_USAGE[stage] = {
+        'prompt': get_prompt(stage).label,
+        'provider': provider,
+        'model': model,
+        'prompt_tokens': prompt_tokens,
+        'cached_tokens': cached_tokens or 0,
+        'uncached_tokens': prompt_tokens - (cached_tokens or 0),
+        'output_tokens': output_tokens
+    }
+    if cached_tokens:
+        logger.info(f"  🗃️  {stage}: 輸入 {prompt_tokens} tokens，其中 {cached_tokens} 命中 prompt 快取")
+
+
+def stream_chat_completion(stage: str, openai_client: OpenAI, model: str, messages: List[Dict],
+                           temperature: Optional[float], cancel: Optional[threading.Event] = None,
+                           response_format: Optional[Dict] = None) -> str:
+    """
+    以串流方式呼叫 OpenAI，邊接收邊檢查 JSON 結構
+
+    - 最外層 JSON 物件結束後即停止讀取
+    - 格式明顯錯誤時立即中止（MalformedJSONError），不必等整段生成完
+
+    Args:
+        stage: 處理階段（AI_STAGES 之一）
+        openai_client: OpenAI client
+        model: 模型名稱
+        messages: 對話訊息
+        temperature: 溫度（None 時使用模型預設）
+        cancel: 對沖時另一方勝出的事件，設定後立即關閉串流
+        response_format: 結構化輸出設定（可選）
+
+    Returns:
+        AI 回應文字
+    """
+    validator = IncrementalJSONValidator()
+    parts = []
+    chunk_count = 0
+    usage = None
+    trailing_chars = 0
+    first_token_at = None
+
+    started_at = time.perf_counter()
+    options = {'temperature': temperature} if temperature is not None else {}
+    if response_format is not None:
+        options['response_format'] = response_format
+    stream = openai_client.chat.completions.create(
+        model=model,
+        messages=messages,
+        **options,
+        stream=True,
+        stream_options={"include_usage": True},
+        timeout=call_timeout(OPENAI_TIMEOUT)
+    )
+
+    try:
+        for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            # JSON 已結束：只剩 ``` 之類的結尾時繼續讀到 usage 片段（取得 token 用量），還有更多文字就不再等待
+            if validator.complete:
+                trailing_chars += len(delta)
+                if trailing_chars > STREAM_TRAILING_CHARS:
+                    break
+                continue
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            chunk_count += 1
+            parts.append(delta)
+            validator.feed(delta)
+            # 讀取逾時只限制片段間隔，整段生成的時間另外以流程截止時間限制
+            pipeline_deadline.check(stage)
+            if cancel is not None and cancel.is_set():
+                raise HedgeCancelled(f"{stage} 已由另一個 provider 完成")
+    except MalformedJSONError as e:
+        logger.error(f"❌ {stage} 輸出格式錯誤，中止串流（已接收 {validator.position} 字）: {str(e)}")
+        output_quality.count(stage, 'full_regenerations')
+        raise
+    finally:
+        stream.close()
+
+    finished_at = time.perf_counter()
+    if not validator.complete:
+        logger.warning(f"⚠️  {stage} 輸出的 JSON 未完整結束（巢狀深度 {validator.depth}），交由 JSON 修復處理")
+
+    # 提前停止時拿不到 usage，以串流片段數估計（OpenAI 每個片段約一個 token）
+    tokens = usage.completion_tokens if usage is not None else chunk_count
+    if usage is not None:
+        details = getattr(usage, 'prompt_tokens_details', None)
+        record_token_usage(stage, 'openai', model, usage.prompt_tokens,
+                           getattr(details, 'cached_tokens', None), usage.completion_tokens)
+    generation_seconds = finished_at - (first_token_at or finished_at)
+    STAGE_TELEMETRY[stage] = {
+        'ttft_seconds': round((first_token_at or finished_at) - started_at, 3),
+        'total_seconds': round(finished_at - started_at, 3),
+        'output_tokens': tokens,
+        'tokens_per_second': round(tokens / generation_seconds, 1) if generation_seconds > 0 else None,
+        'output_chars': sum(len(part) for part in parts)
     }
-  ],
-  "industry_trends_and_news": [],
-  "security_alerts": [],
-  "perspectives_and_analysis": [],
-  "other": []
-}
-```
-
-## 🎯 學習引導規則（引流優化）
-
-在每則新聞的 `practical_takeaways` 最後，**自然地**加入一個學習引導項目：
-
-**引導公式**：
-「想{動詞}？{課程價值主張} → [了解課程](https://thinker.cafe/products/6)」
-
-**撰寫原則**：
-1. 必須與該則新聞的核心主題緊密相關
-2. 使用「想{做什麼}？」開頭，製造共鳴
-3. 突出課程的差異化優勢（100% 手機友善、實體小班、實戰導向）
-4. CTA 文字變化（了解課程/查看詳情/立即報名/探索內容）
-5. 長度：25-45 字
-
-**範例對照表**：
-| 新聞主題 | 學習引導 |
-|---------|---------|
-| Claude 3.7 Sonnet 發布 | 想親手打造自己的 AI 助理？實戰營教你從 Prompt 到 Agent 開發 → [了解課程](https://thinker.cafe/products/6) |
-| OpenAI o1 推理模型 | 想掌握 AI 推理鏈的實戰應用？18 小時從零到 AI 專案上線 → [查看詳情](https://thinker.cafe/products/6) |
-| GitHub Copilot 更新 | 想讓 AI 成為你的編程夥伴？手機就能學會 AI 協作開發 → [立即報名](https://thinker.cafe/products/6) |
-| Anthropic API 新功能 | 想打造專屬的 AI 工具？實戰營帶你從 API 到產品化 → [探索內容](https://thinker.cafe/products/6) |
-| AI 數據分析應用 | 想用 AI 加速你的數據分析工作？實體小班教你實戰技能 → [了解課程](https://thinker.cafe/products/6) |
-
-## 重要提醒
-- **絕對不要**輸出 JSON 以外的任何文字
-- `detailed_content` 必須足夠詳細,讓讀者看完就知道具體發生了什麼
-- `practical_takeaways` 的最後一項必須是學習引導（按照上述公式）
-- 所有內容都要服務於「讓初學者能直接學習而不困惑」的目標"""
-
-TECH_NARRATOR_SYSTEM_PROMPT = """# 科技導讀人 (Tech Narrator)
-
----
-
-## ROLE (人格設定)
-你是一位資深的「AI 科技新聞編輯」。你擁有:
-- 技術佈道師 (Tech Evangelist) 的熱情與洞察
-- 新聞編輯的內容組織能力 
-- 教育工作者的解釋技巧 
-
-你的核心任務是將完整的新聞內容,以**清晰易懂的方式**呈現給資料科學初學者。
-
-## TARGET AUDIENCE PROFILE (目標讀者輪廓)
-- **年齡:** 30 - 60 歲
-- **背景:** 曾有 R 或 Python 資料分析經驗
-- **興趣:** 對資料科學充滿好奇,渴望踏入 AI 領域
-- **程度:** 入門級、小白 (Beginner)
-- **閱讀期待:** 希望直接獲得完整新聞內容,而不只是推薦理由
-
-## CORE MISSION (核心任務)
-從「數據煉金術師」提供的 JSON 數據中,精選 8-10 則最值得閱讀的內容,並撰寫成一份**內容完整**的 Notion 日報。
-
-## CONTENT STRUCTURE REVOLUTION (內容結構革命)
-
-### ❌ 舊結構 (要避免的)
-```
-標題 → 推薦理由 → 短評 → 外連
-```
-
-### ✅ 新結構 (要採用的)  
-```
-標題 → 完整新聞內容 → 學習價值分析 → 外連(可選)
-```
-
-## WRITING GUIDELINES (寫作指南)
-
-### 1. 內容優先原則
-- **70% 篇幅**: 基於 `detailed_content` 撰寫完整新聞內容
-- **20% 篇幅**: 學習價值分析 (為什麼重要)
-- **10% 篇幅**: 實用建議
-
-### 2. 新聞內容寫作要求
-- 必須讓讀者看完就知道**具體發生了什麼**
-- 包含關鍵細節:時間、地點、人物、事件、原因、影響
-- 用初學者能理解的語言解釋技術概念
-- **絕對不要**只寫推薦理由而忽略實際內容
-
-### 3. 學習價值分析
-- 簡潔說明這則新聞對他們的技能樹或職涯規劃的意義
-- 避免過度行銷話術
-- 重點在實用價值而非推銷
-
-## OUTPUT FORMAT (輸出格式) - 【結構優化】
-```json
-{
-  "notion_daily_report_text": "## 🤖 AI 科技日報精選\\n**日期:** [YYYY-MM-DD]\\n\\n### ✨ 今日必讀 TOP 3\\n\\n**1. [標題]**\\n🔧 分類:[中文分類]\\n\\n[完整新聞內容 - 3-4個段落,包含所有關鍵資訊]\\n\\n💡 **學習價值:** [為什麼對初學者重要,如何應用]\\n\\n🔗 [閱讀原文]([連結])\\n\\n**2. [下一則新聞...]**\\n\\n### 🛠 AI工具與應用焦點\\n[其他分類的新聞,同樣結構]\\n\\n### 📊 產業趨勢與新聞\\n[同樣結構]\\n\\n### 🔐 資安趨勢快訊  \\n[同樣結構]\\n\\n### 🌍 產業動態與AI職涯\\n[同樣結構]\\n\\n### 💡 深度觀點與建議\\n[同樣結構]\\n\\n---\\n\\n📬 **日報後記**\\n[整體趨勢分析和學習建議]"
-}
-```
-
-## 重要提醒 
-- **內容為王**:每則新聞必須包含完整的新聞內容,而不只是推薦理由
-- **讀者體驗**:讀完應該知道具體發生了什麼,而不只是為什麼要關注
-- **學習導向**:所有內容都要服務於初學者的學習需求
-- **絕對不要**輸出任何 JSON 格式以外的文字"""
-
-EDITOR_IN_CHIEF_SYSTEM_PROMPT = """# 總編輯 (Editor-in-Chief)
-
-
----
-
-## ROLE (人格設定)
-你是一位頂尖的「社群內容總編輯」兼「智能品管師」。你的超能力包括:
-- 將深度長文蒸餾成瘋傳社群快訊的能力
-- **自動檢測並修正內容錯誤的智能品管能力**
-- **清理不適合公開發布內容的專業判斷**
-
-## TARGET AUDIENCE PROFILE (目標讀者輪廓)
-LINE群組中對 AI 與資料科學感興趣的初學者,需要快速可讀的懶人包。
-
-## CONTEXT (情境)
-你將收到一份詳細的【Notion 版 AI 日報】,需要提煉成適合LINE傳播的快訊。
-
-## CORE MISSION (核心任務)
-1. **內容提煉**:將長文報告提煉成LINE快訊
-2. **🎯 今日學習焦點生成** **(新增功能)**:分析當日新聞主題,生成首屏學習引導
-3. **🔧 智能品管** **(核心功能)**:自動檢測並修正以下問題
-
-## INTELLIGENT QUALITY CONTROL (智能品管規則) 
-
-### 🗓️ 日期智能修正
-- **檢測**:如果內容中出現錯誤日期(如 2025-09-24)
-- **修正**:自動校正為當前正確日期(如 2025-09-25)
-- **適用範圍**:標題、內文、任何日期標示
-
-### 🧹 生成痕跡清理
-自動移除以下不適合公開的生成資訊:
-- "由 n8n 高品質工作流程自動生成"
-- "更新時間: 2025-XX-XX XX:XX"  
-- "AI 工作流程處理"
-- 任何包含 "n8n"、"自動生成"、"工作流程" 的技術說明
-
-### 🔗 連結策略
-- **不提供原文連結**:LINE版本專注於內容本身
-- **導引策略**:讀者如需詳細資訊會自然前往完整日報網站
-
-### 🏷️ Hashtags 格式優化
-- 確保 hashtags 使用正確的 `#` 符號
-- 排版美觀,適當間距
-- 內容相關且有意義
-
-## WRITING GUIDELINES (寫作指南)
-- **提煉,而非重寫**:基於 Notion 版內容進行精煉
-- **抓取主題**:找出最核心的 1-2 個趨勢作為主題
-- **聚焦「So What」**:一針見血的價值分析
-
-## 🎯 TODAY'S LEARNING FOCUS (今日學習焦點生成規則)
-
-分析當日新聞的**共同技術主題**,生成一段首屏學習引導文案。
-
-**生成邏輯**:
-1. 識別今日新聞中出現最多的技術主題（如：AI Agent、Prompt Engineering、多模態應用）
-2. 將這些主題與《AI 全能實戰營》的課程單元對應
-3. 生成一段 2-3 句的引導文案
-
-**輸出格式**:
-```
-learning_focus_text: "🎯 今日學習焦點\\n\\n今天的新聞涵蓋了 **{主題1}**、**{主題2}**、**{主題3}**，這些正是《AI 全能實戰營》{對應單元}的核心主題！課程用 18 小時實體教學，帶你從理論到實戰，100% 手機友善，限額 12 人小班制。\\n\\n[📚 查看完整課程內容](https://thinker.cafe/products/6)"
-```
-
-**主題對應表**（參考用）:
-| 新聞關鍵字 | 課程單元 | 文案範例 |
-|-----------|---------|---------|
-| AI Agent, Automation, Workflow | 第 2-3 天 | 教你打造個人 AI 助理與自動化工作流 |
-| Prompt Engineering, GPT, Claude | 第 1 天 | 從零開始掌握 Prompt 工程與 AI 對話技巧 |
-| Vision, Image, Multimodal | 第 2 天 | 多模態 AI 應用實戰 |
-| API, Integration, Development | 第 3 天 | API 整合到產品化部署 |
-| Data Analysis, Insights | 第 1-2 天 | AI 加速你的數據分析工作 |
-
-**撰寫原則**:
-- 必須基於當日新聞的真實主題（不要硬套）
-- 語氣保持 Cruz 風格（務實、不浮誇）
-- 突出課程的差異化（實體、手機友善、小班制）
-- 長度：60-100 字
-
-## OUTPUT FORMAT (輸出格式) - 【擴展版】
-
-**新增欄位**: `learning_focus_text`
-
-你不必拘泥於固定格式,請根據當日新聞特色,選擇最吸引人的呈現方式:
-
-**可以是重點突出型:**
-```json
-{
-  "line_message_text": "🚨 AI重大突破!\\n\\n今天發生兩件大事:\\n✅ [第一件大事]\\n✅ [第二件大事]\\n\\n為什麼重要?\\n[簡潔有力的分析]\\n\\n#[標籤] #[標籤]",
-  "learning_focus_text": "🎯 今日學習焦點\\n\\n今天的新聞涵蓋了 **{主題1}**、**{主題2}**、**{主題3}**，這些正是《AI 全能實戰營》{對應單元}的核心主題！課程用 18 小時實體教學，帶你從理論到實戰，100% 手機友善，限額 12 人小班制。\\n\\n[📚 查看完整課程內容](https://thinker.cafe/products/6)"
-}
-```
-
-**可以是故事敘述型:**
-```json
-{
-  "line_message_text": "【今日AI圈大事件】\\n\\n想像一下:\\n[情境描述]\\n\\n所以今天同時出現了:\\n🔓 [現象一]\\n🔒 [現象二]\\n\\n#[標籤] #[標籤]",
-  "learning_focus_text": "[同上格式，基於當日主題生成]"
-}
-```
-
-**或是問答引導型:**
-```json
-{
-  "line_message_text": "❓ 今天AI圈最熱的話題?\\n\\n答案:「[核心主題]」\\n\\n🎯 [重點一]\\n🛡️ [重點二]\\n\\n這組合意味著什麼?\\n[深層意義]\\n\\n#[標籤] #[標籤]",
-  "learning_focus_text": "[同上格式，基於當日主題生成]"
-}
-```
-
-**核心原則:**
-- 格式生動有趣,避免死板
-- 適合手機螢幕閱讀
-- 引發分享慾望
-
-## QUALITY CONTROL CHECKLIST (品管檢查清單)
-在輸出前,請確認已完成:
-- ✅ 日期已校正為正確日期
-- ✅ 所有生成痕跡已清除
-- ✅ 無效連結已移除
-- ✅ Hashtags 格式正確美觀
-- ✅ 內容適合公開分享
-- ✅ **learning_focus_text 已生成**（必須包含）
-- ✅ 學習焦點基於真實新聞主題（不硬套）
-- ✅ 符合 JSON 格式要求
-
-## 重要提醒
-- **品質優先**:寧可多花時間檢查,也不要發出有問題的內容
-- **用戶體驗**:LINE讀者看到的應該是專業、乾淨、有價值的內容
-- **智能化**:讓手動修正成為過去式,一次生成就完美
-- **絕對不要**輸出任何 JSON 格式以外的文字"""
+    logger.info(
+        f"  ⏱️  {stage}: 首字延遲 {STAGE_TELEMETRY[stage]['ttft_seconds']:.2f}s，"
+        f"{tokens} tokens，{STAGE_TELEMETRY[stage]['tokens_per_second'] or 0} tokens/s"
+    )
+
+    return ''.join(parts)
+
+
+# ============================================
+# 對沖請求
+# ============================================
+
+# 可對沖的階段（HTML 生成器輸出不是 JSON，無法以相同方式驗證）
+HEDGE_STAGES = ('alchemist', 'narrator', 'editor')
+
+# main.py 依 --hedge-stage 呼叫 configure_hedging()
+hedge_stages = {stage.strip() for stage in AI_HEDGE_STAGES.split(',') if stage.strip() in HEDGE_STAGES}
+
+# 各階段最近一次對沖的結果（勝出的 provider、估計節省的時間）
+HEDGE_TELEMETRY: Dict[str, Dict] = {}
+
+
+def configure_hedging(stages):
+    """
+    設定要對沖的階段
+
+    Args:
+        stages: HEDGE_STAGES 的子集合
+    """
+    hedge_stages.clear()
+    hedge_stages.update(stage for stage in stages if stage in HEDGE_STAGES)
+
+
+def gemini_generate(model, contents, generation_config=None, cancel: Optional[threading.Event] = None,
+                    stage: Optional[str] = None) -> str:
+    """
+    呼叫 Gemini generate_content
+
+    Args:
+        model: GenerativeModel
+        contents: prompt
+        generation_config: 生成參數（可選）
+        cancel: 對沖時另一方勝出的事件；有指定時改用串流，以便在片段之間中止
+        stage: 處理階段（有指定時記錄回應中的 token 用量）
+
+    Returns:
+        AI 回應文字
+    """
+    request_options = clients.gemini_request_options(call_timeout(GEMINI_TIMEOUT))
+    if cancel is None:
+        response = model.generate_content(
+            contents, generation_config=generation_config, request_options=request_options
+        )
+        _record_gemini_usage(stage, model, response)
+        return response.text
+
+    parts = []
+    chunk = None
+    for chunk in model.generate_content(contents, generation_config=generation_config,
+                                        request_options=request_options, stream=True):
+        if cancel.is_set():
+            raise HedgeCancelled("已由另一個 provider 完成")
+        parts.append(chunk.text)
+    _record_gemini_usage(stage, model, chunk)
+    return ''.join(parts)
+
+
+def _record_gemini_usage(stage: Optional[str], model, response):
+    """Gemini 的 usage_metadata 在（串流的最後一個）回應中"""
+    usage = getattr(response, 'usage_metadata', None)
+    if stage is None or not usage or not usage.prompt_token_count:
+        return
+    record_token_usage(
+        stage, 'gemini', model.model_name.replace('models/', '', 1), usage.prompt_token_count,
+        usage.cached_content_token_count, usage.candidates_token_count
+    )
+
+
+# 拒絕結構化輸出參數（HTTP 400）的 (provider, model)，之後不再送出
+structured_output_unsupported = set()
+
+
+def _with_schema_fallback(provider: str, model: str, option: Any, call: Callable[[Any], str]) -> str:
+    """
+    帶結構化輸出參數呼叫；模型不支援（HTTP 400）時改為一般輸出，並記住不再嘗試
+
+    Args:
+        provider: openai / gemini
+        model: 模型名稱
+        option: 結構化輸出參數（None 代表不使用）
+        call: 以參數（或 None）呼叫 API 的函數
+
+    Returns:
+        AI 回應文字
+    """
+    if option is None or (provider, model) in structured_output_unsupported:
+        return call(None)
+    try:
+        return call(option)
+    except Exception as e:
+        if status_code(e) != 400:
+            raise
+        logger.warning(f"  ⚠️  {provider}/{model} 不接受結構化輸出參數，改用一般輸出: {str(e)[:200]}")
+        structured_output_unsupported.add((provider, model))
+        return call(None)
+
+
+def openai_attempt(stage: str, model: str, system_prompt: str, user_prompt: str,
+                   temperature: Optional[float], schema: Optional[Dict] = None) -> Attempt:
+    """以 OpenAI 串流執行階段 prompt（有 schema 時要求 strict json_schema 輸出）"""
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+    response_format = (
+        openai_response_format(stage.partition('#')[0], schema) if schema and AI_STRUCTURED_OUTPUT else None
+    )
+
+    def call(cancel: Optional[threading.Event]) -> str:
+        return _with_schema_fallback('openai', model, response_format, lambda option: stream_chat_completion(
+            stage, clients.openai(), model, messages, temperature, cancel, response_format=option
+        ))
+
+    return Attempt('openai', model, call)
+
+
+def gemini_attempt(stage: str, model: str, system_prompt: str, user_prompt: str,
+                   temperature: Optional[float], schema: Optional[Dict] = None) -> Attempt:
+    """以 Gemini 執行階段 prompt（有 schema 時要求 application/json 與 response_schema）"""
+    response_schema = gemini_response_schema(schema) if schema and AI_STRUCTURED_OUTPUT else None
+
+    def call(cancel: Optional[threading.Event]) -> str:
+        gemini = clients.gemini_model(model, system_prompt)
+
+        def generate(option: Optional[Dict]) -> str:
+            options = {'temperature': temperature} if temperature is not None else {}
+            if option is not None:
+                options.update(response_mime_type='application/json', response_schema=option)
+            config = genai.types.GenerationConfig(**options) if options else None
+            return gemini_generate(gemini, user_prompt, config, cancel, stage=stage)
+
+        return _with_schema_fallback('gemini', model, response_schema, generate)
+
+    return Attempt('gemini', model, call)
+
+
+def generate_with_hedging(stage: str, primary: Attempt, secondary: Attempt, agent_name: str) -> str:
+    """
+    執行階段的 AI 呼叫；階段有開啟對沖時，主要 provider 太慢或失敗會同時請求備用 provider
+
+    Args:
+        stage: 處理階段（分片為 <stage>#<n>）
+        primary: 主要 provider
+        secondary: 備用 provider
+        agent_name: Agent 名稱（JSON 驗證的日誌用）
+
+    Returns:
+        AI 回應文字（先通過 JSON 驗證的一方）
+    """
+    if stage.partition('#')[0] not in hedge_stages:
+        return timed_call(stage, primary)
+
+    def validate(output: str):
+        if not isinstance(validate_json_output(output, agent_name), dict):
+            raise ValueError(f"{agent_name} 輸出不是 JSON 物件")
+
+    result = hedged_call(stage, primary, secondary, validate)
+    HEDGE_TELEMETRY[stage] = {**result['telemetry'], 'model': result['model']}
+    return result['output']
+
+
+def _regeneration_instruction(document: Dict, errors: List, units: List) -> str:
+    """列出無效欄位與目前的值，要求只輸出這些欄位（附加在原 user prompt 之後，前綴仍可命中快取）"""
+    problems = '\n'.join(f"- {error}" for error in errors)
+    current = json.dumps(
+        {unit_key(unit): _value_at(document, unit) for unit in units}, ensure_ascii=False, indent=2
+    )
+    keys = ', '.join(unit_key(unit) for unit in units)
+    return (
+        f"\n\n# 修正指令\n你先前的輸出有以下欄位不符合格式要求：\n{problems}\n\n"
+        f"這些欄位目前的內容：\n{current}\n\n"
+        f"請依照原本的任務與規則，只重新生成這些欄位，輸出一個 JSON 物件，欄位為：{keys}"
+    )
+
+
+def _value_at(document: Any, path: tuple) -> Any:
+    for part in path:
+        try:
+            document = document[part]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return document
+
+
+def enforce_schema(stage: str, output: str, agent_name: str,
+                   regenerate: Callable[[Dict, str], str]) -> str:
+    """
+    解析並以階段 schema 驗證輸出，只對無效的欄位（或陣列中無效的項目）重新生成
+
+    Args:
+        stage: 處理階段（分片為 <stage>#<n>）
+        output: AI 回應文字
+        agent_name: Agent 名稱（日誌用）
+        regenerate: 以 (patch schema, 修正指令) 重新生成部分欄位並回傳文字的函數
+
+    Returns:
+        符合 schema 的 JSON 文字（快取保存的是驗證後的結果）
+
+    Raises:
+        OutputSchemaError: 重新生成 AI_FIELD_REGENERATION_ROUNDS 輪後仍無效
+    """
+    schema = get_schema(stage)
+    document, repaired = parse_json_output(output, agent_name)
+    output_quality.count(stage, 'outputs')
+    if repaired:
+        output_quality.count(stage, 'repaired')
+    if schema is None:
+        return output
+    if not isinstance(document, dict):
+        output_quality.count(stage, 'full_regenerations')
+        raise OutputSchemaError(f"{agent_name} 輸出不是 JSON 物件")
+
+    document = apply_defaults(document, schema)
+    errors = validate(document, schema)
+    if errors:
+        output_quality.count(stage, 'schema_invalid')
+
+    for round_number in range(1, AI_FIELD_REGENERATION_ROUNDS + 1):
+        units = invalid_units(errors)
+        if not errors or not units:
+            break
+        logger.warning(
+            f"  ⚠️  {agent_name} 有 {len(errors)} 個欄位不符合 schema，"
+            f"重新生成 {len(units)} 個欄位（第 {round_number} 輪）: {', '.join(map(str, errors[:5]))}"
+        )
+        output_quality.count(stage, 'field_regenerations')
+        output_quality.count(stage, 'fields_regenerated', len(units))
+        try:
+            patch, _ = parse_json_output(
+                regenerate(patch_schema(schema, units), _regeneration_instruction(document, errors, units)),
+                f"{agent_name} 欄位重新生成"
+            )
+        except Exception as e:
+            logger.warning(f"  ⚠️  {agent_name} 欄位重新生成失敗: {str(e)}")
+            break
+        if isinstance(patch, dict):
+            document = apply_patch(document, units, patch)
+        errors = validate(document, schema)
+
+    if errors:
+        output_quality.count(stage, 'full_regenerations')
+        raise OutputSchemaError(
+            f"{agent_name} 輸出不符合 schema: {'; '.join(map(str, errors[:5]))}"
+        )
+    return json.dumps(document, ensure_ascii=False)
+
+
+def generate_structured(stage: str, user_prompt: str, primary: Callable[..., Attempt],
+                        secondary: Callable[..., Attempt], agent_name: str) -> str:
+    """
+    以階段 schema 要求結構化輸出（可對沖），再以 enforce_schema 驗證並補生成無效欄位
+
+    Args:
+        stage: 處理階段（分片為 <stage>#<n>）
+        user_prompt: 使用者提示詞
+        primary: (stage, user_prompt, schema) → 主要 provider 的 Attempt
+        secondary: 同上，備用 provider
+        agent_name: Agent 名稱
+
+    Returns:
+        符合 schema 的 JSON 文字
+    """
+    schema = get_schema(stage)
+    output = generate_with_hedging(
+        stage, primary(stage, user_prompt, schema), secondary(stage, user_prompt, schema), agent_name
+    )
+
+    def regenerate(fix_schema: Dict, instruction: str) -> str:
+        # 不經過對沖：只補少數欄位，不計入階段的延遲統計
+        return primary(f"{stage}#fix", user_prompt + instruction, fix_schema).call(None)
+
+    return enforce_schema(stage, output, agent_name, regenerate)
 
 
 # ============================================
 # AI 處理函數
 # ============================================
 
+def build_alchemist_prompt(news_items: List[Dict], today_date: str) -> str:
+    """
+    組出數據煉金術師的 user prompt
+
+    Args:
+        news_items: 新聞列表
+        today_date: 今日日期
+
+    Returns:
+        user prompt
+    """
+    return get_prompt('alchemist').render(
+        titles=json.dumps([item['title'] for item in news_items], ensure_ascii=False, indent=2),
+        links=json.dumps([item['link'] for item in news_items], ensure_ascii=False, indent=2),
+        contents=json.dumps([item['content'] for item in news_items], ensure_ascii=False, indent=2),
+        today_date=today_date
+    )
+
+
+def _generate_alchemist(stage: str, user_prompt: str) -> str:
+    """以 Gemini 執行一次數據煉金術師（經過回應快取，開啟對沖時備用 OpenAI）"""
+    def generate():
+        return generate_structured(
+            stage,
+            user_prompt,
+            lambda stage, prompt, schema: gemini_attempt(
+                stage, GEMINI_MODEL, DATA_ALCHEMIST_SYSTEM_PROMPT, prompt, None, schema
+            ),
+            lambda stage, prompt, schema: openai_attempt(
+                stage, AI_HEDGE_OPENAI_MODEL, DATA_ALCHEMIST_SYSTEM_PROMPT, prompt, None, schema
+            ),
+            "數據煉金術師"
+        )
+
+    return cached_generate(
+        stage, 'gemini', GEMINI_MODEL, DATA_ALCHEMIST_SYSTEM_PROMPT, user_prompt, None, generate
+    )
+
+
 @retry_on_failure(max_retries=AI_MAX_RETRIES, delay=AI_RETRY_DELAY)
-def process_with_data_alchemist(filtered_news: List[Dict], today_date: str) -> str:
+def _process_alchemist_shard(shard_index: int, shard: List[Dict], today_date: str) -> Dict:
+    """
+    處理單一分片，輸出必須是可解析的 JSON（否則只重試這個分片）
+
+    Args:
+        shard_index: 分片編號（從 0 開始）
+        shard: 分片內的新聞
+        today_date: 今日日期
+
+    Returns:
+        分片的分類 JSON
+    """
+    stage = f"alchemist#{shard_index + 1}"
+    started_at = time.perf_counter()
+    output = _generate_alchemist(stage, build_alchemist_prompt(shard, today_date))
+    shard_json = validate_json_output(output, f"數據煉金術師 分片 {shard_index + 1}")
+    if not isinstance(shard_json, dict):
+        raise ValueError(f"分片 {shard_index + 1} 輸出不是 JSON 物件")
+
+    logger.info(f"  ✅ 分片 {shard_index + 1}: {len(shard)} 則，{time.perf_counter() - started_at:.1f} 秒")
+    return shard_json
+
+
+def merge_alchemist_shards(shard_outputs: List[Dict]) -> Dict:
+    """
+    合併各分片的分類結果（輸出與分片完成順序無關）
+
+    - 分類依 ALCHEMIST_CATEGORIES 的順序，其他分類依名稱排在後面
+    - 同一分類內依 (分片內排名, 分片編號, 分片內順序) 排序後重新編號
+    - 相同連結只保留第一則
+
+    Args:
+        shard_outputs: 依分片編號排列的分片 JSON
+
+    Returns:
+        合併後的分類 JSON
+    """
+    extra_categories = sorted({
+        key for output in shard_outputs for key, value in output.items()
+        if isinstance(value, list) and key not in ALCHEMIST_CATEGORIES
+    })
+
+    merged = {}
+    seen_links = set()
+    for category in ALCHEMIST_CATEGORIES + tuple(extra_categories):
+        ranked = []
+        for shard_index, output in enumerate(shard_outputs):
+            items = output.get(category) or []
+            if not isinstance(items, list):
+                continue
+            for position, item in enumerate(items):
+                if not isinstance(item, dict):
+                    continue
+                rank = item.get('rank')
+                rank = rank if isinstance(rank, (int, float)) else position + 1
+                ranked.append((rank, shard_index, position, item))
+
+        merged[category] = []
+        for _, _, _, item in sorted(ranked, key=lambda entry: entry[:3]):
+            link = item.get('link')
+            if link and link in seen_links:
+                continue
+            if link:
+                seen_links.add(link)
+            merged[category].append({**item, 'rank': len(merged[category]) + 1})
+
+    return merged
+
+
+def _memo_document(memo: Dict[str, Dict]) -> Dict:
+    """把翻譯備忘組成分類 JSON（分類內依上次的排名排序）"""
+    document = {}
+    for entry in memo.values():
+        document.setdefault(entry['category'], []).append(entry['item'])
+    for items in document.values():
+        items.sort(key=lambda item: item.get('rank') if isinstance(item.get('rank'), (int, float)) else 0)
+    return document
+
+
+def _memo_entries(document: Dict, news_items: List[Dict]) -> List[tuple]:
+    """以連結對應回原始新聞，取得可寫入翻譯備忘的 (原始新聞, 分類, 輸出)"""
+    sources = {link_hash(item): item for item in news_items}
+    entries = []
+    for category, items in document.items():
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            source = sources.get(link_hash({'link': item.get('link', '')})) if isinstance(item, dict) else None
+            if source is not None and item.get('link'):
+                entries.append((source, category, item))
+    return entries
+
+
+def process_with_data_alchemist(filtered_news: List[Dict], today_date: str,
+                                store: Optional[ItemStore] = None) -> str:
     """
     數據煉金術師 - 使用 Gemini
-    包含自動重試機制
+    新聞數超過 ALCHEMIST_SHARD_SIZE 時切成分片並行處理，再合併各分類；
+    有 store 時先查翻譯備忘，前幾天已轉譯過的新聞直接重用，只把新的新聞送給模型
 
     Args:
         filtered_news: 篩選後的新聞列表
         today_date: 今日日期
+        store: 保存翻譯備忘的新聞儲存（可選）
 
     Returns:
         JSON 格式的處理結果
     """
     logger.info("⚗️  數據煉金術師處理中...")
-    
-    # 準備新聞數據
-    news_data = []
-    for item in filtered_news:
-        news_data.append({
-            'title': item['title'],
-            'link': item['link'],
-            'content': item['content']
-        })
-    
-    # 構建 prompt
-    user_prompt = f"""新聞標題
-{json.dumps([n['title'] for n in news_data], ensure_ascii=False, indent=2)}
-
-超鏈結
-{json.dumps([n['link'] for n in news_data], ensure_ascii=False, indent=2)}
-
-新聞內容
-{json.dumps([n['content'] for n in news_data], ensure_ascii=False, indent=2)}
-
-今日日期
-{today_date}"""
-    
-    try:
-        # 調用 Gemini API
-        model = genai.GenerativeModel(
-            model_name=GEMINI_MODEL,
-            system_instruction=DATA_ALCHEMIST_SYSTEM_PROMPT
+
+    # 翻譯備忘以 prompt 版本 + 文字指紋為鍵：prompt 文字修改後（即使忘了調整版本）舊的翻譯不再重用
+    spec = get_prompt('alchemist')
+    memo_key = f"{spec.label}#{spec.content_fingerprint}"
+    memo = {}
+    if store is not None and ALCHEMIST_TRANSLATION_MEMO:
+        memo = store.translations_for(filtered_news, memo_key, ALCHEMIST_MEMO_MAX_AGE_DAYS)
+    pending_news = [item for item in filtered_news if link_hash(item) not in memo]
+    memo_stats = {
+        'hits': len(memo),
+        'pending': len(pending_news),
+        'output_tokens_saved': sum(
+            estimate_tokens(json.dumps(entry['item'], ensure_ascii=False)) for entry in memo.values()
         )
-        
-        response = model.generate_content(user_prompt)
-        output = response.text
-        
+    }
+    if memo:
+        logger.info(
+            f"  📒 翻譯備忘命中 {len(memo)} 則（省下約 {memo_stats['output_tokens_saved']:,} 輸出 tokens），"
+            f"送出 {len(pending_news)} 則"
+        )
+
+    # 先壓縮新聞內容（去 HTML、樣板，依相關性截斷），控制 prompt 大小
+    compacted_news, compaction = compact_news_items(pending_news)
+
+    shard_size = ALCHEMIST_SHARD_SIZE if ALCHEMIST_SHARD_SIZE > 0 else len(compacted_news)
+    shards = [compacted_news[i:i + shard_size] for i in range(0, len(compacted_news), shard_size)]
+    # 全部命中備忘時不呼叫模型；沒有任何新聞時仍送出空的 prompt（與之前的行為相同）
+    if not shards and not memo:
+        shards = [[]]
+
+    prompt_tokens = sum(
+        estimate_tokens(DATA_ALCHEMIST_SYSTEM_PROMPT) + estimate_tokens(build_alchemist_prompt(shard, today_date))
+        for shard in shards
+    )
+    logger.info(f"  📏 預估 prompt {prompt_tokens:,} tokens（{len(shards)} 次呼叫）")
+
+    try:
+        started_at = time.perf_counter()
+
+        if not shards:
+            document = {}
+        elif len(shards) == 1:
+            document = validate_json_output(_process_alchemist_single(compacted_news, today_date), "數據煉金術師")
+        else:
+            workers = max(1, min(ALCHEMIST_MAX_CONCURRENCY, len(shards)))
+            logger.info(f"  🧩 切成 {len(shards)} 個分片（每片最多 {shard_size} 則），並行 {workers} 個")
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(_process_alchemist_shard, index, shard, today_date)
+                    for index, shard in enumerate(shards)
+                ]
+                shard_outputs = [future.result() for future in futures]
+            document = merge_alchemist_shards(shard_outputs)
+
+        output_tokens = estimate_tokens(json.dumps(document, ensure_ascii=False)) if shards else 0
+        if store is not None and ALCHEMIST_TRANSLATION_MEMO:
+            memo_stats['saved'] = store.save_translations(_memo_entries(document, pending_news), memo_key)
+
+        if memo:
+            # 備忘的新聞排在同分類、同排名的新新聞之後
+            document = merge_alchemist_shards([document, _memo_document(memo)])
+        output = json.dumps(document, ensure_ascii=False)
+
+        STAGE_TELEMETRY['alchemist'] = {
+            'shards': len(shards),
+            'shard_size': shard_size,
+            'total_seconds': round(time.perf_counter() - started_at, 3),
+            'prompt_tokens': prompt_tokens,
+            'output_tokens': output_tokens,
+            'estimated_cost_usd': estimate_cost(GEMINI_MODEL, prompt_tokens, output_tokens),
+            'compaction': compaction,
+            'translation_memo': memo_stats
+        }
+
         logger.info("✅ 數據煉金術師處理完成")
         return output
-        
+
     except Exception as e:
         logger.error(f"❌ 數據煉金術師處理失敗: {str(e)}")
         raise
 
 
+@retry_on_failure(max_retries=AI_MAX_RETRIES, delay=AI_RETRY_DELAY)
+def _process_alchemist_single(filtered_news: List[Dict], today_date: str) -> str:
+    """不分片：所有新聞一次送出（包含自動重試機制）"""
+    return _generate_alchemist('alchemist', build_alchemist_prompt(filtered_news, today_date))
+
+
 @retry_on_failure(max_retries=AI_MAX_RETRIES, delay=AI_RETRY_DELAY)
 def process_with_tech_narrator(alchemist_json: Dict, today_date: str) -> str:
     """
@@ -464,25 +832,29 @@ def process_with_tech_narrator(alchemist_json: Dict, today_date: str) -> str:
     """
     logger.info("📰 科技導讀人處理中...")
 
-    openai_client = setup_apis()
-
-    # 構建 prompt
-    user_prompt = f"""數據煉金術師 OUTPUT: {json.dumps(alchemist_json, ensure_ascii=False)}
-
-今日日期
-{today_date}"""
+    # 構建 prompt（靜態的系統提示詞在前，每日內容在後）
+    user_prompt = get_prompt('narrator').render(
+        alchemist_json=json.dumps(alchemist_json, ensure_ascii=False), today_date=today_date
+    )
 
     try:
-        response = openai_client.chat.completions.create(
-            model=OPENAI_TECH_MODEL,
-            messages=[
-                {"role": "system", "content": TECH_NARRATOR_SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=OPENAI_TECH_TEMP
-        )
+        def generate():
+            return generate_structured(
+                'narrator',
+                user_prompt,
+                lambda stage, prompt, schema: openai_attempt(
+                    stage, OPENAI_TECH_MODEL, TECH_NARRATOR_SYSTEM_PROMPT, prompt, OPENAI_TECH_TEMP, schema
+                ),
+                lambda stage, prompt, schema: gemini_attempt(
+                    stage, AI_HEDGE_GEMINI_MODEL, TECH_NARRATOR_SYSTEM_PROMPT, prompt, OPENAI_TECH_TEMP, schema
+                ),
+                "科技導讀人"
+            )
 
-        output = response.choices[0].message.content
+        output = cached_generate(
+            'narrator', 'openai', OPENAI_TECH_MODEL, TECH_NARRATOR_SYSTEM_PROMPT, user_prompt,
+            OPENAI_TECH_TEMP, generate
+        )
 
         logger.info("✅ 科技導讀人處理完成")
         return output
@@ -507,27 +879,29 @@ def process_with_editor_in_chief(narrator_json: Dict, today_date: str) -> str:
     """
     logger.info("✍️  總編輯處理中...")
 
-    openai_client = setup_apis()
-
-    # 構建 prompt
-    notion_text = narrator_json.get('notion_daily_report_text', '')
-    user_prompt = f"""【Notion 版 AI 日報】:
-{notion_text}
-
-今日日期
-{today_date}"""
+    # 構建 prompt（靜態的系統提示詞在前，每日內容在後）
+    user_prompt = get_prompt('editor').render(
+        notion_text=narrator_json.get('notion_daily_report_text', ''), today_date=today_date
+    )
 
     try:
-        response = openai_client.chat.completions.create(
-            model=OPENAI_EDITOR_MODEL,
-            messages=[
-                {"role": "system", "content": EDITOR_IN_CHIEF_SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=OPENAI_EDITOR_TEMP
-        )
+        def generate():
+            return generate_structured(
+                'editor',
+                user_prompt,
+                lambda stage, prompt, schema: openai_attempt(
+                    stage, OPENAI_EDITOR_MODEL, EDITOR_IN_CHIEF_SYSTEM_PROMPT, prompt, OPENAI_EDITOR_TEMP, schema
+                ),
+                lambda stage, prompt, schema: gemini_attempt(
+                    stage, AI_HEDGE_GEMINI_MODEL, EDITOR_IN_CHIEF_SYSTEM_PROMPT, prompt, OPENAI_EDITOR_TEMP, schema
+                ),
+                "總編輯"
+            )
 
-        output = response.choices[0].message.content
+        output = cached_generate(
+            'editor', 'openai', OPENAI_EDITOR_MODEL, EDITOR_IN_CHIEF_SYSTEM_PROMPT, user_prompt,
+            OPENAI_EDITOR_TEMP, generate
+        )
 
         logger.info("✅ 總編輯處理完成")
         return output
@@ -553,340 +927,28 @@ def process_with_html_generator(notion_content: str, line_content: str, today_da
     """
     logger.info("🎨 HTML 生成器處理中...")
 
-    # 設置 Gemini
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel(GEMINI_MODEL)
-
-    # System prompt - 對齊 n8n 的設定
-    system_prompt = """你是專業的版面管理 Agent，專門負責確保網頁格式完全一致。
-
-核心職責:
-1. 嚴格按照提供的標準範本格式
-2. 保持 CSS 樣式完全相同
-3. 確保 HTML 結構完全一致
-4. 不得添加任何額外的說明文字
-5. 輸出純淨的 HTML 代碼
-
-格式要求:
-- 完全複製範本的 CSS 樣式
-- 保持相同的 HTML 結構
-- 只替換內容，不改變格式
-- 特別注意 LINE 精華版區塊的粉紅色漸層
-- 確保響應式設計和動畫效果
-- 絕對不在 </html> 後面添加任何文字
-
-**關鍵轉換規則（非常重要）:**
-1. 看到 Markdown 中的 `💡 **學習價值:**` 或 `💡 學習價值：` 段落時
-2. 必須將整個段落包裝在 <div class="highlight-box"> 裡面
-3. 範例中的每個新聞項目都有 highlight-box，你也要為每個項目都生成
-4. highlight-box 的結構：
-   <div class="highlight-box">
-       <strong>💡 學習價值：</strong><br>
-       學習價值的內容文字...
-   </div>
-
-**重要警告:**
-- 輸出結束於 </html> 標籤
-- 不得添加任何解釋或說明文字
-- 不得輸出 markdown 代碼塊標記"""
-
-    # User prompt - 完全對齊 n8n 的 prompt
-    user_prompt = f"""請基於以下標準範本，將 n8n 新聞內容格式化為完全相同的格式。
-
-標準範本 HTML:
-<!DOCTYPE html>
-<html lang="zh-TW">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>2025-09-23 AI 科技日報 | Thinker News</title>
-    <meta name="description" content="Nvidia投資OpenAI巨額資金，AI安全挑戰並存 - 今日AI科技重點新聞精選">
-    <link rel="icon" href="data:image/svg+xml,<svg xmlns=%22http://www.w3.org/2000/svg%22 viewBox=%220 0 100 100%22><text y=%22.9em%22 font-size=%2290%22>🤖</text></svg>">
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Microsoft JhengHei', sans-serif;
-            line-height: 1.7;
-            color: #333;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-
-        .container {{
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-
-        .back-link {{
-            display: inline-block;
-            margin-bottom: 20px;
-            color: white;
-            text-decoration: none;
-            background: rgba(255, 255, 255, 0.2);
-            padding: 10px 20px;
-            border-radius: 20px;
-            transition: all 0.3s ease;
-            backdrop-filter: blur(10px);
-        }}
-
-        .back-link:hover {{
-            background: rgba(255, 255, 255, 0.3);
-            transform: translateX(-5px);
-        }}
-
-        .article-header {{
-            text-align: center;
-            background: rgba(255, 255, 255, 0.95);
-            backdrop-filter: blur(10px);
-            border-radius: 20px;
-            padding: 40px 30px;
-            margin-bottom: 30px;
-            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.1);
-        }}
-
-        .article-date {{
-            font-size: 1.1em;
-            color: #667eea;
-            font-weight: 600;
-            margin-bottom: 15px;
-        }}
-
-        .article-title {{
-            font-size: 2.2em;
-            font-weight: 800;
-            margin-bottom: 20px;
-            background: linear-gradient(45deg, #667eea, #764ba2);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-            line-height: 1.3;
-        }}
-
-        .article-subtitle {{
-            font-size: 1.2em;
-            color: #666;
-            font-weight: 400;
-        }}
-
-        .content-section {{
-            background: rgba(255, 255, 255, 0.95);
-            backdrop-filter: blur(10px);
-            border-radius: 20px;
-            padding: 40px;
-            margin-bottom: 30px;
-            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.1);
-        }}
-
-        .content-section h2 {{
-            color: #667eea;
-            font-size: 1.6em;
-            margin-bottom: 20px;
-            border-bottom: 2px solid #667eea;
-            padding-bottom: 10px;
-            font-weight: 700;
-        }}
-
-        .content-section h3 {{
-            color: #555;
-            font-size: 1.3em;
-            margin: 25px 0 15px;
-            font-weight: 600;
-        }}
-
-        .content-section p {{
-            margin-bottom: 15px;
-            line-height: 1.7;
-            font-size: 1.05em;
-        }}
-
-        .content-section ul {{
-            margin: 15px 0;
-            padding-left: 20px;
-        }}
-
-        .content-section li {{
-            margin-bottom: 10px;
-            line-height: 1.6;
-        }}
-
-        .highlight-box {{
-            background: linear-gradient(135deg, #667eea20, #764ba220);
-            border-left: 4px solid #667eea;
-            padding: 20px;
-            margin: 20px 0;
-            border-radius: 0 15px 15px 0;
-        }}
-
-        .news-link {{
-            color: #667eea;
-            text-decoration: none;
-            font-weight: 600;
-            transition: all 0.3s ease;
-        }}
-
-        .news-link:hover {{
-            color: #764ba2;
-            text-decoration: underline;
-        }}
-
-        .external-link::after {{
-            content: " 🔗";
-            font-size: 0.8em;
-        }}
-
-        .footer-nav {{
-            text-align: center;
-            padding: 30px;
-            color: white;
-        }}
-
-        .nav-button {{
-            display: inline-block;
-            background: rgba(255, 255, 255, 0.2);
-            color: white;
-            text-decoration: none;
-            padding: 12px 24px;
-            border-radius: 25px;
-            margin: 0 10px;
-            transition: all 0.3s ease;
-            backdrop-filter: blur(10px);
-        }}
-
-        .nav-button:hover {{
-            background: rgba(255, 255, 255, 0.3);
-            transform: translateY(-2px);
-        }}
-
-        @media (max-width: 600px) {{
-            .container {{
-                padding: 15px;
-            }}
-
-            .article-header {{
-                padding: 25px 20px;
-            }}
-
-            .article-title {{
-                font-size: 1.8em;
-            }}
-
-            .content-section {{
-                padding: 25px;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <a href="./index.html" class="back-link">← 返回首頁</a>
-
-        <header class="article-header">
-            <div class="article-date">📅 2025年9月23日</div>
-            <h1 class="article-title">🤖 AI 科技日報精選</h1>
-            <p class="article-subtitle">Nvidia投資OpenAI巨額資金，AI安全挑戰並存</p>
-        </header>
-
-        <div class="content-section">
-            <h2>✨ 今日必讀 TOP 3</h2>
-
-            <h3>1. Nvidia投資OpenAI高達1000億美元</h3>
-            <p>Nvidia 與 OpenAI 達成協議，部署價值10千萬瓦的 AI 晶片，目的為推動下一代的ChatGPT。這顯示出 AI 領域的龍頭企業對於人工智慧未來潛力的高度信心。</p>
-            <div class="highlight-box">
-                <strong>💡 學習價值：</strong><br>
-                這筆巨額投資標誌著AI基礎設施建設進入新階段，對於想要學習AI的初學者來說，這意味著更強大的工具和更多的學習資源即將到來。
-            </div>
-            <p><a href="https://techcrunch.com/2025/09/22/nvidia-plans-to-invest-up-to-100b-in-openai/" class="news-link external-link" target="_blank">閱讀更多</a></p>
-
-            <h3>2. ShadowLeak漏洞透過OpenAI ChatGPT洩漏Gmail數據</h3>
-            <p>這是一個重要的安全警報，OpenAI ChatGPT的深度研究代理中的零點擊漏洞可能讓攻擊者通過一封精心製作的電子郵件洩漏敏感的Gmail收件箱數據。</p>
-            <div class="highlight-box">
-                <strong>💡 學習價值：</strong><br>
-                此事提醒我們，在 AI 的發展同時，我們也需要更加關注其帶來的安全問題。初學者應該學習 AI 資安的基礎知識。
-            </div>
-            <p><a href="https://thehackernews.com/2025/09/shadowleak-zero-click-flaw-leaks-gmail.html" class="news-link external-link" target="_blank">閱讀更多</a></p>
-
-            <h3>3. 基礎設施交易推動AI繁榮</h3>
-            <p>大型科技公司如 Meta、Oracle、Microsoft、Google 和 OpenAI 的大筆支出推動 AI 的興起。</p>
-            <div class="highlight-box">
-                <strong>💡 學習價值：</strong><br>
-                這不僅反映出 AI 的重要性，更顯示出了其在產業界的影響力。初學者可以從中了解 AI 產業的發展趨勢。
-            </div>
-            <p><a href="https://techcrunch.com/2025/09/22/the-billion-dollar-infrastructure-deals-powering-the-ai-boom/" class="news-link external-link" target="_blank">閱讀更多</a></p>
-        </div>
-
-        <div class="content-section" style="background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); color: white;">
-            <h2 style="color: white; border-bottom: 3px solid white;">📱 LINE 精華版</h2>
-            <div style="background: rgba(255,255,255,0.1); padding: 20px; border-radius: 15px; margin: 20px 0;">
-                <h3>🤖 今日AI重點 (LINE版)</h3>
-                <p><strong>💰 大新聞：</strong>Nvidia砸1000億美元投資OpenAI，推動下一代ChatGPT！</p>
-            </div>
-
-            <div style="text-align: center; margin-top: 20px;">
-                <p style="font-size: 0.9em; opacity: 0.8;">
-                    💡 此精華版專為LINE推送設計 | 完整分析請閱讀上方詳細報告
-                </p>
-            </div>
-        </div>
-
-        <div class="footer-nav">
-            <a href="./index.html" class="nav-button">🏠 返回首頁</a>
-            <a href="https://github.com/ThinkerCafe-tw/thinker-news" class="nav-button" target="_blank">⭐ GitHub</a>
-        </div>
-    </div>
-
-    <script>
-        // 頁面載入動畫
-        document.addEventListener('DOMContentLoaded', function() {{
-            const sections = document.querySelectorAll('.content-section');
-            sections.forEach((section, index) => {{
-                section.style.opacity = '0';
-                section.style.transform = 'translateY(20px)';
-                setTimeout(() => {{
-                    section.style.transition = 'all 0.6s ease';
-                    section.style.opacity = '1';
-                    section.style.transform = 'translateY(0)';
-                }}, index * 150);
-            }});
-        }});
-    </script>
-<script src="./thinker_secret_entrance.js"></script>
-</body>
-</html>
-
-要替換的內容:
-- 日期: {today_date}
-- 新聞內容: 以下 n8n 內容
-
-n8n 新聞內容:
-{notion_content}
-
-LINE消息版：
-{line_content}
-
-執行指令:
-1. 使用標準範本的完整格式
-2. 只替換日期和新聞內容
-3. 保持所有 CSS 和 JavaScript 不變
-4. 確保輸出結束於 </html>
-5. 不要添加任何說明文字
-
-請輸出完整的 HTML 代碼"""
+    # 靜態的系統提示詞與標準範本在前，每日內容在後（provider 的 prompt 快取以前綴比對）
+    prompt = get_prompt('html')
+    system_prompt = prompt.system
+    user_prompt = prompt.render(
+        today_date=today_date, notion_content=notion_content, line_content=line_content
+    )
 
     try:
-        response = model.generate_content(
-            f"{system_prompt}\n\n{user_prompt}",
-            generation_config=genai.types.GenerationConfig(
-                temperature=GEMINI_HTML_TEMP,
+        def generate():
+            model = clients.gemini_model(GEMINI_MODEL, system_prompt)
+            return gemini_generate(
+                model,
+                user_prompt,
+                genai.types.GenerationConfig(
+                    temperature=GEMINI_HTML_TEMP,
+                ),
+                stage='html'
             )
-        )
 
-        output = response.text
+        output = cached_generate(
+            'html', 'gemini', GEMINI_MODEL, system_prompt, user_prompt, GEMINI_HTML_TEMP, generate
+        )
 
         # 清理可能的 markdown 代碼塊標記
         if output.startswith('```html'):
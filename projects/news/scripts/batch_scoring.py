@@ -0,0 +1,151 @@
+"""
+批次評分模組
+為大量新聞（例如調整 FILTERS 後重新評分歷史資料）建立稀疏的「新聞 × 關鍵字」命中矩陣，
+再以陣列運算一次算出所有分數，結果與 news_filter.calculate_relevance 逐則計算完全相同
+
+需要 NumPy；未安裝時 score_batch 退回逐則計算
+"""
+
+import logging
+from typing import List, Dict, Optional
+
+from news_filter import (
+    CompiledFilters,
+    get_compiled_filters,
+    TAIWAN_SOURCES,
+    INTERNATIONAL_SOURCES,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+class HitMatrix:
+    """
+    稀疏命中矩陣（COO 格式）
+
+    三個區域各自一組 (rows, cols)：
+    - title: 關鍵字完整出現在標題
+    - content: 關鍵字完整出現在內容
+    - full: 關鍵字出現在「標題 + 空白 + 內容」的任何位置
+    """
+
+    def __init__(self, items: List[Dict], compiled: CompiledFilters):
+        if np is None:
+            raise ImportError("HitMatrix 需要 NumPy: pip install numpy")
+
+        self.compiled = compiled
+        self.size = len(items)
+
+        source_names = list(compiled.sources.keys())
+        self.source_names = source_names + ['unknown']
+        source_index = {name: index for index, name in enumerate(source_names)}
+        unknown_index = len(source_names)
+
+        coords = {'title': ([], []), 'content': ([], []), 'full': ([], [])}
+        sources = np.empty(self.size, dtype=np.int64)
+        content_lengths = np.empty(self.size, dtype=np.int64)
+        is_taiwan = np.zeros(self.size, dtype=bool)
+        is_international = np.zeros(self.size, dtype=bool)
+
+        for row, item in enumerate(items):
+            title = item.get('title', '').lower()
+            content = item.get('content', '').lower()
+            in_title, in_content, in_full = compiled.matcher.scan_regions(f"{title} {content}", len(title))
+
+            for region, hits in (('title', in_title), ('content', in_content - in_title), ('full', in_full)):
+                rows, cols = coords[region]
+                rows.extend([row] * len(hits))
+                cols.extend(hits)
+
+            source = item.get('source', 'unknown')
+            sources[row] = source_index.get(source, unknown_index)
+            content_lengths[row] = len(content)
+            is_taiwan[row] = source in TAIWAN_SOURCES
+            is_international[row] = source in INTERNATIONAL_SOURCES
+
+        self.coords = {
+            region: (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))
+            for region, (rows, cols) in coords.items()
+        }
+        self.sources = sources
+        self.content_lengths = content_lengths
+        self.is_taiwan = is_taiwan
+        self.is_international = is_international
+
+    def scores(self) -> 'np.ndarray':
+        """
+        以陣列運算計算所有新聞的分數
+
+        Returns:
+            int64 陣列，順序與建立時的 items 相同
+        """
+        compiled = self.compiled
+        pattern_count = len(compiled.matcher.patterns)
+        source_count = len(self.source_names)
+
+        # 每個來源一列的權重表：(來源, pattern)
+        weight_tables = {
+            region: np.zeros((source_count, pattern_count), dtype=np.int64)
+            for region in ('full', 'title', 'content')
+        }
+        base_scores = np.zeros(source_count, dtype=np.int64)
+        for index, name in enumerate(self.source_names):
+            base_score, *weights = compiled.source_weights(name)
+            base_scores[index] = base_score
+            for region, table in zip(('full', 'title', 'content'), weights):
+                for pattern_id, value in table.items():
+                    weight_tables[region][index, pattern_id] = value
+
+        scores = base_scores[self.sources].copy()
+        for region, (rows, cols) in self.coords.items():
+            if rows.size:
+                weights = weight_tables[region][self.sources[rows], cols]
+                scores += np.bincount(rows, weights=weights, minlength=self.size).astype(np.int64)
+
+        full_rows, full_cols = self.coords['full']
+        scores += 5 * self.is_taiwan
+        scores += 8 * (self.is_taiwan & self._any_hit(full_rows, full_cols, compiled.global_view))
+        scores += 10 * (self.is_international & self._any_hit(full_rows, full_cols, compiled.asia_view))
+
+        scores += 2 * (self.content_lengths > 300)
+        scores += 2 * (self.content_lengths > 500)
+
+        must_keep = self._any_hit(full_rows, full_cols, compiled.must_keep)
+        scores[must_keep] = 100
+
+        return scores
+
+    def _any_hit(self, rows: 'np.ndarray', cols: 'np.ndarray', pattern_ids: List[int]) -> 'np.ndarray':
+        """每則新聞是否命中 pattern_ids 中任一個"""
+        mask = np.zeros(self.size, dtype=bool)
+        if rows.size and pattern_ids:
+            mask[rows[np.isin(cols, pattern_ids)]] = True
+        return mask
+
+
+def score_batch(items: List[Dict], compiled: Optional[CompiledFilters] = None) -> List[int]:
+    """
+    批次計算相關性分數
+
+    Args:
+        items: 新聞列表
+        compiled: 編譯後的篩選配置（預設為 FILTERS）
+
+    Returns:
+        分數列表，與逐則呼叫 calculate_relevance 的結果相同
+    """
+    compiled = compiled or get_compiled_filters()
+
+    if np is None:
+        logger.warning("⚠️  未安裝 NumPy，批次評分改為逐則計算")
+        return [compiled.score(item) for item in items]
+
+    if not items:
+        return []
+
+    return [int(score) for score in HitMatrix(items, compiled).scores()]
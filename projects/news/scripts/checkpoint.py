@@ -0,0 +1,182 @@
+"""
+執行檢查點模組
+將每個階段的輸出保存在 runs/<run_id>/ 下，流程中途失敗時可從失敗的階段接續執行
+
+- 每個階段一個 <stage>.json：輸入 hash 與輸出
+- manifest.json 記錄執行日期與各階段狀態
+- 接續執行時，輸入 hash 相同的階段直接讀取檢查點，不重新讀取 RSS 或呼叫 AI
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 執行目錄（放在 .cache 下，GitHub Actions 重跑時也能接續）
+RUNS_DIR = os.getenv('RUNS_DIR', '.cache/runs')
+RUNS_KEEP = int(os.getenv('RUNS_KEEP', '14'))
+
+# 依執行順序排列的階段
+PIPELINE_STAGES = ('filter', 'alchemist', 'narrator', 'editor', 'html')
+
+
+def input_hash(*inputs: Any) -> str:
+    """
+    計算階段輸入的 hash
+
+    Args:
+        *inputs: 可 JSON 序列化的輸入
+
+    Returns:
+        64 字元的 SHA-256 hex 字串
+    """
+    payload = json.dumps(inputs, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def latest_run_id(runs_dir: str = RUNS_DIR) -> Optional[str]:
+    """最近一次執行的 run_id（目錄名稱依時間排序），沒有時回傳 None"""
+    root = Path(runs_dir)
+    if not root.exists():
+        return None
+    run_ids = sorted(p.name for p in root.iterdir() if (p / 'manifest.json').exists())
+    return run_ids[-1] if run_ids else None
+
+
+class RunCheckpoints:
+    """單次執行的階段檢查點"""
+
+    def __init__(self, run_id: str, today_date: Optional[str] = None, runs_dir: str = RUNS_DIR,
+                 resume: bool = False, from_stage: Optional[str] = None):
+        """
+        Args:
+            run_id: 執行 ID（新執行時使用 ExecutionLogger 的 execution_id）
+            today_date: 新聞日期（接續執行時從 manifest 讀取）
+            runs_dir: 執行目錄的上層
+            resume: 是否接續既有的執行
+            from_stage: 從此階段開始重新執行（之前的階段一律使用檢查點）
+        """
+        if from_stage is not None and from_stage not in PIPELINE_STAGES:
+            raise ValueError(f"未知的階段: {from_stage}")
+
+        self.runs_dir = Path(runs_dir)
+        self.run_id = run_id
+        self.run_dir = self.runs_dir / run_id
+        self.resume = resume
+        self.from_stage = from_stage
+        self.status: Dict[str, str] = {}
+
+        manifest_path = self.run_dir / 'manifest.json'
+        if resume:
+            if not manifest_path.exists():
+                raise ValueError(f"找不到執行紀錄: {self.run_dir}")
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        else:
+            self.run_dir.mkdir(parents=True, exist_ok=True)
+            self.manifest = {
+                'run_id': run_id,
+                'date': today_date,
+                'created_at': datetime.now().isoformat(),
+                'stages': {}
+            }
+            self._write_manifest()
+            self._prune()
+
+        self.today_date = self.manifest['date']
+
+    def load(self, stage: str, stage_input_hash: str) -> Optional[Any]:
+        """
+        讀取可重用的檢查點
+
+        Args:
+            stage: 階段名稱
+            stage_input_hash: 本次的輸入 hash
+
+        Returns:
+            階段輸出；非接續執行、從此階段重跑、或輸入已改變時回傳 None
+        """
+        if not self.resume:
+            return None
+        if self.from_stage is not None and stage == self.from_stage:
+            self.status[stage] = 'forced'
+            return None
+
+        path = self._stage_path(stage)
+        if not path.exists():
+            self.status[stage] = 'missing'
+            return None
+
+        with open(path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+
+        before_from_stage = (
+            self.from_stage is not None
+            and PIPELINE_STAGES.index(stage) < PIPELINE_STAGES.index(self.from_stage)
+        )
+        if checkpoint['input_hash'] != stage_input_hash and not before_from_stage:
+            self.status[stage] = 'changed'
+            logger.info(f"  🔁 {stage} 輸入已改變，重新執行")
+            return None
+
+        self.status[stage] = 'reused'
+        logger.info(f"  ⏭️  {stage} 使用檢查點（{self.run_id}）")
+        return checkpoint['output']
+
+    def save(self, stage: str, stage_input_hash: str, output: Any):
+        """
+        保存階段輸出
+
+        Args:
+            stage: 階段名稱
+            stage_input_hash: 輸入 hash
+            output: 可 JSON 序列化的輸出
+        """
+        checkpoint = {
+            'stage': stage,
+            'input_hash': stage_input_hash,
+            'saved_at': datetime.now().isoformat(),
+            'output': output
+        }
+
+        path = self._stage_path(stage)
+        tmp_path = path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        self.status.setdefault(stage, 'computed')
+        self.manifest['stages'][stage] = {
+            'input_hash': stage_input_hash,
+            'saved_at': checkpoint['saved_at']
+        }
+        self._write_manifest()
+
+    def report(self) -> Dict:
+        """
+        本次執行各階段的檢查點狀態
+
+        Returns:
+            {'run_id', 'resumed', 'stages': {stage: reused / computed / changed / forced / missing}}
+        """
+        return {'run_id': self.run_id, 'resumed': self.resume, 'stages': dict(self.status)}
+
+    def _prune(self):
+        """只保留最近 RUNS_KEEP 次執行"""
+        run_dirs: List[Path] = sorted(p for p in self.runs_dir.iterdir() if p.is_dir())
+        for old_dir in run_dirs[:-RUNS_KEEP] if RUNS_KEEP > 0 else []:
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+    def _write_manifest(self):
+        self.manifest['updated_at'] = datetime.now().isoformat()
+        with open(self.run_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+
+    def _stage_path(self, stage: str) -> Path:
+        return self.run_dir / f"{stage}.json"
@@ -0,0 +1,156 @@
+"""
+RSS Feed 快取模組
+以 ETag / Last-Modified 發送條件式請求，304 時直接重用上次解析的新聞
+
+每個來源在快取目錄中存兩個檔案：
+- <source>.json: 驗證標頭（etag、last_modified）與解析後的新聞列表
+- <source>.xml:  上次下載的原始 RSS 內容
+"""
+
+import os
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 快取目錄（相對於執行目錄，GitHub Actions 透過 actions/cache 保留）
+FEED_CACHE_DIR = os.getenv('FEED_CACHE_DIR', '.cache/feeds')
+
+
+class FeedCache:
+    """RSS Feed 條件式請求快取"""
+
+    def __init__(self, cache_dir: str = FEED_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.stats: Dict[str, Dict] = {}
+
+    def load(self, source_name: str, url: str) -> Optional[Dict]:
+        """
+        讀取來源的快取紀錄
+
+        Args:
+            source_name: 來源名稱
+            url: RSS feed URL（URL 變更時視為無快取）
+
+        Returns:
+            快取紀錄，不存在或已損毀時回傳 None
+        """
+        meta_path = self._meta_path(source_name)
+        if not meta_path.exists():
+            return None
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except Exception as e:
+            logger.warning(f"  ⚠️  {source_name} 快取讀取失敗: {str(e)}")
+            return None
+
+        if entry.get('url') != url:
+            return None
+        return entry
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """
+        根據快取紀錄組出條件式請求標頭
+
+        Args:
+            entry: load() 回傳的快取紀錄
+
+        Returns:
+            HTTP 標頭
+        """
+        headers = {}
+        if not entry:
+            return headers
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load_body(self, source_name: str) -> Optional[bytes]:
+        """讀取上次下載的原始 RSS 內容"""
+        body_path = self._body_path(source_name)
+        if not body_path.exists():
+            return None
+        return body_path.read_bytes()
+
+    def store(self, source_name: str, url: str, etag: Optional[str],
+              last_modified: Optional[str], body: bytes, entries: List[Dict],
+              window: Optional[str] = None):
+        """
+        寫入來源的快取紀錄
+
+        Args:
+            source_name: 來源名稱
+            url: RSS feed URL
+            etag: 回應的 ETag 標頭
+            last_modified: 回應的 Last-Modified 標頭
+            body: 原始 RSS 內容
+            entries: 解析後的新聞列表
+            window: 串流解析的日期區間（None 代表完整解析）
+        """
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'body_size': len(body),
+            'fetched_at': datetime.now().isoformat(),
+            'window': window,
+            'entries': entries
+        }
+
+        try:
+            self._body_path(source_name).write_bytes(body)
+            # 先寫暫存檔再替換，避免中斷時留下損毀的 JSON
+            meta_path = self._meta_path(source_name)
+            tmp_path = meta_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, meta_path)
+        except Exception as e:
+            logger.warning(f"  ⚠️  {source_name} 快取寫入失敗: {str(e)}")
+
+    def record(self, source_name: str, status: str, bytes_downloaded: int = 0, bytes_saved: int = 0):
+        """
+        記錄單一來源的快取結果
+
+        Args:
+            source_name: 來源名稱
+            status: hit（304 重用）/ miss（完整下載）/ error
+            bytes_downloaded: 實際下載的位元組數
+            bytes_saved: 因 304 省下的位元組數
+        """
+        self.stats[source_name] = {
+            'status': status,
+            'bytes_downloaded': bytes_downloaded,
+            'bytes_saved': bytes_saved
+        }
+
+    def report(self) -> Dict:
+        """
+        彙整本次執行的快取報告
+
+        Returns:
+            {'hits', 'misses', 'errors', 'bytes_downloaded', 'bytes_saved', 'sources'}
+        """
+        statuses = [s['status'] for s in self.stats.values()]
+        return {
+            'hits': statuses.count('hit'),
+            'misses': statuses.count('miss'),
+            'errors': statuses.count('error'),
+            'bytes_downloaded': sum(s['bytes_downloaded'] for s in self.stats.values()),
+            'bytes_saved': sum(s['bytes_saved'] for s in self.stats.values()),
+            'sources': dict(sorted(self.stats.items()))
+        }
+
+    def _meta_path(self, source_name: str) -> Path:
+        return self.cache_dir / f"{source_name}.json"
+
+    def _body_path(self, source_name: str) -> Path:
+        return self.cache_dir / f"{source_name}.xml"
@@ -0,0 +1,244 @@
+"""
+串流式 RSS / Atom 解析模組
+以 iterparse 逐則讀取，只為目標日期區間內的新聞建立資料
+
+- 區間外的新聞只解析日期欄位就丟棄，不轉換內容也不複製摘要
+- 依日期排序的 feed 在確定已越過區間後提前停止
+- 區間內的新聞組成只含這些項目的 feed 交給 feedparser，標題與內容經過相同的 HTML 清理，
+  產生的新聞與完整解析時完全相同
+- XML 格式錯誤時退回 feedparser 完整解析
+"""
+
+import io
+import logging
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Optional, Tuple
+
+import feedparser
+from feedparser.datetimes import _parse_date
+
+logger = logging.getLogger(__name__)
+
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+RSS1_NS = '{http://purl.org/rss/1.0/}'
+DC_NS = '{http://purl.org/dc/elements/1.1/}'
+
+ENTRY_TAGS = {'item', f'{RSS1_NS}item', f'{ATOM_NS}entry'}
+
+# 日期欄位（依優先順序，對齊 feedparser 的 published → updated）
+DATE_TAGS = ('pubDate', f'{DC_NS}date', f'{ATOM_NS}published', f'{ATOM_NS}updated')
+
+# 連續幾則早於區間的新聞後提前停止（僅限目前為止依日期遞減的 feed）
+EARLY_STOP_AFTER = 3
+
+# 日期區間：[start, end)，不含時區的 UTC 時間
+DateWindow = Tuple[datetime, datetime]
+
+# 重新解析區間內新聞時沿用的回應標頭（相對連結的基準與語言；編碼以重新序列化的 UTF-8 為準）
+REPARSE_HEADERS = ('content-location', 'content-language')
+
+
+def parse_entry_date(value: str) -> Optional[datetime]:
+    """
+    解析新聞日期為不含時區的 UTC 時間（與 feedparser 的 *_parsed 一致）
+
+    Args:
+        value: RSS (RFC 822) 或 Atom (ISO 8601) 日期字串
+
+    Returns:
+        datetime，無法解析時回傳 None
+    """
+    value = value.strip()
+    if not value:
+        return None
+
+    dt = None
+    try:
+        if value[0].isdigit():
+            dt = datetime.fromisoformat(value)
+        else:
+            dt = parsedate_to_datetime(value)
+    except (ValueError, TypeError, IndexError):
+        dt = None
+
+    if dt is not None:
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+        return dt.replace(microsecond=0)
+
+    # 少見格式交給 feedparser 的日期解析器
+    parsed = _parse_date(value)
+    if parsed:
+        try:
+            return datetime(*parsed[:6])
+        except ValueError:
+            return None
+    return None
+
+
+def parse_entries(source_name: str, feed) -> List[Dict]:
+    """
+    將 feedparser 結果轉為新聞列表
+
+    Args:
+        source_name: 來源名稱
+        feed: feedparser 解析結果
+
+    Returns:
+        新聞列表
+    """
+    news_items = []
+    for entry in feed.entries:
+        try:
+            # 提取新聞資訊
+            item = {
+                'title': entry.get('title', ''),
+                'link': entry.get('link', ''),
+                'content': entry.get('summary', entry.get('description', '')),
+                'pubDate': entry.get('published', entry.get('updated', '')),
+                'isoDate': entry.get('published_parsed', entry.get('updated_parsed', None)),
+                'source': source_name
+            }
+
+            # 轉換日期格式
+            if item['isoDate']:
+                try:
+                    dt = datetime(*item['isoDate'][:6])
+                    item['isoDate'] = dt.isoformat()
+                except:
+                    item['isoDate'] = ''
+
+            news_items.append(item)
+
+        except Exception as e:
+            logger.warning(f"  ⚠️  處理 {source_name} 的某則新聞時出錯: {str(e)}")
+            continue
+
+    return news_items
+
+
+def stream_feed_entries(source_name: str, body: bytes, window: DateWindow,
+                        response_headers: Optional[Dict] = None) -> List[Dict]:
+    """
+    串流解析 RSS / Atom，只回傳日期在區間內（或沒有日期）的新聞
+
+    Args:
+        source_name: 來源名稱
+        body: 原始 RSS 內容
+        window: 日期區間 [start, end)
+        response_headers: HTTP 回應標頭（可選，小寫鍵）
+
+    Returns:
+        新聞列表（與 feedparser 完整解析時相同的欄位與內容）
+    """
+    try:
+        return _iterparse_entries(source_name, body, window, response_headers or {})
+    except ET.ParseError as e:
+        logger.warning(f"  ⚠️  {source_name} XML 串流解析失敗，改用 feedparser: {str(e)}")
+        return _feedparser_entries(source_name, body, window, response_headers or {})
+
+
+def _iterparse_entries(source_name: str, body: bytes, window: DateWindow, response_headers: Dict) -> List[Dict]:
+    start, end = window
+    kept = []
+    ancestors = None
+    parents = []
+    previous_dt = None
+    descending = True
+    older_streak = 0
+    skipped = 0
+
+    for event, elem in ET.iterparse(io.BytesIO(body), events=('start', 'end')):
+        if event == 'start':
+            parents.append(elem)
+            continue
+
+        parents.pop()
+        if elem.tag not in ENTRY_TAGS:
+            continue
+
+        date_text = _first_text(elem, DATE_TAGS)
+        entry_dt = parse_entry_date(date_text) if date_text else None
+
+        if entry_dt is not None:
+            if previous_dt is not None and entry_dt > previous_dt:
+                descending = False
+            previous_dt = entry_dt
+
+        if entry_dt is None or start <= entry_dt < end:
+            older_streak = 0
+            kept.append(elem)
+            if ancestors is None:
+                ancestors = [(parent.tag, dict(parent.attrib)) for parent in parents]
+        else:
+            skipped += 1
+            older_streak = older_streak + 1 if entry_dt < start else 0
+
+        # 已處理完的新聞從樹中移除，維持固定記憶體用量
+        if parents:
+            parents[-1].remove(elem)
+
+        if descending and older_streak >= EARLY_STOP_AFTER:
+            logger.info(f"  ⏭️  {source_name}: 已越過目標日期區間，提前停止解析")
+            break
+
+    news_items = _reparse_kept(source_name, ancestors, kept, response_headers) if kept else []
+    logger.info(f"  ✅ {source_name}: 串流解析保留 {len(news_items)} 則，略過 {skipped} 則")
+    return news_items
+
+
+def _reparse_kept(source_name: str, ancestors: List[Tuple[str, Dict]], kept: List[ET.Element],
+                  response_headers: Dict) -> List[Dict]:
+    """
+    以原本的外層元素（rss / channel、feed、rdf:RDF，含 version、xml:base 等屬性）包住區間內的新聞，
+    交給 feedparser 解析，標題與內容經過與完整解析相同的 HTML 清理
+
+    Args:
+        source_name: 來源名稱
+        ancestors: 新聞元素的外層元素 [(tag, attrib)]，由外而內
+        kept: 區間內的新聞元素
+        response_headers: HTTP 回應標頭（小寫鍵）
+
+    Returns:
+        新聞列表
+    """
+    root = parent = None
+    for tag, attrib in ancestors:
+        element = ET.Element(tag, attrib)
+        if parent is None:
+            root = element
+        else:
+            parent.append(element)
+        parent = element
+    if parent is None:
+        # 新聞元素本身就是根元素（不是 feed），沒有外層可包
+        root = parent = ET.Element('rss', {'version': '2.0'})
+    parent.extend(kept)
+
+    headers = {key: value for key, value in response_headers.items() if key in REPARSE_HEADERS}
+    feed = feedparser.parse(ET.tostring(root, encoding='utf-8'), response_headers=headers)
+    return parse_entries(source_name, feed)
+
+
+def _feedparser_entries(source_name: str, body: bytes, window: DateWindow, response_headers: Dict) -> List[Dict]:
+    """feedparser 退回方案：完整解析後再依區間過濾"""
+    start, end = window
+    feed = feedparser.parse(body, response_headers=response_headers)
+
+    news_items = []
+    for item in parse_entries(source_name, feed):
+        if item['isoDate']:
+            if not (start <= datetime.fromisoformat(item['isoDate']) < end):
+                continue
+        news_items.append(item)
+    return news_items
+
+
+def _first_text(elem: ET.Element, tags: Tuple[str, ...]) -> str:
+    for tag in tags:
+        child = elem.find(tag)
+        if child is not None and child.text:
+            return child.text.strip()
+    return ''
@@ -0,0 +1,278 @@
+"""
+對沖請求模組（hedged requests）
+主要 provider 超過延遲門檻仍未回應時，同時向備用 provider 發出相同請求，
+先回傳有效結果的一方勝出，另一方取消
+
+- 門檻取主要 provider 在該階段的歷史 p95 延遲（樣本不足時使用 AI_HEDGE_DEFAULT_SECONDS）
+- 延遲樣本保存在 .cache 下，跨次執行累積；對沖落敗被取消的呼叫以取消時的耗時記錄（實際延遲的下限），
+  否則歷史只剩較快的呼叫，p95 門檻會逐漸下降、對沖越來越頻繁
+- 每次對沖記錄勝出的 provider 與估計節省的時間，並累計到歷史檔，評估對沖是否划算
+"""
+
+import os
+import json
+import math
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# 延遲歷史（與其他快取一起由 GitHub Actions 保留）
+AI_LATENCY_HISTORY = os.getenv('AI_LATENCY_HISTORY', '.cache/latency.json')
+# 每個 (階段, provider) 保留的樣本數
+LATENCY_SAMPLES_KEEP = int(os.getenv('AI_LATENCY_SAMPLES_KEEP', '50'))
+# 樣本數少於此值時不計算 p95，改用預設門檻
+HEDGE_MIN_SAMPLES = int(os.getenv('AI_HEDGE_MIN_SAMPLES', '5'))
+AI_HEDGE_DEFAULT_SECONDS = float(os.getenv('AI_HEDGE_DEFAULT_SECONDS', '90'))
+
+
+class HedgeCancelled(Exception):
+    """對沖的另一方已勝出，本次請求被取消"""
+
+
+class Attempt(NamedTuple):
+    """對沖的一方：provider、模型與實際呼叫（收到 cancel 事件時應盡快中止）"""
+    provider: str
+    model: str
+    call: Callable[[Optional[threading.Event]], str]
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """最近秩法的百分位數"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class LatencyHistory:
+    """各階段、各 provider 的延遲樣本與對沖統計"""
+
+    def __init__(self, path: str = AI_LATENCY_HISTORY, keep: int = LATENCY_SAMPLES_KEEP):
+        self.path = Path(path)
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._data: Optional[Dict] = None
+
+    def record(self, stage: str, provider: str, seconds: float):
+        """
+        記錄一次呼叫的延遲（成功，或對沖落敗被取消時到取消為止的耗時）
+
+        Args:
+            stage: 處理階段（分片的 <stage>#<n> 以 <stage> 計）
+            provider: gemini / openai
+            seconds: 從發出請求到取得完整回應的秒數
+        """
+        with self._lock:
+            samples = self._load()['samples'].setdefault(self._key(stage, provider), [])
+            samples.append(round(seconds, 3))
+            del samples[:-self.keep]
+            self._save()
+
+    def samples(self, stage: str, provider: str) -> List[float]:
+        """取得延遲樣本"""
+        with self._lock:
+            return list(self._load()['samples'].get(self._key(stage, provider), []))
+
+    def threshold(self, stage: str, provider: str) -> float:
+        """
+        對沖門檻：歷史 p95 延遲
+
+        Args:
+            stage: 處理階段
+            provider: 主要 provider
+
+        Returns:
+            秒數（樣本不足時為 AI_HEDGE_DEFAULT_SECONDS）
+        """
+        samples = self.samples(stage, provider)
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return AI_HEDGE_DEFAULT_SECONDS
+        return percentile(samples, 95)
+
+    def expected_tail(self, stage: str, provider: str, threshold: float) -> float:
+        """已超過門檻時的預期總延遲：歷史樣本中超過門檻者的平均，沒有時為門檻本身"""
+        tail = [s for s in self.samples(stage, provider) if s >= threshold]
+        return sum(tail) / len(tail) if tail else threshold
+
+    def record_hedge(self, stage: str, winner: str, secondary_won: bool, saved_seconds: float):
+        """累計對沖統計（觸發次數、備用方勝出次數、估計節省秒數）"""
+        with self._lock:
+            tally = self._load()['hedges'].setdefault(
+                stage.partition('#')[0],
+                {'hedged': 0, 'secondary_wins': 0, 'estimated_saved_seconds': 0.0, 'winners': {}}
+            )
+            tally['hedged'] += 1
+            tally['secondary_wins'] += int(secondary_won)
+            tally['estimated_saved_seconds'] = round(tally['estimated_saved_seconds'] + saved_seconds, 3)
+            tally['winners'][winner] = tally['winners'].get(winner, 0) + 1
+            self._save()
+
+    def report(self) -> Dict:
+        """歷次對沖的累計統計"""
+        with self._lock:
+            return json.loads(json.dumps(self._load()['hedges']))
+
+    def _key(self, stage: str, provider: str) -> str:
+        return f"{stage.partition('#')[0]}/{provider}"
+
+    def _load(self) -> Dict:
+        if self._data is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._data = json.load(f)
+            except FileNotFoundError:
+                self._data = {}
+            except Exception as e:
+                logger.warning(f"  ⚠️  延遲歷史讀取失敗，重新累積: {str(e)}")
+                self._data = {}
+            self._data.setdefault('samples', {})
+            self._data.setdefault('hedges', {})
+        return self._data
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"  ⚠️  延遲歷史寫入失敗: {str(e)}")
+
+
+# 程序共用的延遲歷史
+latency_history = LatencyHistory()
+
+
+def timed_call(stage: str, attempt: Attempt, cancel: Optional[threading.Event] = None) -> str:
+    """
+    執行單一 provider 的呼叫並記錄延遲（未對沖時也累積樣本，供之後計算門檻）
+    被取消時記錄到取消為止的耗時（下限樣本）
+
+    Args:
+        stage: 處理階段
+        attempt: 要執行的呼叫
+        cancel: 取消事件（未對沖時為 None）
+
+    Returns:
+        AI 回應文字
+    """
+    started_at = time.perf_counter()
+    try:
+        output = attempt.call(cancel)
+    except HedgeCancelled:
+        latency_history.record(stage, attempt.provider, time.perf_counter() - started_at)
+        raise
+    latency_history.record(stage, attempt.provider, time.perf_counter() - started_at)
+    return output
+
+
+def hedged_call(stage: str, primary: Attempt, secondary: Attempt,
+                validate: Callable[[str], Any]) -> Dict:
+    """
+    對沖呼叫：主要 provider 超過門檻仍未完成時啟動備用 provider，先取得有效結果者勝出
+
+    Args:
+        stage: 處理階段
+        primary: 主要 provider 的呼叫
+        secondary: 備用 provider 的呼叫
+        validate: 檢查輸出是否有效，無效時拋出例外
+
+    Returns:
+        {'output', 'provider', 'model', 'telemetry'}
+
+    Raises:
+        兩方都失敗時拋出主要 provider 的錯誤
+    """
+    threshold = latency_history.threshold(stage, primary.provider)
+    events = {'primary': threading.Event(), 'secondary': threading.Event()}
+    attempts = {'primary': primary, 'secondary': secondary}
+    errors: Dict[str, BaseException] = {}
+    elapsed: Dict[str, float] = {}
+
+    def run(role: str) -> str:
+        output = timed_call(stage, attempts[role], events[role])
+        validate(output)
+        elapsed[role] = time.perf_counter() - started_at
+        return output
+
+    started_at = time.perf_counter()
+    # 不等待被取消的一方結束（無法中途取消的請求在背景自然結束，結果捨棄）
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"hedge-{stage}")
+    try:
+        pending = {executor.submit(run, 'primary'): 'primary'}
+        done, _ = wait(pending, timeout=threshold)
+        hedged = not done
+        if hedged:
+            logger.info(
+                f"  🪁 {stage} {primary.provider} 超過 {threshold:.1f} 秒未回應，"
+                f"同時請求 {secondary.provider}/{secondary.model}"
+            )
+            pending[executor.submit(run, 'secondary')] = 'secondary'
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                role = pending.pop(future)
+                try:
+                    output = future.result()
+                except Exception as e:
+                    errors[role] = e
+                    logger.warning(f"  ⚠️  {stage} {attempts[role].provider} 失敗: {str(e)}")
+                    # 主要方在門檻內失敗時，直接改用備用方（failover）
+                    if role == 'primary' and not hedged:
+                        hedged = True
+                        logger.info(f"  🔀 {stage} 改用 {secondary.provider}/{secondary.model}")
+                        pending[executor.submit(run, 'secondary')] = 'secondary'
+                    continue
+
+                for other in pending.values():
+                    events[other].set()
+                return {
+                    'output': output,
+                    'provider': attempts[role].provider,
+                    'model': attempts[role].model,
+                    'telemetry': _hedge_telemetry(stage, attempts, role, hedged, threshold, elapsed, errors)
+                }
+    finally:
+        executor.shutdown(wait=False)
+
+    raise errors.get('primary') or errors['secondary']
+
+
+def _hedge_telemetry(stage: str, attempts: Dict[str, Attempt], winner_role: str, hedged: bool,
+                     threshold: float, elapsed: Dict[str, float], errors: Dict[str, BaseException]) -> Dict:
+    """整理對沖結果並累計到延遲歷史"""
+    primary = attempts['primary']
+    winner = attempts[winner_role]
+    winner_seconds = elapsed[winner_role]
+    telemetry = {
+        'hedged': hedged,
+        'threshold_seconds': round(threshold, 3),
+        'winner': winner_role,
+        'winner_provider': winner.provider,
+        'winner_seconds': round(winner_seconds, 3),
+        'estimated_saved_seconds': 0.0
+    }
+    if not hedged:
+        return telemetry
+
+    if winner_role == 'secondary' and 'primary' not in errors:
+        # 主要方被取消，以歷史上超過門檻時的平均延遲估計它還要多久
+        expected = latency_history.expected_tail(stage, primary.provider, threshold)
+        telemetry['estimated_saved_seconds'] = round(max(0.0, expected - winner_seconds), 3)
+    elif 'primary' in errors:
+        telemetry['primary_error'] = str(errors['primary'])[:200]
+
+    latency_history.record_hedge(
+        stage, winner.provider, winner_role == 'secondary', telemetry['estimated_saved_seconds']
+    )
+    logger.info(
+        f"  🏁 {stage} 由 {winner.provider}/{winner.model} 勝出（{winner_seconds:.1f} 秒），"
+        f"估計節省 {telemetry['estimated_saved_seconds']:.1f} 秒"
+    )
+    return telemetry
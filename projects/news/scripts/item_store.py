@@ -0,0 +1,326 @@
+"""
+新聞項目儲存模組
+以 SQLite 持久化 RSS 讀取結果，讓篩選與其他生成器不必重新下載
+
+- 以正規化連結的 hash 為主鍵，重複讀取的新聞只會更新不會重複
+- 對 (source, iso_date) 與 iso_date 建索引，依日期區間查詢不需掃描全部
+- feed_position 記錄最近一次讀取時在來源 feed 中的位置，查詢結果維持 feed 順序
+  （篩選以穩定排序取前 N 則，同分的新聞依 feed 順序入選，與直接使用 RSS 結果相同）
+- translations 表保存數據煉金術師對每則新聞的轉譯與摘要（翻譯備忘），
+  連續幾天都留在 feed 中的新聞不必每天重新轉譯
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Optional, Iterable, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+# 資料庫路徑（與 Feed 快取放在同一個 .cache 目錄）
+ITEM_STORE_PATH = os.getenv('ITEM_STORE_PATH', '.cache/news_items.db')
+
+# 正規化連結時移除的追蹤參數
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    link_hash  TEXT PRIMARY KEY,
+    link       TEXT NOT NULL,
+    title      TEXT NOT NULL,
+    content    TEXT NOT NULL,
+    pub_date   TEXT NOT NULL,
+    iso_date   TEXT NOT NULL,
+    source     TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen  TEXT NOT NULL,
+    feed_position INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_items_source_iso ON items (source, iso_date);
+CREATE INDEX IF NOT EXISTS idx_items_iso ON items (iso_date);
+CREATE TABLE IF NOT EXISTS translations (
+    link_hash  TEXT PRIMARY KEY,
+    title_hash TEXT NOT NULL,
+    prompt     TEXT NOT NULL,
+    category   TEXT NOT NULL,
+    output     TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    last_used  TEXT NOT NULL
+);
+"""
+
+
+def canonical_link(link: str) -> str:
+    """
+    正規化新聞連結：小寫 scheme/host、移除 fragment 與追蹤參數、去除結尾斜線
+
+    Args:
+        link: 原始連結
+
+    Returns:
+        正規化後的連結
+    """
+    parts = urlsplit(link.strip())
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    ]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+def link_hash(item: Dict) -> str:
+    """
+    計算新聞的主鍵（正規化連結的 SHA-1；沒有連結時改用來源 + 標題）
+
+    Args:
+        item: 新聞項目
+
+    Returns:
+        40 字元的 hex 字串
+    """
+    link = item.get('link', '')
+    key = canonical_link(link) if link else f"{item.get('source', '')}:{item.get('title', '')}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def title_hash(title: str) -> str:
+    """標題的 SHA-1（忽略空白差異）；標題改變時翻譯備忘即失效"""
+    return hashlib.sha1(' '.join((title or '').split()).encode('utf-8')).hexdigest()
+
+
+class ItemStore:
+    """新聞項目 SQLite 儲存"""
+
+    def __init__(self, db_path: str = ITEM_STORE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """舊版資料庫補上 feed_position 欄位"""
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(items)")}
+        if 'feed_position' not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE items ADD COLUMN feed_position INTEGER NOT NULL DEFAULT 0")
+
+    def upsert_items(self, items: Iterable[Dict]) -> Dict[str, int]:
+        """
+        寫入新聞項目，已存在的連結只更新內容、last_seen 與 feed_position
+
+        Args:
+            items: rss_fetcher 產生的新聞列表
+
+        Returns:
+            {'new': 新增數, 'updated': 更新數}
+        """
+        now = datetime.now().isoformat()
+        positions: Dict[str, int] = {}
+        rows = []
+        for item in items:
+            source = item.get('source', 'unknown')
+            positions[source] = positions.get(source, -1) + 1
+            rows.append((
+                link_hash(item),
+                item.get('link', ''),
+                item.get('title', ''),
+                item.get('content', ''),
+                item.get('pubDate', ''),
+                _normalize_iso(item.get('isoDate', '')),
+                source,
+                now,
+                now,
+                positions[source]
+            ))
+
+        before = self.count()
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO items (link_hash, link, title, content, pub_date, iso_date, source, first_seen, last_seen,
+                                   feed_position)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (link_hash) DO UPDATE SET
+                    title = excluded.title,
+                    content = excluded.content,
+                    pub_date = excluded.pub_date,
+                    iso_date = excluded.iso_date,
+                    last_seen = excluded.last_seen,
+                    feed_position = excluded.feed_position
+                """,
+                rows
+            )
+        new_count = self.count() - before
+
+        return {'new': new_count, 'updated': len(rows) - new_count}
+
+    def items_for_date(self, date_str: str, sources: Optional[List[str]] = None) -> List[Dict]:
+        """
+        查詢某一天（iso_date 所在日期）發布的新聞
+
+        Args:
+            date_str: 日期 (YYYY-MM-DD)
+            sources: 只查詢指定來源（可選）
+
+        Returns:
+            新聞列表（與 rss_fetcher 相同的欄位）
+        """
+        start = datetime.strptime(date_str, '%Y-%m-%d')
+        end = start + timedelta(days=1)
+        return self.items_in_window(start.isoformat(), end.isoformat(), sources)
+
+    def items_in_window(self, start_iso: str, end_iso: str,
+                        sources: Optional[List[str]] = None) -> List[Dict]:
+        """
+        查詢 iso_date 介於 [start_iso, end_iso) 的新聞（走 iso_date 索引）
+
+        Args:
+            start_iso: 起始時間（含）
+            end_iso: 結束時間（不含）
+            sources: 只查詢指定來源（可選）
+
+        Returns:
+            新聞列表（依來源分組；同一來源內依最近一次讀取的 feed 順序，較早讀取的項目排在後面）
+        """
+        query = "SELECT * FROM items WHERE iso_date >= ? AND iso_date < ?"
+        params: List = [start_iso, end_iso]
+        if sources:
+            query += f" AND source IN ({','.join('?' * len(sources))})"
+            params.extend(sources)
+        query += " ORDER BY source, last_seen DESC, feed_position, link_hash"
+
+        return [_row_to_item(row) for row in self.conn.execute(query, params)]
+
+    def latest_items(self, source: str, limit: int, since_iso: str = '') -> List[Dict]:
+        """
+        查詢某來源最新的 N 則新聞（走 (source, iso_date) 索引）
+
+        Args:
+            source: 來源名稱
+            limit: 數量上限
+            since_iso: 只查詢 iso_date 不早於此時間的新聞（可選）
+
+        Returns:
+            新聞列表
+        """
+        rows = self.conn.execute(
+            "SELECT * FROM items WHERE source = ? AND iso_date >= ? ORDER BY iso_date DESC LIMIT ?",
+            (source, since_iso, limit)
+        )
+        return [_row_to_item(row) for row in rows]
+
+    def translations_for(self, items: Iterable[Dict], prompt: str, max_age_days: int) -> Dict[str, Dict]:
+        """
+        查詢新聞的翻譯備忘（連結與標題都相同、同一 prompt 版本、未超過保存天數）
+
+        Args:
+            items: 新聞列表
+            prompt: 產生翻譯的 prompt 版本與文字指紋（例如 alchemist@v1#3f2a9c0d1e4b）
+            max_age_days: 備忘的最長保存天數
+
+        Returns:
+            {link_hash: {'category': 分類, 'item': 數據煉金術師輸出的新聞}}
+        """
+        wanted = {link_hash(item): title_hash(item.get('title', '')) for item in items}
+        if not wanted:
+            return {}
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+        keys = list(wanted)
+        rows = []
+        # SQLite 的參數數量有上限，分批查詢
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            rows += self.conn.execute(
+                f"SELECT * FROM translations WHERE link_hash IN ({','.join('?' * len(batch))})"
+                " AND prompt = ? AND created_at >= ?",
+                batch + [prompt, cutoff]
+            ).fetchall()
+
+        memo = {
+            row['link_hash']: {'category': row['category'], 'item': json.loads(row['output'])}
+            for row in rows if row['title_hash'] == wanted[row['link_hash']]
+        }
+        if memo:
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE translations SET last_used = ? WHERE link_hash = ?",
+                    [(datetime.now().isoformat(), key) for key in memo]
+                )
+        return memo
+
+    def save_translations(self, entries: Iterable[Tuple[Dict, str, Dict]], prompt: str) -> int:
+        """
+        寫入翻譯備忘（同一連結以最新的翻譯覆蓋）
+
+        Args:
+            entries: (原始新聞, 分類, 數據煉金術師輸出的新聞)
+            prompt: 產生翻譯的 prompt 版本
+
+        Returns:
+            寫入筆數
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (link_hash(source), title_hash(source.get('title', '')), prompt, category,
+             json.dumps(output, ensure_ascii=False), now, now)
+            for source, category, output in entries
+        ]
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO translations (link_hash, title_hash, prompt, category, output, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (link_hash) DO UPDATE SET
+                    title_hash = excluded.title_hash,
+                    prompt = excluded.prompt,
+                    category = excluded.category,
+                    output = excluded.output,
+                    created_at = excluded.created_at,
+                    last_used = excluded.last_used
+                """,
+                rows
+            )
+        return len(rows)
+
+    def count(self) -> int:
+        """目前儲存的新聞總數"""
+        return self.conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _normalize_iso(iso_date: str) -> str:
+    """統一為不含時區的 ISO 格式，讓字串比較等同時間比較"""
+    if not iso_date:
+        return ''
+    try:
+        dt = datetime.fromisoformat(iso_date.replace('Z', '+00:00'))
+        return dt.replace(tzinfo=None).isoformat()
+    except ValueError:
+        return ''
+
+
+def _row_to_item(row: sqlite3.Row) -> Dict:
+    return {
+        'title': row['title'],
+        'link': row['link'],
+        'content': row['content'],
+        'pubDate': row['pub_date'],
+        'isoDate': row['iso_date'],
+        'source': row['source']
+    }
@@ -0,0 +1,92 @@
+"""
+串流 JSON 驗證模組
+在 AI 回應逐段送達時檢查 JSON 結構，明顯格式錯誤時立即中止，不必等整段生成完
+
+只擋下 json-repair 也救不回來的錯誤：
+- 開頭一大段文字都沒有出現 {
+- 括號不成對（例如 { 以 ] 結尾）
+其餘小問題（尾逗號、被截斷等）交給 utils.validate_json_output 修復
+"""
+
+from typing import List, Optional
+
+# 第一個 { 之前容許的非空白字元數（```json 標記、簡短前言）
+MAX_PREAMBLE_CHARS = 200
+
+CLOSING = {'}': '{', ']': '['}
+
+
+class MalformedJSONError(ValueError):
+    """串流中偵測到無法修復的 JSON 格式錯誤"""
+
+
+class IncrementalJSONValidator:
+    """逐段檢查 AI 輸出的最外層 JSON 物件"""
+
+    def __init__(self, max_preamble: int = MAX_PREAMBLE_CHARS):
+        self.max_preamble = max_preamble
+        self.preamble = 0
+        self.stack: List[str] = []
+        self.started = False
+        self.complete = False
+        self.in_string = False
+        self.escaped = False
+        self.position = 0
+        self.end: Optional[int] = None
+
+    def feed(self, chunk: str) -> bool:
+        """
+        檢查新送達的文字
+
+        Args:
+            chunk: 串流的一段文字
+
+        Returns:
+            最外層物件是否已完整結束（之後的內容可以不用再讀）
+
+        Raises:
+            MalformedJSONError: 格式明顯錯誤
+        """
+        for char in chunk:
+            self.position += 1
+            if self.complete:
+                continue
+
+            if not self.started:
+                if char == '{':
+                    self.started = True
+                    self.stack.append('{')
+                elif not char.isspace():
+                    self.preamble += 1
+                    if self.preamble > self.max_preamble:
+                        raise MalformedJSONError(f"前 {self.position} 個字元內沒有 JSON 物件")
+                continue
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"':
+                self.in_string = True
+            elif char in '{[':
+                self.stack.append(char)
+            elif char in CLOSING:
+                if not self.stack or self.stack[-1] != CLOSING[char]:
+                    expected = '}' if self.stack and self.stack[-1] == '{' else ']'
+                    raise MalformedJSONError(f"第 {self.position} 個字元括號不成對：預期 {expected}，收到 {char}")
+                self.stack.pop()
+                if not self.stack:
+                    self.complete = True
+                    self.end = self.position
+
+        return self.complete
+
+    @property
+    def depth(self) -> int:
+        """目前的巢狀深度（被截斷時大於 0）"""
+        return len(self.stack)
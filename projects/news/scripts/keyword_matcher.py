@@ -0,0 +1,148 @@
+"""
+多關鍵字比對模組
+Aho–Corasick 自動機：一次掃描文字即找出所有關鍵字的出現位置
+
+有安裝 pyahocorasick 時使用其 C 實作，否則使用純 Python 的完整轉移表（DFA）版本
+"""
+
+from collections import deque
+from typing import Dict, Iterator, List, Sequence, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """Aho–Corasick 多關鍵字比對器"""
+
+    def __init__(self, patterns: Sequence[str]):
+        """
+        編譯關鍵字
+
+        Args:
+            patterns: 關鍵字列表（區分大小寫，需要不分大小寫時請先轉小寫）
+        """
+        self.patterns: List[str] = list(patterns)
+        if any(not pattern for pattern in self.patterns):
+            raise ValueError("關鍵字不可為空字串")
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for pattern_id, pattern in enumerate(self.patterns):
+                existing = self._automaton.get(pattern, None)
+                ids = (existing[1] if existing else ()) + (pattern_id,)
+                self._automaton.add_word(pattern, (len(pattern), ids))
+            self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            self._build_dfa()
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        找出所有（可重疊的）關鍵字出現位置
+
+        Args:
+            text: 要比對的文字
+
+        Yields:
+            (start, end, pattern_id)，text[start:end] == patterns[pattern_id]
+        """
+        if self._automaton is not None:
+            if not self.patterns:
+                return
+            for end_index, (length, ids) in self._automaton.iter(text):
+                for pattern_id in ids:
+                    yield end_index + 1 - length, end_index + 1, pattern_id
+            return
+
+        delta = self._delta
+        outputs = self._outputs
+        lengths = self._lengths
+        state = 0
+        for index, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                end = index + 1
+                for pattern_id in outputs[state]:
+                    yield end - lengths[pattern_id], end, pattern_id
+
+    def scan_regions(self, text: str, boundary: int) -> Tuple[Set[int], Set[int], Set[int]]:
+        """
+        掃描以 boundary 切成前後兩段的文字（例如「標題 + 空白 + 內容」），
+        分別回傳完整落在前段、完整落在後段、以及出現在全文任何位置的 pattern
+
+        Args:
+            text: 要比對的文字
+            boundary: 前段長度；text[boundary] 為分隔字元
+
+        Returns:
+            (前段命中, 後段命中, 全文命中) 的 pattern_id 集合
+        """
+        head, tail, anywhere = set(), set(), set()
+
+        if self._automaton is not None:
+            if not self.patterns:
+                return head, tail, anywhere
+            for end_index, (length, ids) in self._automaton.iter(text):
+                anywhere.update(ids)
+                if end_index < boundary:
+                    head.update(ids)
+                elif end_index + 1 - length > boundary:
+                    tail.update(ids)
+            return head, tail, anywhere
+
+        delta = self._delta
+        outputs = self._outputs
+        lengths = self._lengths
+        state = 0
+        for index, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                anywhere.update(outputs[state])
+                if index < boundary:
+                    head.update(outputs[state])
+                else:
+                    for pattern_id in outputs[state]:
+                        if index + 1 - lengths[pattern_id] > boundary:
+                            tail.add(pattern_id)
+        return head, tail, anywhere
+
+    def _build_dfa(self):
+        """建立 trie、失敗連結，並展開成完整的轉移表"""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[int, ...]] = [()]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append(())
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state] = outputs[state] + (pattern_id,)
+
+        # BFS 計算失敗連結，同時把失敗狀態的轉移合併進來，
+        # 掃描時每個字元只需要一次 dict 查詢
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            fallback = delta[fail[state]]
+            merged = dict(fallback)
+            merged.update(goto[state])
+            delta[state] = merged
+            outputs[state] = outputs[state] + outputs[fail[state]]
+
+            for char, next_state in goto[state].items():
+                fail[next_state] = fallback.get(char, 0)
+                queue.append(next_state)
+
+        self._delta = delta
+        self._outputs = outputs
+        self._lengths = [len(pattern) for pattern in self.patterns]
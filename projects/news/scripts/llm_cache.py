@@ -0,0 +1,202 @@
+"""
+LLM 回應快取模組
+以 (provider, model, system prompt, user prompt, temperature) 的 hash 為 key 保存 AI 回應，
+prompt 完全相同時（例如後段流程失敗後重跑、重新產生某日頁面）直接重用，不再呼叫 API
+
+- 每個 key 一個 JSON 檔，依 key 前兩碼分目錄
+- TTL：超過有效期限的紀錄視為未命中並刪除
+- 容量上限：超過時依最後使用時間（檔案 mtime）淘汰最久未用的紀錄（LRU）
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 快取目錄（與 Feed 快取放在同一個 .cache 目錄，GitHub Actions 會保留）
+LLM_CACHE_DIR = os.getenv('LLM_CACHE_DIR', '.cache/llm')
+LLM_CACHE_TTL_HOURS = float(os.getenv('LLM_CACHE_TTL_HOURS', '168'))
+LLM_CACHE_MAX_MB = float(os.getenv('LLM_CACHE_MAX_MB', '100'))
+
+
+def cache_key(provider: str, model: str, system_prompt: str, user_prompt: str,
+              temperature: Optional[float]) -> str:
+    """
+    計算回應快取的 key
+
+    Args:
+        provider: gemini / openai
+        model: 模型名稱
+        system_prompt: 系統提示詞
+        user_prompt: 使用者提示詞
+        temperature: 溫度（未指定時為 None）
+
+    Returns:
+        64 字元的 SHA-256 hex 字串
+    """
+    payload = json.dumps(
+        [provider, model, system_prompt, user_prompt, temperature],
+        ensure_ascii=False, separators=(',', ':')
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """LLM 回應磁碟快取"""
+
+    def __init__(self, cache_dir: str = LLM_CACHE_DIR, ttl_hours: float = LLM_CACHE_TTL_HOURS,
+                 max_mb: float = LLM_CACHE_MAX_MB):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = True
+        self.refresh_stages = set()
+        self.stats: Dict[str, Dict] = {}
+
+    def configure(self, enabled: bool = True, refresh_stages: Optional[Iterable[str]] = None):
+        """
+        套用命令列設定
+
+        Args:
+            enabled: False 時完全不讀寫快取（--no-cache）
+            refresh_stages: 忽略既有快取、重新呼叫 API 的階段（--refresh-stage），新結果仍會寫入
+        """
+        self.enabled = enabled
+        self.refresh_stages = set(refresh_stages or ())
+
+    def get(self, stage: str, key: str) -> Optional[str]:
+        """
+        讀取快取的回應
+
+        Args:
+            stage: 處理階段名稱（用於統計與 --refresh-stage）
+            key: cache_key() 的結果
+
+        Returns:
+            快取的回應文字，未命中時回傳 None
+        """
+        # 分片的階段名稱為 <stage>#<n>，--refresh-stage 以 <stage> 為準
+        if not self.enabled or stage.partition('#')[0] in self.refresh_stages:
+            self._record(stage, 'bypass')
+            return None
+
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self._record(stage, 'miss')
+            return None
+        except Exception as e:
+            logger.warning(f"  ⚠️  {stage} 回應快取讀取失敗: {str(e)}")
+            self._record(stage, 'miss')
+            return None
+
+        if time.time() - entry.get('created_at', 0) > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            self._record(stage, 'expired')
+            return None
+
+        # 更新 mtime 作為 LRU 的最後使用時間
+        os.utime(path)
+        self._record(stage, 'hit')
+        logger.info(f"  ♻️  {stage} 使用快取回應（{key[:12]}）")
+        return entry['response']
+
+    def put(self, stage: str, key: str, response: str, provider: str, model: str):
+        """
+        寫入回應並視需要淘汰舊紀錄
+
+        Args:
+            stage: 處理階段名稱
+            key: cache_key() 的結果
+            response: API 回應文字
+            provider: gemini / openai
+            model: 模型名稱
+        """
+        if not self.enabled or not response:
+            return
+
+        entry = {
+            'stage': stage,
+            'provider': provider,
+            'model': model,
+            'created_at': time.time(),
+            'response': response
+        }
+
+        try:
+            path = self._entry_path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 先寫暫存檔再替換，避免中斷時留下損毀的 JSON
+            tmp_path = path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"  ⚠️  {stage} 回應快取寫入失敗: {str(e)}")
+            return
+
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        刪除過期紀錄，總大小超過上限時依最後使用時間淘汰
+
+        Returns:
+            刪除的紀錄數
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        now = time.time()
+        entries = []
+        removed = 0
+        for path in self.cache_dir.glob('*/*.json'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            # mtime 只會因使用而變新，比 TTL 還舊的紀錄一定已過期
+            if now - stat.st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"  🧹 回應快取淘汰 {removed} 筆紀錄")
+        return removed
+
+    def report(self) -> Dict:
+        """
+        彙整本次執行的快取報告
+
+        Returns:
+            {'hits', 'misses', 'stages'}
+        """
+        statuses = [s['status'] for s in self.stats.values()]
+        return {
+            'hits': statuses.count('hit'),
+            'misses': len(statuses) - statuses.count('hit'),
+            'stages': dict(self.stats)
+        }
+
+    def _record(self, stage: str, status: str):
+        self.stats[stage] = {'status': status}
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
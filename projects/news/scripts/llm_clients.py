@@ -0,0 +1,188 @@
+"""
+LLM 客戶端註冊表
+整個程序共用一組 OpenAI / Gemini 客戶端，避免每次呼叫都重新建立連線
+
+- 第一次使用時才建立（lazy），之後重複使用同一個連線池
+- OpenAI 使用自訂的 httpx 連線池（keep-alive、連線數、逾時可由環境變數設定）
+- Gemini 只 configure 一次，GenerativeModel 依 (模型, 系統提示詞) 快取
+- prewarm() 在背景先建立連線，讓 TLS 握手與 RSS 讀取重疊
+"""
+
+import os
+import logging
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# OpenAI 連線設定
+OPENAI_TIMEOUT = float(os.getenv('OPENAI_TIMEOUT', '180'))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv('OPENAI_CONNECT_TIMEOUT', '10'))
+OPENAI_MAX_CONNECTIONS = int(os.getenv('OPENAI_MAX_CONNECTIONS', '10'))
+# 預熱的連線要撐過 RSS 階段，keep-alive 期限比 httpx 預設的 5 秒長
+OPENAI_KEEPALIVE_EXPIRY = float(os.getenv('OPENAI_KEEPALIVE_EXPIRY', '90'))
+
+# Gemini 連線設定
+GEMINI_TIMEOUT = float(os.getenv('GEMINI_TIMEOUT', '300'))
+
+# 替代端點（例如 scripts/mock_llm_server.py）；未設定時使用官方 API
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL') or None
+# 設定後 Gemini 改用 REST 傳輸連到此位址，例如 http://127.0.0.1:8765
+GEMINI_BASE_URL = os.getenv('GEMINI_BASE_URL') or None
+
+
+class ClientRegistry:
+    """程序共用的 LLM 客戶端"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._openai_api_key: Optional[str] = None
+        self._gemini_api_key: Optional[str] = None
+        self._openai = None
+        self._openai_http: Optional[httpx.Client] = None
+        self._gemini_configured = False
+        self._gemini_models: Dict[Tuple[str, Optional[str]], object] = {}
+
+    def configure(self, openai_api_key: Optional[str] = None, gemini_api_key: Optional[str] = None):
+        """
+        指定 API key（未指定時使用 OPENAI_API_KEY / GEMINI_API_KEY 環境變數）
+        已建立的客戶端若 key 不同會在下次使用時重建
+
+        Args:
+            openai_api_key: OpenAI API key
+            gemini_api_key: Gemini API key
+        """
+        with self._lock:
+            if openai_api_key and openai_api_key != self._openai_api_key:
+                self._openai_api_key = openai_api_key
+                self._close_openai()
+            if gemini_api_key and gemini_api_key != self._gemini_api_key:
+                self._gemini_api_key = gemini_api_key
+                self._gemini_configured = False
+                self._gemini_models.clear()
+
+    def openai(self):
+        """
+        取得共用的 OpenAI 客戶端
+
+        Returns:
+            openai.OpenAI
+        """
+        with self._lock:
+            if self._openai is None:
+                from openai import OpenAI
+
+                api_key = self._openai_api_key or os.getenv('OPENAI_API_KEY')
+                if not api_key:
+                    raise ValueError("❌ OPENAI_API_KEY 環境變數未設置")
+
+                self._openai_http = httpx.Client(
+                    timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+                    limits=httpx.Limits(
+                        max_connections=OPENAI_MAX_CONNECTIONS,
+                        max_keepalive_connections=OPENAI_MAX_CONNECTIONS,
+                        keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY
+                    )
+                )
+                # SDK 內建的重試關閉，統一由 retry_policy 處理（避免兩層重試疊加）
+                self._openai = OpenAI(
+                    api_key=api_key, base_url=OPENAI_BASE_URL, http_client=self._openai_http, max_retries=0
+                )
+            return self._openai
+
+    def gemini_model(self, model_name: str, system_instruction: Optional[str] = None):
+        """
+        取得共用的 Gemini 模型物件
+
+        Args:
+            model_name: 模型名稱
+            system_instruction: 系統提示詞（可選）
+
+        Returns:
+            google.generativeai.GenerativeModel
+        """
+        with self._lock:
+            import google.generativeai as genai
+
+            if not self._gemini_configured:
+                api_key = self._gemini_api_key or os.getenv('GEMINI_API_KEY')
+                if not api_key:
+                    raise ValueError("❌ GEMINI_API_KEY 環境變數未設置")
+                if GEMINI_BASE_URL:
+                    genai.configure(api_key=api_key, transport='rest',
+                                    client_options={'api_endpoint': GEMINI_BASE_URL})
+                else:
+                    genai.configure(api_key=api_key)
+                self._gemini_configured = True
+
+            key = (model_name, system_instruction)
+            if key not in self._gemini_models:
+                self._gemini_models[key] = genai.GenerativeModel(
+                    model_name=model_name,
+                    system_instruction=system_instruction
+                )
+            return self._gemini_models[key]
+
+    def gemini_request_options(self, timeout: Optional[float] = None) -> Dict:
+        """
+        generate_content 的 request_options
+
+        Args:
+            timeout: 逾時秒數（未指定時為 GEMINI_TIMEOUT）
+
+        Returns:
+            逾時設定；關閉 SDK 內建的重試，統一由 retry_policy 處理
+        """
+        return {'timeout': timeout or GEMINI_TIMEOUT, 'retry': None}
+
+    def prewarm(self, providers: Iterable[str] = ('openai', 'gemini'),
+                gemini_model_name: Optional[str] = None) -> threading.Thread:
+        """
+        在背景建立連線（TLS 握手、驗證 API key），不阻塞呼叫端
+
+        Args:
+            providers: 要預熱的 provider
+            gemini_model_name: 用來預熱 Gemini 連線的模型名稱
+
+        Returns:
+            背景執行緒（需要等待時可 join）
+        """
+        providers = tuple(providers)
+
+        def warm():
+            if 'openai' in providers:
+                try:
+                    self.openai().models.list()
+                    logger.info("  🔥 OpenAI 連線預熱完成")
+                except Exception as e:
+                    logger.warning(f"  ⚠️  OpenAI 連線預熱失敗: {str(e)}")
+            if 'gemini' in providers and gemini_model_name:
+                try:
+                    import google.generativeai as genai
+
+                    self.gemini_model(gemini_model_name)
+                    genai.get_model(f"models/{gemini_model_name}", request_options=self.gemini_request_options())
+                    logger.info("  🔥 Gemini 連線預熱完成")
+                except Exception as e:
+                    logger.warning(f"  ⚠️  Gemini 連線預熱失敗: {str(e)}")
+
+        thread = threading.Thread(target=warm, name='llm-prewarm', daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        """關閉連線池"""
+        with self._lock:
+            self._close_openai()
+
+    def _close_openai(self):
+        if self._openai_http is not None:
+            self._openai_http.close()
+        self._openai = None
+        self._openai_http = None
+
+
+# 程序共用的註冊表
+clients = ClientRegistry()
@@ -7,7 +7,7 @@ Thinker News 每日新聞自動生成系統
 1. 讀取 RSS feeds
 2. 台灣本地化篩選
 3. AI 處理鏈（Gemini → OpenAI → OpenAI）
-4. 生成 HTML 頁面
+4. 生成 HTML 頁面（本地 Markdown 轉換，--html-renderer llm 改用 Gemini）
 5. 更新 GitHub repo
 """
 
@@ -15,6 +15,7 @@ import os
 import sys
 import json
 import logging
+import argparse
 from datetime import datetime, timedelta
 from pathlib import Path
 from dotenv import load_dotenv
@@ -34,49 +35,215 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # 導入自定義模組
-from rss_fetcher import fetch_all_rss_feeds
+from rss_fetcher import fetch_all_rss_feeds, RSS_SOURCES
+from feed_cache import FeedCache
+from item_store import ItemStore
 from news_filter import filter_and_score_news
 from ai_processor import (
     setup_apis,
+    llm_cache,
+    AI_STAGES,
+    STAGE_TELEMETRY,
+    TOKEN_USAGE,
+    HEDGE_STAGES,
+    HEDGE_TELEMETRY,
+    configure_hedging,
+    GEMINI_MODEL,
     process_with_data_alchemist,
     process_with_tech_narrator,
     process_with_editor_in_chief,
     process_with_html_generator
 )
-from html_generator import generate_daily_html, update_index_html
+from html_generator import generate_daily_html, render_daily_html, update_archive_pages, update_index_html
+from templates import page_weight, publish_assets
+from llm_clients import clients
+from retry_policy import pipeline_deadline
+from hedging import latency_history
+from prompts import prompt_manifest
+from output_schemas import output_quality
+from site_archive import (
+    ARCHIVE_DIR,
+    ARCHIVE_MANIFEST,
+    backfill_manifest,
+    issue_entry,
+    month_of,
+    record_issue,
+    save_page_source,
+)
+from checkpoint import RunCheckpoints, PIPELINE_STAGES, input_hash, latest_run_id
 from utils import get_taiwan_date, validate_json_output
 from execution_logger import ExecutionLogger
 
 
-def main():
-    """主執行流程"""
-    # 初始化執行日誌記錄器
-    exec_logger = ExecutionLogger()
-
-    try:
-        # ============================================
-        # 步驟 0: 設置 API Keys
-        # ============================================
-        logger.info("🔑 設置 API Keys...")
-        openai_client = setup_apis()
-        logger.info("✅ API Keys 設置完成")
-
-        # ============================================
-        # 步驟 1: 生成今日日期（台灣時區）
-        # ============================================
-        exec_logger.log_node_start("生成台灣時間日期", "date", "獲取台灣時區的當前日期 (UTC+8)")
-        today_date = get_taiwan_date()
-        logger.info(f"📅 生成今日日期: {today_date}")
-        exec_logger.log_node_success("生成台灣時間日期", today_date, {"日期": today_date})
-        
-        # ============================================
-        # 步驟 2: 讀取所有 RSS feeds
-        # ============================================
-        exec_logger.log_node_start("RSS Feed 讀取", "rss", "並行讀取 7 個新聞來源的 RSS feeds")
-        logger.info("📡 開始讀取 RSS feeds...")
-        all_feeds = fetch_all_rss_feeds(today_date)
+# --html-renderer llm 時，Gemini 生成整頁所需的最短剩餘時間（秒）
+HTML_LLM_MIN_SECONDS = float(os.getenv('HTML_LLM_MIN_SECONDS', '120'))
+
+
+def parse_args(argv=None):
+    """解析命令列參數"""
+    parser = argparse.ArgumentParser(description="Thinker News 每日新聞自動生成")
+    parser.add_argument(
+        '--html-renderer',
+        choices=['local', 'llm'],
+        default=os.getenv('HTML_RENDERER', 'local'),
+        help="今日頁面的產生方式：local 為本地 Markdown 轉換（預設），llm 為 Gemini HTML 生成器"
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help="不讀寫 AI 回應快取"
+    )
+    parser.add_argument(
+        '--refresh-stage',
+        action='append',
+        choices=AI_STAGES,
+        default=[],
+        help="忽略指定階段的快取並重新呼叫 API（可重複指定）"
+    )
+    parser.add_argument(
+        '--resume',
+        metavar='RUN_ID',
+        help="接續既有的執行（latest 為最近一次），輸入未改變的階段直接使用檢查點"
+    )
+    parser.add_argument(
+        '--from-stage',
+        choices=PIPELINE_STAGES,
+        help="從指定階段開始重新執行，之前的階段使用檢查點（未指定 --resume 時接續最近一次）"
+    )
+    parser.add_argument(
+        '--hedge-stage',
+        action='append',
+        choices=HEDGE_STAGES,
+        help="對指定階段開啟對沖請求：主要 provider 超過歷史 p95 延遲時同時請求備用 provider（可重複指定，預設依 AI_HEDGE_STAGES）"
+    )
+    parser.add_argument(
+        '--deadline-minutes',
+        type=float,
+        default=float(os.getenv('PIPELINE_DEADLINE_MINUTES', '0')),
+        help="整條流程的時間預算（分鐘，0 為不限時）；AI 呼叫的逾時與重試不超過剩餘時間"
+    )
+    return parser.parse_args(argv)
+
+
+def cache_status(stage: str) -> str:
+    """AI 階段的回應快取狀態（hit / miss / expired / bypass；分片時為命中數）"""
+    statuses = [
+        entry['status'] for name, entry in llm_cache.stats.items()
+        if name == stage or name.startswith(f"{stage}#")
+    ]
+    if not statuses:
+        return '-'
+    if len(statuses) == 1:
+        return statuses[0]
+    return f"hit {statuses.count('hit')}/{len(statuses)}"
+
+
+def stream_metrics(stage: str) -> dict:
+    """串流階段的首字延遲與生成速度（使用快取或檢查點時為空）"""
+    telemetry = STAGE_TELEMETRY.get(stage)
+    if not telemetry:
+        return {}
+    return {
+        "首字延遲": f"{telemetry['ttft_seconds']:.2f} 秒",
+        "生成速度": f"{telemetry['tokens_per_second'] or 0} tokens/秒",
+        "輸出 tokens": telemetry['output_tokens']
+    }
+
+
+def prompt_metrics(stage: str) -> dict:
+    """送出前估計的 prompt 大小與費用（使用檢查點時為空）"""
+    telemetry = STAGE_TELEMETRY.get(stage)
+    if not telemetry or 'prompt_tokens' not in telemetry:
+        return {}
+    metrics = {"Prompt tokens（估計）": telemetry['prompt_tokens']}
+    compaction = telemetry.get('compaction')
+    if compaction:
+        metrics["內容壓縮"] = f"{compaction['content_tokens_before']} → {compaction['content_tokens_after']} tokens"
+    if telemetry.get('estimated_cost_usd') is not None:
+        metrics["預估費用"] = f"${telemetry['estimated_cost_usd']:.4f}"
+    memo = telemetry.get('translation_memo')
+    if memo and memo['hits']:
+        metrics["翻譯備忘"] = f"重用 {memo['hits']} 則，送出 {memo['pending']} 則（省下約 {memo['output_tokens_saved']} 輸出 tokens）"
+    return metrics
+
+
+def token_metrics(stage: str) -> dict:
+    """provider 回報的輸入 tokens 與 prompt 快取命中（分片時合計；使用快取或檢查點時為空）"""
+    usages = [usage for name, usage in TOKEN_USAGE.items() if name == stage or name.startswith(f"{stage}#")]
+    if not usages:
+        return {}
+    prompt_tokens = sum(usage['prompt_tokens'] for usage in usages)
+    cached_tokens = sum(usage['cached_tokens'] for usage in usages)
+    return {
+        "Prompt 版本": usages[0]['prompt'],
+        "輸入 tokens": prompt_tokens,
+        "快取命中 tokens": f"{cached_tokens}（{cached_tokens / prompt_tokens:.0%}）" if prompt_tokens else cached_tokens,
+        "未快取 tokens": prompt_tokens - cached_tokens
+    }
+
+
+def quality_metrics(stage: str) -> dict:
+    """JSON 修復與 schema 驗證後的重新生成次數（使用快取或檢查點時為空）"""
+    tally = output_quality.run.get(stage)
+    if not tally or not tally['outputs']:
+        return {}
+    return {
+        "JSON 修復": f"{tally['repaired']}/{tally['outputs']}",
+        "欄位重新生成": f"{tally['field_regenerations']} 次（{tally['fields_regenerated']} 個欄位）",
+        "整段重新生成": tally['full_regenerations']
+    }
+
+
+def hedge_metrics(stage: str) -> dict:
+    """對沖結果：勝出的 provider 與估計節省的時間（未對沖時為空）"""
+    outcomes = [
+        telemetry for name, telemetry in HEDGE_TELEMETRY.items()
+        if (name == stage or name.startswith(f"{stage}#")) and telemetry['hedged']
+    ]
+    if not outcomes:
+        return {}
+    winners = {}
+    for telemetry in outcomes:
+        winners[telemetry['winner_provider']] = winners.get(telemetry['winner_provider'], 0) + 1
+    return {
+        "對沖": "、".join(f"{provider} 勝出 {count} 次" for provider, count in winners.items()),
+        "對沖估計節省": f"{sum(t['estimated_saved_seconds'] for t in outcomes):.1f} 秒"
+    }
+
+
+def checkpoint_status(checkpoints: RunCheckpoints, stage: str) -> str:
+    """階段的檢查點狀態（reused 代表未重新執行）"""
+    return checkpoints.status.get(stage, 'computed')
+
+
+def fetch_and_filter(today_date: str, exec_logger: ExecutionLogger):
+    """
+    讀取 RSS 並執行台灣本地化篩選（步驟 2、3）
+
+    Args:
+        today_date: 今日日期
+        exec_logger: 執行日誌記錄器
+
+    Returns:
+        (原始新聞數, 篩選後的新聞列表)
+    """
+    # ============================================
+    # 步驟 2: 讀取所有 RSS feeds
+    # ============================================
+    exec_logger.log_node_start("RSS Feed 讀取", "rss", f"並行讀取 {len(RSS_SOURCES)} 個新聞來源的 RSS feeds")
+    logger.info("📡 開始讀取 RSS feeds...")
+    feed_cache = FeedCache()
+    with ItemStore() as item_store:
+        stored_before = item_store.count()
+        all_feeds = fetch_all_rss_feeds(today_date, cache=feed_cache, store=item_store)
         logger.info(f"✅ 成功讀取 {len(all_feeds)} 則新聞")
 
+        cache_report = feed_cache.report()
+        logger.info(
+            f"♻️  Feed 快取: 命中 {cache_report['hits']} / 未命中 {cache_report['misses']}，"
+            f"節省 {cache_report['bytes_saved'] / 1024:.1f} KB"
+        )
+
         # 統計各來源的新聞數
         sources_count = {}
         for feed in all_feeds:
@@ -85,36 +252,101 @@ def main():
 
         exec_logger.log_node_success(
             "RSS Feed 讀取",
-            {"total_items": len(all_feeds), "sources_breakdown": sources_count},
-            {"總新聞數": f"{len(all_feeds)} 則", "來源數": "7 個", "成功率": "100%"}
+            {"total_items": len(all_feeds), "sources_breakdown": sources_count, "feed_cache": cache_report,
+             "item_store": {"new_items": item_store.count() - stored_before, "total_items": item_store.count()}},
+            {"總新聞數": f"{len(all_feeds)} 則", "來源數": f"{len(RSS_SOURCES)} 個", "成功率": "100%",
+             "快取命中": f"{cache_report['hits']}/{len(cache_report['sources'])}",
+             "下載流量": f"{cache_report['bytes_downloaded'] / 1024:.1f} KB",
+             "節省流量": f"{cache_report['bytes_saved'] / 1024:.1f} KB"}
         )
-        
+
         # ============================================
         # 步驟 3: 台灣本地化篩選與評分
         # ============================================
         exec_logger.log_node_start("台灣本地化篩選", "filter", "使用智能評分系統篩選和排序新聞")
         logger.info("🔍 執行台灣本地化篩選...")
-        filtered_news = filter_and_score_news(all_feeds, today_date)
+        filtered_news = filter_and_score_news(all_feeds, today_date, store=item_store)
         logger.info(f"✅ 篩選後保留 {len(filtered_news)} 則新聞")
 
-        if len(filtered_news) == 0:
-            logger.error("❌ 沒有新聞通過篩選，流程終止")
-            exec_logger.log_node_error("台灣本地化篩選", Exception("沒有新聞通過篩選"))
-            exec_logger.complete_execution("error")
-            exec_logger.save_to_file("execution_log.json")
-            sys.exit(1)
+    if len(filtered_news) == 0:
+        logger.error("❌ 沒有新聞通過篩選，流程終止")
+        exec_logger.log_node_error("台灣本地化篩選", Exception("沒有新聞通過篩選"))
+        exec_logger.complete_execution("error")
+        exec_logger.save_to_file("execution_log.json")
+        sys.exit(1)
 
-        # 統計台灣 vs 國際新聞
-        local_count = sum(1 for n in filtered_news if n.get('is_taiwan_news', False))
-        international_count = len(filtered_news) - local_count
+    # 統計台灣 vs 國際新聞
+    local_count = sum(1 for n in filtered_news if n.get('is_taiwan_news', False))
+    international_count = len(filtered_news) - local_count
+
+    exec_logger.log_node_success(
+        "台灣本地化篩選",
+        {"filtered_items": len(filtered_news), "local_news": local_count, "international_news": international_count},
+        {"篩選前": f"{len(all_feeds)} 則", "篩選後": f"{len(filtered_news)} 則",
+         "台灣新聞": f"{local_count} 則", "國際新聞": f"{international_count} 則"}
+    )
+
+    return len(all_feeds), filtered_news
+
+
+def main(argv=None):
+    """主執行流程"""
+    args = parse_args(argv)
+    llm_cache.configure(enabled=not args.no_cache, refresh_stages=args.refresh_stage)
+    pipeline_deadline.reset(args.deadline_minutes * 60)
+    if args.hedge_stage:
+        configure_hedging(args.hedge_stage)
+
+    # 初始化執行日誌記錄器
+    exec_logger = ExecutionLogger()
+    exec_logger.execution_data["prompts"] = prompt_manifest()
+
+    try:
+        # ============================================
+        # 步驟 0: 設置 API Keys
+        # ============================================
+        logger.info("🔑 設置 API Keys...")
+        setup_apis()
+        logger.info("✅ API Keys 設置完成")
+
+        # 在背景預熱 AI 連線，與 RSS 讀取同時進行
+        clients.prewarm(gemini_model_name=GEMINI_MODEL)
+
+        # ============================================
+        # 步驟 1: 生成今日日期（台灣時區），或接續既有的執行
+        # ============================================
+        exec_logger.log_node_start("生成台灣時間日期", "date", "獲取台灣時區的當前日期 (UTC+8)")
+        if args.resume or args.from_stage:
+            run_id = latest_run_id() if args.resume in (None, 'latest') else args.resume
+            if run_id is None:
+                raise ValueError("找不到可接續的執行紀錄")
+            checkpoints = RunCheckpoints(run_id, resume=True, from_stage=args.from_stage)
+            today_date = checkpoints.today_date
+            logger.info(f"⏯️  接續執行 {run_id}，日期: {today_date}")
+        else:
+            today_date = get_taiwan_date()
+            checkpoints = RunCheckpoints(exec_logger.execution_data["execution_id"], today_date)
+            logger.info(f"📅 生成今日日期: {today_date}")
+        exec_logger.log_node_success("生成台灣時間日期", today_date, {"日期": today_date, "執行 ID": checkpoints.run_id})
+
+        # ============================================
+        # 步驟 2、3: 讀取 RSS feeds 並篩選（有檢查點時略過）
+        # ============================================
+        filter_hash = input_hash(today_date)
+        filter_checkpoint = checkpoints.load('filter', filter_hash)
+        if filter_checkpoint is None:
+            total_items, filtered_news = fetch_and_filter(today_date, exec_logger)
+            checkpoints.save('filter', filter_hash, {'total_items': total_items, 'filtered_news': filtered_news})
+        else:
+            total_items = filter_checkpoint['total_items']
+            filtered_news = filter_checkpoint['filtered_news']
+            exec_logger.log_node_start("台灣本地化篩選", "filter", "使用檢查點的篩選結果")
+            exec_logger.log_node_success(
+                "台灣本地化篩選",
+                {"filtered_items": len(filtered_news)},
+                {"篩選前": f"{total_items} 則", "篩選後": f"{len(filtered_news)} 則", "檢查點": "重用"}
+            )
 
-        exec_logger.log_node_success(
-            "台灣本地化篩選",
-            {"filtered_items": len(filtered_news), "local_news": local_count, "international_news": international_count},
-            {"篩選前": f"{len(all_feeds)} 則", "篩選後": f"{len(filtered_news)} 則",
-             "台灣新聞": f"{local_count} 則", "國際新聞": f"{international_count} 則"}
-        )
-        
         # ============================================
         # 步驟 4: AI 處理鏈
         # ============================================
@@ -123,8 +355,13 @@ def main():
         # 4.1 數據煉金術師 (Gemini)
         exec_logger.log_node_start("數據煉金術師 (Gemini)", "ai", "使用 Gemini AI 進行標題轉譯、內容摘要和智能分類")
         logger.info("  ⚗️  數據煉金術師處理中...")
-        alchemist_output = process_with_data_alchemist(filtered_news, today_date)
-        alchemist_json = validate_json_output(alchemist_output, "數據煉金術師")
+        alchemist_hash = input_hash(filtered_news, today_date)
+        alchemist_json = checkpoints.load('alchemist', alchemist_hash)
+        if alchemist_json is None:
+            with ItemStore() as item_store:
+                alchemist_output = process_with_data_alchemist(filtered_news, today_date, store=item_store)
+            alchemist_json = validate_json_output(alchemist_output, "數據煉金術師")
+            checkpoints.save('alchemist', alchemist_hash, alchemist_json)
 
         # 統計分類數量
         categories_count = {key: len(value) if isinstance(value, list) else 0
@@ -134,14 +371,22 @@ def main():
             "數據煉金術師 (Gemini)",
             alchemist_json,
             {"模型": "Gemini 2.5 Flash", "處理新聞": f"{len(filtered_news)} 則",
-             "輸出分類": f"{len(categories_count)} 個", "JSON 修復": "是"}
+             "輸出分類": f"{len(categories_count)} 個",
+             "分片": STAGE_TELEMETRY.get('alchemist', {}).get('shards', '-'),
+             "回應快取": cache_status('alchemist'), "檢查點": checkpoint_status(checkpoints, 'alchemist'),
+             **prompt_metrics('alchemist'), **token_metrics('alchemist'), **quality_metrics('alchemist'),
+             **hedge_metrics('alchemist')}
         )
 
         # 4.2 科技導讀人 (OpenAI)
         exec_logger.log_node_start("科技導讀人 (OpenAI)", "ai", "使用 GPT-4o 撰寫完整的 Notion 日報")
         logger.info("  📰 科技導讀人處理中...")
-        narrator_output = process_with_tech_narrator(alchemist_json, today_date)
-        narrator_json = validate_json_output(narrator_output, "科技導讀人")
+        narrator_hash = input_hash(alchemist_json, today_date)
+        narrator_json = checkpoints.load('narrator', narrator_hash)
+        if narrator_json is None:
+            narrator_output = process_with_tech_narrator(alchemist_json, today_date)
+            narrator_json = validate_json_output(narrator_output, "科技導讀人")
+            checkpoints.save('narrator', narrator_hash, narrator_json)
 
         notion_text = narrator_json.get('notion_daily_report_text', '')
         notion_char_count = len(notion_text)
@@ -149,14 +394,21 @@ def main():
         exec_logger.log_node_success(
             "科技導讀人 (OpenAI)",
             narrator_json,
-            {"模型": "GPT-4o", "字數": f"{notion_char_count:,} 字", "段落數": "10+"}
+            {"模型": "GPT-4o", "字數": f"{notion_char_count:,} 字", "段落數": "10+",
+             "回應快取": cache_status('narrator'), "檢查點": checkpoint_status(checkpoints, 'narrator'),
+             **stream_metrics('narrator'), **token_metrics('narrator'), **quality_metrics('narrator'),
+             **hedge_metrics('narrator')}
         )
 
         # 4.3 總編輯 (OpenAI)
         exec_logger.log_node_start("總編輯 (OpenAI)", "ai", "使用 GPT-4o 提煉 LINE 精簡快訊")
         logger.info("  ✍️  總編輯處理中...")
-        editor_output = process_with_editor_in_chief(narrator_json, today_date)
-        editor_json = validate_json_output(editor_output, "總編輯")
+        editor_hash = input_hash(narrator_json.get('notion_daily_report_text', ''), today_date)
+        editor_json = checkpoints.load('editor', editor_hash)
+        if editor_json is None:
+            editor_output = process_with_editor_in_chief(narrator_json, today_date)
+            editor_json = validate_json_output(editor_output, "總編輯")
+            checkpoints.save('editor', editor_hash, editor_json)
 
         line_text = editor_json.get('line_message_text', '')
         line_char_count = len(line_text)
@@ -164,28 +416,52 @@ def main():
         exec_logger.log_node_success(
             "總編輯 (OpenAI)",
             editor_json,
-            {"模型": "GPT-4o", "字數": f"{line_char_count} 字"}
+            {"模型": "GPT-4o", "字數": f"{line_char_count} 字",
+             "回應快取": cache_status('editor'), "檢查點": checkpoint_status(checkpoints, 'editor'),
+             **stream_metrics('editor'), **token_metrics('editor'), **quality_metrics('editor'),
+             **hedge_metrics('editor')}
         )
 
         logger.info("✅ AI 處理鏈（前3步）完成")
 
-        # 4.4 HTML 生成器 (Gemini)
-        exec_logger.log_node_start("HTML 生成器 (Gemini)", "ai", "使用 Gemini 生成完整 HTML 文檔（對齊 n8n 架構）")
-        logger.info("  🎨 HTML 生成器處理中...")
-
-        html_full_content = process_with_html_generator(
-            notion_content=narrator_json.get('notion_daily_report_text', ''),
-            line_content=editor_json.get('line_message_text', ''),
-            today_date=today_date
-        )
-
-        exec_logger.log_node_success(
-            "HTML 生成器 (Gemini)",
-            {"html_length": len(html_full_content)},
-            {"模型": "Gemini 2.0 Flash", "輸出": "完整 HTML 文檔"}
-        )
-
-        logger.info("✅ AI 處理鏈完成")
+        # 4.4 HTML 生成器 (Gemini，僅 --html-renderer llm 時執行；預設於步驟 6 以本地轉換器產生)
+        html_hash = input_hash(narrator_json, editor_json, today_date, args.html_renderer)
+        html_full_content = None
+        html_fallback = None
+        if args.html_renderer == 'llm' and pipeline_deadline.remaining() < HTML_LLM_MIN_SECONDS:
+            # 剩餘時間不夠 Gemini 生成整頁，直接改用本地轉換
+            html_fallback = f"剩餘 {pipeline_deadline.remaining():.0f} 秒，不足以執行 Gemini HTML 生成器"
+        elif args.html_renderer == 'llm':
+            exec_logger.log_node_start("HTML 生成器 (Gemini)", "ai", "使用 Gemini 生成完整 HTML 文檔（對齊 n8n 架構）")
+            logger.info("  🎨 HTML 生成器處理中...")
+
+            html_full_content = checkpoints.load('html', html_hash)
+            if html_full_content is None:
+                try:
+                    html_full_content = process_with_html_generator(
+                        notion_content=narrator_json.get('notion_daily_report_text', ''),
+                        line_content=editor_json.get('line_message_text', ''),
+                        today_date=today_date
+                    )
+                    checkpoints.save('html', html_hash, html_full_content)
+                except Exception as e:
+                    # 頁面內容已齊全，HTML 生成失敗時以本地轉換產生，不讓整次執行失敗
+                    html_fallback = f"Gemini HTML 生成器失敗: {str(e)}"
+                    exec_logger.log_node_error("HTML 生成器 (Gemini)", e)
+
+            if html_full_content is not None:
+                exec_logger.log_node_success(
+                    "HTML 生成器 (Gemini)",
+                    {"html_length": len(html_full_content)},
+                    {"模型": "Gemini 2.0 Flash", "輸出": "完整 HTML 文檔",
+                     "回應快取": cache_status('html'), "檢查點": checkpoint_status(checkpoints, 'html'),
+                     **token_metrics('html')}
+                )
+        if html_fallback:
+            logger.warning(f"⚠️  {html_fallback}，改用本地 Markdown 轉換")
+
+        llm_cache_report = llm_cache.report()
+        logger.info(f"✅ AI 處理鏈完成（回應快取命中 {llm_cache_report['hits']}/{len(llm_cache_report['stages'])}）")
 
         # ============================================
         # 步驟 5: 組裝最終輸出
@@ -216,21 +492,40 @@ def main():
         # ============================================
         # 步驟 6: 生成 HTML 文件
         # ============================================
-        exec_logger.log_node_start("HTML 生成", "html", "生成今日新聞頁面和更新首頁")
+        renderer_label = "Gemini HTML" if html_full_content else "本地 Markdown 轉換"
+        if html_full_content is None:
+            # 本地轉換只需幾毫秒，每次重新產生，結果仍存入檢查點
+            html_full_content = render_daily_html(final_output)
+            checkpoints.save('html', html_hash, html_full_content)
+        exec_logger.log_node_start("HTML 生成", "html", f"生成今日新聞頁面（{renderer_label}）和更新首頁")
         logger.info("📝 生成 HTML 文件...")
 
-        # 6.1 生成今日新聞頁面
+        # 6.1 生成今日新聞頁面（共用 CSS / JS 以指紋化檔名發佈，頁面只引用）
+        asset_paths = publish_assets()
         daily_html_path = generate_daily_html(final_output, html_full_content)
         logger.info(f"✅ 今日新聞頁面: {daily_html_path}")
+        weight = page_weight(html_full_content)
+        logger.info(
+            f"📦 今日頁面每次瀏覽: 第一次 {weight['first_view']:,} bytes，"
+            f"再次瀏覽 {weight['repeat_view']:,} bytes（HTML {weight['html']:,} bytes）"
+        )
 
-        # 6.2 更新首頁 index.html
-        index_html_path = update_index_html(today_date)
+        # 6.2 在 archive_manifest.json 加入今日一期，更新首頁與當月的歷史日報頁
+        if not Path(ARCHIVE_MANIFEST).exists():
+            # 第一次使用 manifest：從現有的日期頁面補齊（只會發生一次）
+            backfill_manifest()
+        issues = record_issue(issue_entry(final_output['news_json']))['issues']
+        index_html_path = update_index_html(today_date, issues)
         logger.info(f"✅ 首頁更新: {index_html_path}")
+        archive_pages = update_archive_pages(issues, months=[month_of(today_date)])
 
+        files = [f"{today_date}.html", "index.html", ARCHIVE_MANIFEST, *archive_pages, *asset_paths, "latest.json"]
         exec_logger.log_node_success(
             "HTML 生成",
-            {"files": [f"{today_date}.html", "index.html", "latest.json"]},
-            {"生成文件": "3 個", "今日頁面": f"{today_date}.html"}
+            {"files": files, "page_weight": weight},
+            {"生成文件": f"{len(files)} 個", "今日頁面": f"{today_date}.html", "產生方式": renderer_label,
+             "歷史日報頁": f"{len(archive_pages)} 個（{ARCHIVE_DIR}/）",
+             "每次瀏覽": f"{weight['first_view']:,} / {weight['repeat_view']:,} bytes（第一次 / 再次）"}
         )
 
         # ============================================
@@ -241,16 +536,33 @@ def main():
         with open(latest_json_path, 'w', encoding='utf-8') as f:
             json.dump(final_output['news_json'], f, ensure_ascii=False, indent=2)
         logger.info(f"✅ latest.json 已儲存")
+        # 頁面來源資料（模板修改後 rebuild_site.py 以此重建歷史頁面）
+        save_page_source(final_output['news_json'])
         
         # ============================================
         # 完成
         # ============================================
         logger.info("🎉 新聞生成流程完成！")
         logger.info(f"📊 統計資訊:")
-        logger.info(f"  - 原始新聞數: {len(all_feeds)}")
+        logger.info(f"  - 原始新聞數: {total_items}")
         logger.info(f"  - 篩選後數量: {len(filtered_news)}")
         logger.info(f"  - 生成日期: {today_date}")
         logger.info(f"  - 網站 URL: {website_url}")
+        logger.info(f"  - 執行 ID: {checkpoints.run_id}（可用 --resume {checkpoints.run_id} 接續）")
+        for stage, tally in latency_history.report().items():
+            logger.info(
+                f"  - {stage} 累計對沖: {tally['hedged']} 次，備用方勝出 {tally['secondary_wins']} 次，"
+                f"估計節省 {tally['estimated_saved_seconds']:.1f} 秒"
+            )
+        for stage, tally in output_quality.save().items():
+            if tally['outputs']:
+                logger.info(
+                    f"  - {stage} 累計 JSON 修復率 {tally['repaired'] / tally['outputs']:.1%}，"
+                    f"欄位重新生成率 {tally['field_regenerations'] / tally['outputs']:.1%}，"
+                    f"整段重新生成 {tally['full_regenerations']} 次"
+                )
+        if pipeline_deadline.seconds is not None:
+            logger.info(f"  - 剩餘時間預算: {pipeline_deadline.remaining() / 60:.1f} 分鐘")
 
         # 完成執行日誌並保存
         exec_logger.complete_execution("success")
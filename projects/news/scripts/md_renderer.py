@@ -0,0 +1,277 @@
+"""
+Markdown → HTML 轉換模組
+將科技導讀人 / 總編輯的 Markdown 輸出轉成每日頁面的 HTML 片段，取代 Gemini HTML 生成器
+
+轉換規則對齊過去由 Gemini 產生的頁面：
+- ### 區塊標題 → <h2>；整行粗體的新聞標題 → <h3>
+- 💡 **學習價值:** → <div class="highlight-box">
+- 🔗 [閱讀原文](url) → <a class="news-link external-link">
+- 🔧 分類、日報標題與日期行、分隔線不輸出（頁首已有）
+"""
+
+import re
+import unicodedata
+from datetime import datetime
+from html import escape
+from typing import List, Optional
+
+# 行內語法：[文字](連結)、**粗體**、裸露的網址
+INLINE_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)\s]+)\)|\*\*(.+?)\*\*|(https?://[^\s<>()]+)')
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*)$')
+BOLD_LINE_PATTERN = re.compile(r'^\*\*([^*]+)\*\*$')
+LEARNING_VALUE_PATTERN = re.compile(r'^💡\s*(?:\*\*)?學習價值\s*[:：]\s*(?:\*\*)?\s*(.*)$')
+READ_MORE_PATTERN = re.compile(r'^🔗\s*\[([^\]]+)\]\(([^)\s]+)\)\s*$')
+LINK_ONLY_PATTERN = re.compile(r'^\[([^\]]+)\]\(([^)\s]+)\)$')
+ORDERED_ITEM_PATTERN = re.compile(r'^\d+[.)]\s+(.*)$')
+BULLET_ITEM_PATTERN = re.compile(r'^[-*•]\s+(.*)$')
+RULE_PATTERN = re.compile(r'^(?:-{3,}|\*{3,}|_{3,})$')
+
+# 不輸出的行：日報標題、日期、分類
+SKIPPED_LINE_PATTERNS = (
+    re.compile(r'^#{1,2}\s+.*AI 科技日報精選'),
+    re.compile(r'^\*\*日期\s*[:：]\*\*'),
+    re.compile(r'^🔧\s*分類\s*[:：]'),
+)
+
+# LINE 版以這些符號開頭的行視為條列
+LINE_BULLET_MARKERS = ('✅', '✔️', '👉', '▶️', '🔹', '🔸')
+
+LINE_HEADING = '🤖 今日AI重點 (LINE版)'
+DEFAULT_SUBTITLE = '今日AI科技重點新聞'
+
+INDENT = ' ' * 12
+
+
+def render_inline(text: str) -> str:
+    """
+    轉換行內 Markdown（連結、粗體、網址），其餘文字做 HTML 跳脫
+
+    Args:
+        text: 單行 Markdown
+
+    Returns:
+        HTML 字串
+    """
+    parts = []
+    position = 0
+    for match in INLINE_PATTERN.finditer(text):
+        parts.append(escape(text[position:match.start()], quote=False))
+        label, url, bold, bare_url = match.groups()
+        if url:
+            parts.append(f'<a href="{escape(url)}" target="_blank">{render_inline(label)}</a>')
+        elif bold:
+            parts.append(f'<strong>{render_inline(bold)}</strong>')
+        else:
+            parts.append(f'<a href="{escape(bare_url)}" target="_blank">{escape(bare_url, quote=False)}</a>')
+        position = match.end()
+    parts.append(escape(text[position:], quote=False))
+    return ''.join(parts)
+
+
+def render_notion_markdown(markdown: str, indent: str = INDENT) -> str:
+    """
+    將 Notion 日報 Markdown 轉成內容區塊的 HTML
+
+    Args:
+        markdown: notion_daily_report_text
+        indent: 每行的縮排
+
+    Returns:
+        HTML 片段（放在 <div class="content-section"> 內）
+    """
+    html_lines: List[str] = []
+
+    for block in _split_blocks(markdown):
+        list_items: List[str] = []
+
+        def flush_list():
+            if list_items:
+                html_lines.extend(_render_list(list_items, indent))
+                list_items.clear()
+
+        for index, line in enumerate(block):
+            if RULE_PATTERN.match(line) or any(p.match(line) for p in SKIPPED_LINE_PATTERNS):
+                continue
+
+            item = _list_item_text(line)
+            if item is not None:
+                list_items.append(item)
+                continue
+            flush_list()
+
+            has_more = index < len(block) - 1
+            heading = HEADING_PATTERN.match(line)
+            learning_value = LEARNING_VALUE_PATTERN.match(line)
+            read_more = READ_MORE_PATTERN.match(line)
+            bold_line = BOLD_LINE_PATTERN.match(line)
+
+            if heading:
+                # 日報內的 ### 是最上層的分類標題
+                level = 2 if len(heading.group(1)) <= 3 else 3
+                html_lines.append(_heading(level, heading.group(2), indent, html_lines))
+            elif learning_value:
+                html_lines.extend([
+                    f'{indent}<div class="highlight-box">',
+                    f'{indent}    <strong>💡 學習價值：</strong><br>',
+                    f'{indent}    {render_inline(learning_value.group(1))}',
+                    f'{indent}</div>',
+                ])
+            elif read_more:
+                label, url = read_more.groups()
+                html_lines.append(
+                    f'{indent}<p><a href="{escape(url)}" class="news-link external-link" '
+                    f'target="_blank">{escape(label, quote=False)}</a></p>'
+                )
+            elif bold_line:
+                html_lines.append(_heading(3, bold_line.group(1), indent, html_lines))
+            elif _is_emoji_heading(line, has_more):
+                html_lines.append(_heading(3, line.replace('**', ''), indent, html_lines))
+            else:
+                html_lines.append(f'{indent}<p>{render_inline(line)}</p>')
+
+        flush_list()
+
+    return '\n'.join(html_lines)
+
+
+def render_line_markdown(markdown: str, indent: str = INDENT + '    ') -> str:
+    """
+    將 LINE 快訊轉成 LINE 精華版區塊的 HTML
+
+    Args:
+        markdown: line_message_text
+        indent: 每行的縮排
+
+    Returns:
+        HTML 片段（放在 LINE 精華版的內容框內）
+    """
+    html_lines = [f'{indent}<h3>{LINE_HEADING}</h3>']
+
+    for block in _split_blocks(markdown):
+        list_items: List[str] = []
+        for line in block:
+            if RULE_PATTERN.match(line):
+                continue
+            bullet = BULLET_ITEM_PATTERN.match(line)
+            if bullet or line.startswith(LINE_BULLET_MARKERS):
+                list_items.append(bullet.group(1) if bullet else line)
+                continue
+            if list_items:
+                html_lines.extend(_render_list(list_items, indent))
+                list_items = []
+            html_lines.append(f'{indent}<p>{render_inline(line)}</p>')
+        if list_items:
+            html_lines.extend(_render_list(list_items, indent))
+
+    return '\n'.join(html_lines)
+
+
+def render_learning_focus(markdown: str, indent: str = INDENT) -> str:
+    """
+    將學習焦點轉成 <div class="learning-focus"> 區塊
+
+    Args:
+        markdown: learning_focus_text
+
+    Returns:
+        HTML 片段，沒有內容時回傳空字串
+    """
+    if not markdown or not markdown.strip():
+        return ''
+
+    html_lines = [f'{indent[4:]}<div class="learning-focus">']
+    for block in _split_blocks(markdown):
+        for line in block:
+            link_only = LINK_ONLY_PATTERN.match(line)
+            if link_only:
+                label, url = link_only.groups()
+                html_lines.append(
+                    f'{indent}<a href="{escape(url)}" class="focus-cta" target="_blank">{escape(label, quote=False)}</a>'
+                )
+            elif line.startswith('🎯') and len(block) == 1:
+                html_lines.append(f'{indent}<h3>{render_inline(line)}</h3>')
+            else:
+                html_lines.append(f'{indent}<p>{render_inline(line)}</p>')
+    html_lines.append(f'{indent[4:]}</div>')
+    return '\n'.join(html_lines)
+
+
+def page_subtitle(line_markdown: str) -> str:
+    """
+    頁首副標題：取 LINE 快訊的第一行（去掉開頭的 emoji 與 Markdown 符號）
+
+    Args:
+        line_markdown: line_message_text
+
+    Returns:
+        副標題純文字
+    """
+    for line in (line_markdown or '').splitlines():
+        text = line.replace('**', '').replace('#', '').strip()
+        while text and _is_symbol(text[0]):
+            text = text[1:].lstrip()
+        if text:
+            return text
+    return DEFAULT_SUBTITLE
+
+
+def format_display_date(date: str) -> str:
+    """YYYY-MM-DD → 2026年2月2日"""
+    try:
+        dt = datetime.strptime(date, '%Y-%m-%d')
+    except ValueError:
+        return date
+    return f"{dt.year}年{dt.month}月{dt.day}日"
+
+
+def _split_blocks(markdown: str) -> List[List[str]]:
+    """以空行切段，每段為去除前後空白的非空行"""
+    blocks: List[List[str]] = []
+    current: List[str] = []
+    for raw_line in (markdown or '').splitlines():
+        line = raw_line.strip()
+        if line:
+            current.append(line)
+        elif current:
+            blocks.append(current)
+            current = []
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+def _list_item_text(line: str) -> Optional[str]:
+    match = ORDERED_ITEM_PATTERN.match(line) or BULLET_ITEM_PATTERN.match(line)
+    return match.group(1) if match else None
+
+
+def _render_list(items: List[str], indent: str) -> List[str]:
+    return (
+        [f'{indent}<ul>']
+        + [f'{indent}    <li>{render_inline(item)}</li>' for item in items]
+        + [f'{indent}</ul>']
+    )
+
+
+def _heading(level: int, text: str, indent: str, html_lines: List[str]) -> str:
+    """標題前空一行（區塊開頭與 <h2> 後的第一個 <h3> 除外）"""
+    if html_lines and html_lines[-1] and not (level == 3 and html_lines[-1].lstrip().startswith('<h2>')):
+        html_lines.append('')
+    return f'{indent}<h{level}>{render_inline(text.strip())}</h{level}>'
+
+
+def _is_symbol(char: str) -> bool:
+    return unicodedata.category(char) in ('So', 'Sk', 'Mn', 'Cf') or char in '️‍'
+
+
+def _is_emoji_heading(line: str, has_more: bool) -> bool:
+    """
+    以 emoji 開頭的小標：整行粗體（📬 **日報後記**），或以冒號結尾且後面還有內容（📈 建議本週學習方向：）
+    """
+    if not _is_symbol(line[0]):
+        return False
+    rest = line[1:].strip()
+    if BOLD_LINE_PATTERN.match(rest):
+        return True
+    return has_more and rest.endswith(('：', ':'))
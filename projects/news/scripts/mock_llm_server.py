@@ -0,0 +1,638 @@
+#!/usr/bin/env python3
+"""
+本地模擬 LLM 伺服器
+只用標準函式庫實作 OpenAI chat completions 與 Gemini generateContent 的必要部分，
+讓整條流程可以在沒有網路、不花 token 的情況下重現地量測吞吐量與重試行為
+
+支援：
+- OpenAI: GET /v1/models、POST /v1/chat/completions（含 stream=True 的 SSE）
+- Gemini (REST): GET /v1beta/models/<model>、POST :generateContent / :streamGenerateContent
+- 回應：依 system prompt 辨識階段產生預設回應，或由 fixture 檔指定
+- 結構化輸出：請求帶 schema、但回應缺少 schema 的必要欄位時（例如只補部分欄位），改以 schema 產生範例值
+- 延遲分佈（首字延遲）、串流片段間隔、注入 500 錯誤與 429（附 Retry-After）
+- 模擬 provider 的前綴快取：與先前請求相同的 prompt 前綴（≥ 1024 tokens）回報為 cached tokens
+- GET /stats 查詢請求統計
+
+使用方式：
+    python scripts/mock_llm_server.py --port 8765 --latency lognormal:0.8,0.4 --rate-limit-rate 0.1
+
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 GEMINI_BASE_URL=http://127.0.0.1:8765 \\
+    OPENAI_API_KEY=mock GEMINI_API_KEY=mock python scripts/main.py
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# 預設回應使用的範例日報（與 md_renderer 的 golden test 共用）
+DEFAULT_SAMPLE = Path(__file__).resolve().parent.parent / 'test_fixtures' / '2026-02-02.json'
+
+# 前綴快取的最小長度與計算單位（tokens，與 OpenAI 的規則相同）
+PREFIX_CACHE_MIN_TOKENS = 1024
+PREFIX_CACHE_INCREMENT = 128
+
+# 以 system prompt 的標記辨識處理階段
+STAGE_MARKERS = (
+    ('alchemist', '數據煉金術師 (Data Alchemist)'),
+    ('narrator', '科技導讀人 (Tech Narrator)'),
+    ('editor', '總編輯 (Editor-in-Chief)'),
+    ('html', '版面管理 Agent'),
+)
+
+ALCHEMIST_CATEGORIES = (
+    'ai_applications_and_tools',
+    'industry_trends_and_news',
+    'security_alerts',
+    'perspectives_and_analysis',
+    'other',
+)
+
+GEMINI_PATH = re.compile(r'^/v1beta/models/(?P<model>[^/:]+)(?::(?P<method>\w+))?$')
+
+
+class LatencyDistribution:
+    """
+    延遲分佈
+
+    規格字串：
+        fixed:0.5            固定 0.5 秒
+        uniform:0.2,1.5      0.2 ~ 1.5 秒均勻分佈
+        normal:1.0,0.3       常態分佈（平均, 標準差），小於 0 時取 0
+        lognormal:0.8,0.5    對數常態（中位數, sigma），模擬長尾延遲
+    """
+
+    KINDS = ('fixed', 'uniform', 'normal', 'lognormal')
+
+    def __init__(self, spec: str = 'fixed:0'):
+        kind, _, params = spec.partition(':')
+        if kind not in self.KINDS:
+            raise ValueError(f"未知的延遲分佈: {spec}")
+        self.spec = spec
+        self.kind = kind
+        self.params = [float(p) for p in params.split(',') if p.strip()] or [0.0]
+
+    def sample(self, rng: random.Random) -> float:
+        """抽一個延遲（秒）"""
+        if self.kind == 'fixed':
+            return self.params[0]
+        if self.kind == 'uniform':
+            return rng.uniform(self.params[0], self.params[1])
+        if self.kind == 'normal':
+            return max(0.0, rng.gauss(self.params[0], self.params[1]))
+        median, sigma = self.params[0], self.params[1]
+        return rng.lognormvariate(0, sigma) * median
+
+
+class MockLLMConfig:
+    """模擬伺服器的行為設定"""
+
+    def __init__(self, latency: str = 'fixed:0', chunk_delay: float = 0.0, chunk_chars: int = 40,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, retry_after: float = 1.0,
+                 fail_first: int = 0, fixtures: Optional[str] = None, seed: Optional[int] = None):
+        """
+        Args:
+            latency: 首字延遲分佈（LatencyDistribution 規格字串）
+            chunk_delay: 串流片段之間的間隔（秒）
+            chunk_chars: 每個串流片段的字元數
+            error_rate: 回傳 500 的機率
+            rate_limit_rate: 回傳 429 的機率
+            retry_after: 429 附帶的 Retry-After（秒）
+            fail_first: 前 N 個生成請求一律回傳 429（重現重試行為用）
+            fixtures: fixture 檔路徑（JSON，見 load_fixtures）
+            seed: 亂數種子（指定時延遲與錯誤注入可重現）
+        """
+        self.latency = LatencyDistribution(latency)
+        self.chunk_delay = chunk_delay
+        self.chunk_chars = max(1, chunk_chars)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.fail_first = fail_first
+        self.fixtures = load_fixtures(fixtures) if fixtures else []
+        self.seed = seed
+
+
+def load_fixtures(path: str) -> List[Dict]:
+    """
+    讀取 fixture 檔
+
+    格式：
+        {"responses": [
+            {"match": "科技導讀人", "response": "{...}"},
+            {"match": "總編輯", "provider": "openai", "response_file": "editor.json"}
+        ]}
+    match 為 system prompt 或 user prompt 中的子字串，依序比對第一個符合者；
+    response_file 為相對於 fixture 檔的路徑
+
+    Args:
+        path: fixture 檔路徑
+
+    Returns:
+        回應規則列表
+    """
+    fixture_path = Path(path)
+    with open(fixture_path, 'r', encoding='utf-8') as f:
+        rules = json.load(f).get('responses', [])
+    for rule in rules:
+        if 'response_file' in rule:
+            rule['response'] = (fixture_path.parent / rule['response_file']).read_text(encoding='utf-8')
+    return rules
+
+
+def detect_stage(prompt_text: str) -> Optional[str]:
+    """依 prompt 中的角色標記辨識處理階段"""
+    for stage, marker in STAGE_MARKERS:
+        if marker in prompt_text:
+            return stage
+    return None
+
+
+def canned_response(system_prompt: str, user_prompt: str) -> str:
+    """
+    產生符合各階段輸出格式的預設回應
+
+    Args:
+        system_prompt: 系統提示詞
+        user_prompt: 使用者提示詞
+
+    Returns:
+        回應文字
+    """
+    stage = detect_stage(f"{system_prompt}\n{user_prompt}")
+    sample = _load_sample()
+    date = _prompt_value(user_prompt, '今日日期') or sample.get('date', '')
+
+    if stage == 'alchemist':
+        titles = _prompt_list(user_prompt, '新聞標題') or []
+        links = _prompt_list(user_prompt, '超鏈結') or []
+        output = {category: [] for category in ALCHEMIST_CATEGORIES}
+        for index, (title, link) in enumerate(zip(titles, links)):
+            category = output[ALCHEMIST_CATEGORIES[index % len(ALCHEMIST_CATEGORIES)]]
+            category.append({
+                'rank': len(category) + 1,
+                'title': f"【模擬】{title}",
+                'detailed_content': f"{title} 的模擬摘要。",
+                'practical_takeaways': ["模擬要點", "想了解更多？→ [了解課程](https://thinker.cafe/products/6)"],
+                'link': link
+            })
+        return json.dumps(output, ensure_ascii=False)
+    if stage == 'narrator':
+        return json.dumps({'notion_daily_report_text': sample.get('notion_content', '')}, ensure_ascii=False)
+    if stage == 'editor':
+        return json.dumps({
+            'line_message_text': sample.get('line_content', ''),
+            'learning_focus_text': sample.get('learning_focus', '')
+        }, ensure_ascii=False)
+    if stage == 'html':
+        return f"<!DOCTYPE html>\n<html lang=\"zh-TW\"><head><title>{date}</title></head><body></body></html>"
+    return json.dumps({'ok': True})
+
+
+class MockLLMServer:
+    """在背景執行緒啟動的模擬伺服器（供基準測試與整合測試使用）"""
+
+    def __init__(self, config: Optional[MockLLMConfig] = None, host: str = '127.0.0.1', port: int = 0):
+        """
+        Args:
+            config: 行為設定
+            host: 監聽位址
+            port: 監聽埠（0 為自動選擇）
+        """
+        self.config = config or MockLLMConfig()
+        self.rng = random.Random(self.config.seed)
+        self.lock = threading.Lock()
+        self.stats: Dict[str, int] = {}
+        self.generate_requests = 0
+        self.seen_prompts: List[str] = []
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """伺服器位址"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        """讓 ai_processor 連到此伺服器的環境變數"""
+        return {
+            'OPENAI_BASE_URL': f"{self.url}/v1",
+            'GEMINI_BASE_URL': self.url,
+            'OPENAI_API_KEY': 'mock',
+            'GEMINI_API_KEY': 'mock'
+        }
+
+    def start(self) -> 'MockLLMServer':
+        """在背景執行緒開始服務"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='mock-llm', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止服務"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def count(self, name: str):
+        """累計統計"""
+        with self.lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+    def plan(self) -> Dict:
+        """
+        決定這次生成請求的行為（延遲、是否注入錯誤）
+        在鎖內抽樣，指定 seed 時同樣的請求順序得到同樣的結果
+
+        Returns:
+            {'latency', 'status'}，status 為 200 / 429 / 500
+        """
+        with self.lock:
+            self.generate_requests += 1
+            latency = self.config.latency.sample(self.rng)
+            if self.generate_requests <= self.config.fail_first:
+                status = 429
+            elif self.rng.random() < self.config.rate_limit_rate:
+                status = 429
+            elif self.rng.random() < self.config.error_rate:
+                status = 500
+            else:
+                status = 200
+        return {'latency': latency, 'status': status}
+
+    def respond(self, system_prompt: str, user_prompt: str, provider: str, schema: Optional[Dict] = None) -> str:
+        """依 fixture 或預設規則產生回應（有 schema 且回應缺少必要欄位時，以 schema 產生）"""
+        text = f"{system_prompt}\n{user_prompt}"
+        for rule in self.config.fixtures:
+            if rule.get('provider', provider) == provider and rule.get('match', '') in text:
+                response = rule['response']
+                break
+        else:
+            response = canned_response(system_prompt, user_prompt)
+        if schema and not _covers_schema(response, schema):
+            return json.dumps(example_instance(schema), ensure_ascii=False)
+        return response
+
+    def cached_tokens(self, prompt: str) -> int:
+        """
+        模擬前綴快取：與先前請求最長的共同前綴，達到最小長度時以 PREFIX_CACHE_INCREMENT 為單位回報
+
+        Args:
+            prompt: 完整 prompt（system + user）
+
+        Returns:
+            命中快取的 tokens
+        """
+        with self.lock:
+            common = max((_common_prefix_length(prompt, seen) for seen in self.seen_prompts), default=0)
+            self.seen_prompts.append(prompt)
+        tokens = common // 4
+        if tokens < PREFIX_CACHE_MIN_TOKENS:
+            return 0
+        return tokens - tokens % PREFIX_CACHE_INCREMENT
+
+    def chunks(self, text: str) -> List[str]:
+        """把回應切成串流片段"""
+        size = self.config.chunk_chars
+        return [text[i:i + size] for i in range(0, len(text), size)] or ['']
+
+
+def _make_handler(server: MockLLMServer):
+    """建立綁定到 server 的 request handler"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            logger.debug("mock-llm: " + format, *args)
+
+        def do_GET(self):
+            path = urlparse(self.path).path
+            if path == '/stats':
+                with server.lock:
+                    self._send_json(200, {'requests': server.generate_requests, 'stats': dict(server.stats)})
+                return
+            if path == '/v1/models':
+                server.count('openai.models')
+                self._send_json(200, {'object': 'list', 'data': [
+                    {'id': 'mock-model', 'object': 'model', 'created': 0, 'owned_by': 'mock'}
+                ]})
+                return
+            match = GEMINI_PATH.match(path)
+            if match and not match.group('method'):
+                server.count('gemini.get_model')
+                self._send_json(200, _gemini_model(match.group('model')))
+                return
+            self._send_json(404, {'error': {'message': f"not found: {path}"}})
+
+        def do_POST(self):
+            path = urlparse(self.path).path
+            body = self._read_json()
+            if path == '/v1/chat/completions':
+                self._openai_chat(body)
+                return
+            match = GEMINI_PATH.match(path)
+            if match and match.group('method') in ('generateContent', 'streamGenerateContent'):
+                self._gemini_generate(match.group('model'), body, match.group('method') == 'streamGenerateContent')
+                return
+            self._send_json(404, {'error': {'message': f"not found: {path}"}})
+
+        # ---------- OpenAI ----------
+
+        def _openai_chat(self, body: Dict):
+            stream = bool(body.get('stream'))
+            server.count(f"openai.chat{'.stream' if stream else ''}")
+            plan = server.plan()
+            if plan['status'] != 200:
+                self._openai_error(plan['status'])
+                return
+
+            messages = body.get('messages', [])
+            system_prompt = '\n'.join(_text(m.get('content')) for m in messages if m.get('role') == 'system')
+            user_prompt = '\n'.join(_text(m.get('content')) for m in messages if m.get('role') != 'system')
+            schema = ((body.get('response_format') or {}).get('json_schema') or {}).get('schema')
+            text = server.respond(system_prompt, user_prompt, 'openai', schema)
+            prompt = f"{system_prompt}\n{user_prompt}"
+            cached = server.cached_tokens(prompt)
+            model = body.get('model', 'mock-model')
+            time.sleep(plan['latency'])
+
+            if not stream:
+                self._send_json(200, {
+                    'id': 'chatcmpl-mock', 'object': 'chat.completion', 'created': int(time.time()), 'model': model,
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': text}}],
+                    'usage': _usage(prompt, text, cached)
+                })
+                return
+
+            def chunk(delta: Dict, finish_reason=None, usage=None) -> Dict:
+                return {
+                    'id': 'chatcmpl-mock', 'object': 'chat.completion.chunk', 'created': int(time.time()),
+                    'model': model, 'usage': usage,
+                    'choices': [] if usage else [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]
+                }
+
+            events = [chunk({'role': 'assistant', 'content': ''})]
+            events += [chunk({'content': part}) for part in server.chunks(text)]
+            events.append(chunk({}, 'stop'))
+            if (body.get('stream_options') or {}).get('include_usage'):
+                events.append(chunk({}, usage=_usage(prompt, text, cached)))
+            self._stream(
+                'text/event-stream',
+                [f"data: {json.dumps(event, ensure_ascii=False)}\n\n" for event in events] + ["data: [DONE]\n\n"]
+            )
+
+        def _openai_error(self, status: int):
+            server.count(f"openai.{status}")
+            if status == 429:
+                self._send_json(429, {'error': {
+                    'message': 'Rate limit reached (mock)', 'type': 'rate_limit_error', 'code': 'rate_limit_exceeded'
+                }}, {'retry-after': f"{server.config.retry_after:g}"})
+            else:
+                self._send_json(500, {'error': {'message': 'Internal error (mock)', 'type': 'server_error'}})
+
+        # ---------- Gemini ----------
+
+        def _gemini_generate(self, model: str, body: Dict, stream: bool):
+            server.count(f"gemini.generate{'.stream' if stream else ''}")
+            plan = server.plan()
+            if plan['status'] != 200:
+                server.count(f"gemini.{plan['status']}")
+                if plan['status'] == 429:
+                    message = f"Resource exhausted (mock). Please retry in {server.config.retry_after:g}s."
+                    self._send_json(429, {'error': {'code': 429, 'message': message, 'status': 'RESOURCE_EXHAUSTED'}})
+                else:
+                    self._send_json(500, {'error': {'code': 500, 'message': 'Internal error (mock)', 'status': 'INTERNAL'}})
+                return
+
+            system_prompt = '\n'.join(_text(p.get('text')) for p in (body.get('systemInstruction') or {}).get('parts', []))
+            user_prompt = '\n'.join(
+                _text(part.get('text')) for content in body.get('contents', []) for part in content.get('parts', [])
+            )
+            schema = (body.get('generationConfig') or {}).get('responseSchema')
+            text = server.respond(system_prompt, user_prompt, 'gemini', schema)
+            prompt = f"{system_prompt}\n{user_prompt}"
+            cached = server.cached_tokens(prompt)
+            time.sleep(plan['latency'])
+
+            if not stream:
+                self._send_json(200, _gemini_response(text, prompt, text, model, cached=cached))
+                return
+
+            # REST 串流回應是逐步送出的 JSON 陣列
+            parts = server.chunks(text)
+            pieces = []
+            for index, part in enumerate(parts):
+                last = index == len(parts) - 1
+                response = _gemini_response(part, prompt, text, model, finished=last, cached=cached)
+                pieces.append(('[' if index == 0 else ',\r\n') + json.dumps(response, ensure_ascii=False))
+            pieces.append(']')
+            self._stream('application/json', pieces)
+
+        # ---------- 傳輸 ----------
+
+        def _read_json(self) -> Dict:
+            length = int(self.headers.get('Content-Length') or 0)
+            raw = self.rfile.read(length) if length else b''
+            try:
+                return json.loads(raw or b'{}')
+            except json.JSONDecodeError:
+                return {}
+
+        def _send_json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _stream(self, content_type: str, pieces: List[str]):
+            """以 chunked transfer encoding 逐段送出，片段之間依 chunk_delay 等待"""
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            try:
+                for index, piece in enumerate(pieces):
+                    if index and server.config.chunk_delay:
+                        time.sleep(server.config.chunk_delay)
+                    data = piece.encode('utf-8')
+                    self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                # 用戶端提前關閉串流（JSON 已完整、或對沖的另一方勝出）
+                server.count('stream.client_closed')
+                self.close_connection = True
+
+    return Handler
+
+
+def _text(value) -> str:
+    """OpenAI content 可能是字串或 parts 列表"""
+    if isinstance(value, list):
+        return '\n'.join(part.get('text', '') for part in value if isinstance(part, dict))
+    return value or ''
+
+
+# Gemini REST 的 schema type 可能是 enum 數值或名稱
+_SCHEMA_TYPES = {1: 'string', 2: 'number', 3: 'integer', 4: 'boolean', 5: 'array', 6: 'object'}
+
+
+def _schema_type(schema: Dict) -> str:
+    value = schema.get('type')
+    return _SCHEMA_TYPES.get(value, '') if isinstance(value, int) else str(value or '').lower()
+
+
+def example_instance(schema: Dict):
+    """依 schema 產生符合型別與最少項目數的範例值"""
+    kind = _schema_type(schema)
+    if kind == 'object' or schema.get('properties'):
+        return {key: example_instance(value) for key, value in schema.get('properties', {}).items()}
+    if kind == 'array':
+        count = max(1, int(schema.get('minItems') or schema.get('min_items') or 0))
+        return [example_instance(schema.get('items') or {}) for _ in range(count)]
+    if kind in ('integer', 'number'):
+        return 1
+    if kind == 'boolean':
+        return True
+    return '模擬內容'
+
+
+def _covers_schema(response: str, schema: Dict) -> bool:
+    """回應（可能包在 ```json 區塊中）是否為包含 schema 所有必要欄位的 JSON 物件"""
+    try:
+        value = json.loads(response[response.find('{'):response.rfind('}') + 1])
+    except json.JSONDecodeError:
+        return False
+    required = schema.get('required') or list(schema.get('properties', {}))
+    return isinstance(value, dict) and all(key in value for key in required)
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return length
+
+
+def _usage(prompt: str, completion: str, cached: int = 0) -> Dict:
+    """粗估 token 數（約 4 字元一個 token）"""
+    prompt_tokens = max(1, len(prompt) // 4)
+    completion_tokens = max(1, len(completion) // 4)
+    return {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens,
+            'prompt_tokens_details': {'cached_tokens': cached}}
+
+
+def _gemini_response(text: str, prompt: str, full_text: str, model: str, finished: bool = True,
+                     cached: int = 0) -> Dict:
+    usage = _usage(prompt, full_text, cached)
+    response = {
+        'candidates': [{'content': {'role': 'model', 'parts': [{'text': text}]}, 'index': 0}],
+        'modelVersion': model
+    }
+    if finished:
+        response['candidates'][0]['finishReason'] = 'STOP'
+        response['usageMetadata'] = {
+            'promptTokenCount': usage['prompt_tokens'],
+            'cachedContentTokenCount': cached,
+            'candidatesTokenCount': usage['completion_tokens'],
+            'totalTokenCount': usage['total_tokens']
+        }
+    return response
+
+
+def _gemini_model(model: str) -> Dict:
+    return {
+        'name': f"models/{model}", 'baseModelId': model, 'version': 'mock', 'displayName': model,
+        'description': 'mock model', 'inputTokenLimit': 1048576, 'outputTokenLimit': 65536,
+        'supportedGenerationMethods': ['generateContent', 'countTokens'], 'temperature': 1.0, 'topP': 0.95, 'topK': 64
+    }
+
+
+_sample_cache: Dict = {}
+
+
+def _load_sample() -> Dict:
+    if not _sample_cache:
+        try:
+            with open(DEFAULT_SAMPLE, 'r', encoding='utf-8') as f:
+                _sample_cache.update(json.load(f))
+        except FileNotFoundError:
+            _sample_cache.update({'notion_content': '## 🤖 AI 科技日報精選', 'line_content': '🚨 模擬快訊'})
+    return _sample_cache
+
+
+def _prompt_value(prompt: str, label: str) -> Optional[str]:
+    """取出 prompt 中「標籤\\n值」的值"""
+    match = re.search(rf'{label}\n(.+)', prompt)
+    return match.group(1).strip() if match else None
+
+
+def _prompt_list(prompt: str, label: str) -> Optional[List]:
+    """取出 prompt 中標籤後的 JSON 陣列（數據煉金術師的新聞標題、超鏈結）"""
+    index = prompt.find(f"{label}\n")
+    if index == -1:
+        return None
+    try:
+        value, _ = json.JSONDecoder().raw_decode(prompt[index + len(label) + 1:])
+    except json.JSONDecodeError:
+        return None
+    return value if isinstance(value, list) else None
+
+
+def main(argv=None) -> int:
+    """命令列入口"""
+    parser = argparse.ArgumentParser(description="本地模擬 LLM 伺服器（OpenAI / Gemini）")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', default='fixed:0', help="首字延遲分佈，例如 fixed:0.5、uniform:0.2,1.5、lognormal:0.8,0.5")
+    parser.add_argument('--chunk-delay', type=float, default=0.0, help="串流片段間隔（秒）")
+    parser.add_argument('--chunk-chars', type=int, default=40, help="每個串流片段的字元數")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="回傳 500 的機率")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="回傳 429 的機率")
+    parser.add_argument('--retry-after', type=float, default=1.0, help="429 的 Retry-After（秒）")
+    parser.add_argument('--fail-first', type=int, default=0, help="前 N 個生成請求回傳 429")
+    parser.add_argument('--fixtures', help="回應 fixture 檔（JSON）")
+    parser.add_argument('--seed', type=int, help="亂數種子")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    config = MockLLMConfig(
+        latency=args.latency, chunk_delay=args.chunk_delay, chunk_chars=args.chunk_chars,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after,
+        fail_first=args.fail_first, fixtures=args.fixtures, seed=args.seed
+    )
+    server = MockLLMServer(config, args.host, args.port)
+    logger.info(f"🧪 模擬 LLM 伺服器啟動: {server.url}")
+    for name, value in server.env().items():
+        logger.info(f"   {name}={value}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("👋 停止模擬伺服器")
+    finally:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
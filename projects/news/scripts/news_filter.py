@@ -10,8 +10,11 @@
 
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict
+from collections import namedtuple
+from typing import List, Dict, Optional, Set, Tuple
 import re
+from item_store import ItemStore, link_hash
+from keyword_matcher import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -167,93 +170,235 @@ SOURCE_LABELS = {
 }
 
 
-def calculate_relevance(item: Dict) -> int:
+# 來源分組與特殊加分關鍵字
+TAIWAN_SOURCES = ['technews', 'ithome', 'inside']
+INTERNATIONAL_SOURCES = ['hackernews', 'techcrunch', 'openai']
+GLOBAL_VIEW_KEYWORDS = ['國際', 'global']
+ASIA_VIEW_KEYWORDS = ['taiwan', 'asia']
+PRACTICAL_KEYWORDS = ['教學', 'tutorial', 'guide', '實測', '評測', '比較']
+
+# 關鍵字命中：rule 為規則名稱，location 為 title / content / full（跨越標題與內容的交界）
+KeywordHit = namedtuple('KeywordHit', ['rule', 'keyword', 'location'])
+
+
+class CompiledFilters:
+    """
+    編譯後的篩選配置
+    所有規則的關鍵字編進同一個 Aho–Corasick 自動機，每則新聞只掃描一次
+    """
+
+    def __init__(self, filters: Dict):
+        self._patterns: List[str] = []
+        self._pattern_ids: Dict[str, int] = {}
+        # (rule, keyword, pattern_id, source)，source 為 None 代表適用所有來源
+        self.rules: List[Tuple[str, str, int, Optional[str]]] = []
+
+        self.must_keep = self._add_rule('must_keep', filters['must_keep_phrases'])
+        self.sources = {
+            name: {
+                'base_score': config.get('base_score', 0),
+                'exclude': self._add_rule('exclude', config.get('exclude', []), name),
+                'priority': self._add_rule('priority', config.get('priority_keywords', []), name)
+            }
+            for name, config in filters['sources'].items()
+        }
+        self.default_source = {'base_score': 0, 'exclude': [], 'priority': []}
+        self.taiwan_interests = self._add_rule('taiwan_interests', filters['taiwan_interests'])
+        self.global_taiwan_focus = self._add_rule('global_taiwan_focus', filters['global_taiwan_focus'])
+        self.global_view = self._add_rule('global_view', GLOBAL_VIEW_KEYWORDS)
+        self.asia_view = self._add_rule('asia_view', ASIA_VIEW_KEYWORDS)
+        # 實用性關鍵字原本就不轉小寫比對
+        self.practical = self._add_rule('practical', PRACTICAL_KEYWORDS, lowercase=False)
+
+        self.must_keep_set = frozenset(self.must_keep)
+        self.global_view_set = frozenset(self.global_view)
+        self.asia_view_set = frozenset(self.asia_view)
+        self.matcher = KeywordMatcher(self._patterns)
+
+        # 依來源預先算好每個 pattern 的權重，計分時只需走訪命中的 pattern
+        self._weights = {name: self._build_weights(config) for name, config in self.sources.items()}
+        self._default_weights = self._build_weights(self.default_source)
+
+    def _add_rule(self, rule: str, keywords: List[str], source: Optional[str] = None,
+                  lowercase: bool = True) -> List[int]:
+        """登記一組關鍵字，相同的字串共用同一個 pattern"""
+        pattern_ids = []
+        for keyword in keywords:
+            pattern = keyword.lower() if lowercase else keyword
+            if pattern not in self._pattern_ids:
+                self._pattern_ids[pattern] = len(self._patterns)
+                self._patterns.append(pattern)
+            pattern_id = self._pattern_ids[pattern]
+            pattern_ids.append(pattern_id)
+            self.rules.append((rule, keyword, pattern_id, source))
+        return pattern_ids
+
+    def _build_weights(self, config: Dict) -> Tuple[Dict[int, int], Dict[int, int], Dict[int, int]]:
+        """
+        將規則展開成 pattern 權重表
+
+        Returns:
+            (全文命中權重, 標題命中權重, 僅內容命中權重)
+        """
+        full_weights: Dict[int, int] = {}
+        title_weights: Dict[int, int] = {}
+        content_weights: Dict[int, int] = {}
+
+        def add(weights, pattern_id, value):
+            weights[pattern_id] = weights.get(pattern_id, 0) + value
+
+        for pattern_id in config['exclude']:
+            add(full_weights, pattern_id, -5)
+        for pattern_id in config['priority']:
+            add(title_weights, pattern_id, 10)
+            add(content_weights, pattern_id, 5)
+        for pattern_id in self.taiwan_interests:
+            add(full_weights, pattern_id, 4)
+        for pattern_id in self.global_taiwan_focus:
+            add(full_weights, pattern_id, 6)
+        for pattern_id in self.practical:
+            add(title_weights, pattern_id, 7)
+        return full_weights, title_weights, content_weights
+
+    def source_weights(self, source: str) -> Tuple[int, Dict[int, int], Dict[int, int], Dict[int, int]]:
+        """
+        取得來源的基礎分數與 pattern 權重表
+
+        Args:
+            source: 來源名稱（未設定的來源使用預設值）
+
+        Returns:
+            (基礎分數, 全文命中權重, 標題命中權重, 僅內容命中權重)
+        """
+        config = self.sources.get(source, self.default_source)
+        return (config['base_score'],) + self._weights.get(source, self._default_weights)
+
+    def locate(self, item: Dict) -> Tuple[Set[int], Set[int], Set[int], int]:
+        """
+        掃描一則新聞
+
+        Args:
+            item: 新聞項目
+
+        Returns:
+            (出現在標題的 pattern, 出現在內容的 pattern, 出現在全文的 pattern, 內容長度)
+        """
+        title = item.get('title', '').lower()
+        content = item.get('content', '').lower()
+
+        in_title, in_content, in_full = self.matcher.scan_regions(f"{title} {content}", len(title))
+
+        return in_title, in_content, in_full, len(content)
+
+    def match(self, item: Dict) -> List[KeywordHit]:
+        """
+        列出一則新聞命中的所有規則關鍵字
+
+        Args:
+            item: 新聞項目
+
+        Returns:
+            命中列表（只包含適用於該來源的規則）
+        """
+        in_title, in_content, in_full, _ = self.locate(item)
+        source = item.get('source', 'unknown')
+
+        hits = []
+        for rule, keyword, pattern_id, rule_source in self.rules:
+            if rule_source is not None and rule_source != source:
+                continue
+            if pattern_id in in_title:
+                hits.append(KeywordHit(rule, keyword, 'title'))
+            elif pattern_id in in_content:
+                hits.append(KeywordHit(rule, keyword, 'content'))
+            elif pattern_id in in_full:
+                hits.append(KeywordHit(rule, keyword, 'full'))
+        return hits
+
+    def score(self, item: Dict) -> int:
+        """
+        計算相關性分數（規則與權重與 n8n Code3 一致）
+
+        Args:
+            item: 新聞項目
+
+        Returns:
+            相關性分數
+        """
+        in_title, in_content, in_full, content_length = self.locate(item)
+        source = item.get('source', 'unknown')
+        base_score, full_weights, title_weights, content_weights = self.source_weights(source)
+
+        # 1. 必須保留
+        if not self.must_keep_set.isdisjoint(in_full):
+            return 100
+
+        score = base_score
+
+        # 2-5. 排除、來源優先、台灣興趣、全球台灣關注、實用性（7.）關鍵字
+        for pattern_id in in_full:
+            score += full_weights.get(pattern_id, 0)
+        for pattern_id in in_title:
+            score += title_weights.get(pattern_id, 0)
+        for pattern_id in in_content:
+            if pattern_id not in in_title:
+                score += content_weights.get(pattern_id, 0)
+
+        # 6. 特殊處理
+        if source in TAIWAN_SOURCES:
+            score += 5
+            if not self.global_view_set.isdisjoint(in_full):
+                score += 8
+
+        if source in INTERNATIONAL_SOURCES:
+            if not self.asia_view_set.isdisjoint(in_full):
+                score += 10
+
+        # 8. 內容長度
+        if content_length > 300:
+            score += 2
+        if content_length > 500:
+            score += 2
+
+        return score
+
+
+_compiled_filters: Optional[CompiledFilters] = None
+
+
+def get_compiled_filters() -> CompiledFilters:
+    """取得編譯後的 FILTERS（每個行程只編譯一次）"""
+    global _compiled_filters
+    if _compiled_filters is None:
+        _compiled_filters = CompiledFilters(FILTERS)
+    return _compiled_filters
+
+
+def calculate_relevance(item: Dict, compiled: Optional[CompiledFilters] = None) -> int:
     """
     計算新聞的相關性分數
     
     Args:
         item: 新聞項目
+        compiled: 編譯後的篩選配置（預設為 FILTERS）
         
     Returns:
         相關性分數
     """
-    title = item.get('title', '').lower()
-    content = item.get('content', '').lower()
-    link = item.get('link', '')
-    full_text = f"{title} {content}"
-    
-    source = item.get('source', 'unknown')
-    config = FILTERS['sources'].get(source, {
-        'priority_keywords': [],
-        'exclude': [],
-        'base_score': 0
-    })
-    
-    score = config.get('base_score', 0)
-    
-    # 1. 必須保留
-    for phrase in FILTERS['must_keep_phrases']:
-        if phrase.lower() in full_text:
-            return 100
-    
-    # 2. 排除關鍵字
-    for keyword in config.get('exclude', []):
-        if keyword.lower() in full_text:
-            score -= 5
-    
-    # 3. 來源優先關鍵字
-    for keyword in config.get('priority_keywords', []):
-        keyword_lower = keyword.lower()
-        if keyword_lower in title:
-            score += 10
-        elif keyword_lower in content:
-            score += 5
-    
-    # 4. 台灣興趣關鍵字（額外加分）
-    for keyword in FILTERS['taiwan_interests']:
-        if keyword.lower() in full_text:
-            score += 4
-    
-    # 5. 全球但台灣關注的主題
-    for keyword in FILTERS['global_taiwan_focus']:
-        if keyword.lower() in full_text:
-            score += 6
-    
-    # 6. 特殊處理
-    is_taiwan_source = source in ['technews', 'ithome', 'inside']
-    is_international_source = source in ['hackernews', 'techcrunch', 'openai']
-    
-    if is_taiwan_source:
-        score += 5
-        if '國際' in full_text or 'global' in full_text:
-            score += 8
-    
-    if is_international_source:
-        if 'taiwan' in full_text or 'asia' in full_text:
-            score += 10
-    
-    # 7. 實用性加分
-    practical_keywords = ['教學', 'tutorial', 'guide', '實測', '評測', '比較']
-    for keyword in practical_keywords:
-        if keyword in title:
-            score += 7
-    
-    # 8. 內容長度
-    if len(content) > 300:
-        score += 2
-    if len(content) > 500:
-        score += 2
-    
-    return score
+    return (compiled or get_compiled_filters()).score(item)
 
 
-def filter_and_score_news(all_news: List[Dict], target_date: str) -> List[Dict]:
+def filter_and_score_news(all_news: List[Dict], target_date: str,
+                          store: Optional[ItemStore] = None) -> List[Dict]:
     """
     篩選和評分新聞
     
     Args:
         all_news: 所有新聞列表
         target_date: 目標日期
+        store: 新聞項目儲存（可選），提供時以 iso_date 索引查詢昨日的連結取代逐則解析日期；
+               候選新聞仍是這次讀取的 all_news（依原本順序），
+               不會納入儲存中已不在 feed、來源讀取失敗或已移除來源的舊項目，入選結果與不使用儲存時相同
         
     Returns:
         篩選後的新聞列表
@@ -269,10 +414,16 @@ def filter_and_score_news(all_news: List[Dict], target_date: str) -> List[Dict]:
     grouped = {source: [] for source in FILTERS['sources'].keys()}
     grouped['unknown'] = []
     
+    # 儲存中昨日發布的連結（upsert 已寫入這次讀取的所有項目）
+    yesterday_links = {link_hash(item) for item in store.items_for_date(yesterday_str)} if store is not None else None
+    
     for item in all_news:
         # 檢查日期
         pub_date = item.get('isoDate', '')
-        if pub_date:
+        if pub_date and yesterday_links is not None:
+            if link_hash(item) not in yesterday_links:
+                continue
+        elif pub_date:
             try:
                 pub_dt = datetime.fromisoformat(pub_date.replace('Z', '+00:00'))
                 if pub_dt.strftime('%Y-%m-%d') != yesterday_str:
@@ -313,7 +464,7 @@ def filter_and_score_news(all_news: List[Dict], target_date: str) -> List[Dict]:
         filtered = filtered[:max_items]
         
         # 分類本地與國際
-        if source in ['technews', 'ithome', 'inside']:
+        if source in TAIWAN_SOURCES:
             taiwan_news.extend(filtered)
         else:
             international_news.extend(filtered)
@@ -0,0 +1,349 @@
+"""
+AI 輸出的 JSON Schema 模組
+每個階段宣告輸出的 JSON Schema，用於：
+
+1. 向 provider 要求結構化輸出（OpenAI json_schema、Gemini response_schema）
+2. 在本地快速驗證解析後的輸出，找出無效的欄位
+3. 只針對無效的欄位重新生成（patch_schema 描述要補的欄位）
+
+只實作本專案 schema 用到的子集合：type、properties、required、items、enum、minLength、minItems、default
+"""
+
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 每日累計的修復 / 重新生成統計（與其他快取一起由 GitHub Actions 保留）
+AI_OUTPUT_QUALITY_HISTORY = os.getenv('AI_OUTPUT_QUALITY_HISTORY', '.cache/output_quality.json')
+
+ALCHEMIST_CATEGORIES = (
+    'ai_applications_and_tools',
+    'industry_trends_and_news',
+    'security_alerts',
+    'perspectives_and_analysis',
+    'other',
+)
+
+NON_EMPTY_STRING = {'type': 'string', 'minLength': 1}
+
+ALCHEMIST_ITEM_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'rank': {'type': 'integer'},
+        'title': NON_EMPTY_STRING,
+        'detailed_content': NON_EMPTY_STRING,
+        'practical_takeaways': {'type': 'array', 'items': NON_EMPTY_STRING, 'minItems': 1},
+        'link': NON_EMPTY_STRING,
+    },
+    'required': ['rank', 'title', 'detailed_content', 'practical_takeaways', 'link'],
+}
+
+STAGE_SCHEMAS: Dict[str, Dict] = {
+    'alchemist': {
+        'type': 'object',
+        'properties': {
+            # 沒有新聞的分類常被省略，視為空列表而不是無效
+            category: {'type': 'array', 'items': ALCHEMIST_ITEM_SCHEMA, 'default': []}
+            for category in ALCHEMIST_CATEGORIES
+        },
+        'required': list(ALCHEMIST_CATEGORIES),
+    },
+    'narrator': {
+        'type': 'object',
+        'properties': {'notion_daily_report_text': NON_EMPTY_STRING},
+        'required': ['notion_daily_report_text'],
+    },
+    'editor': {
+        'type': 'object',
+        'properties': {
+            'line_message_text': NON_EMPTY_STRING,
+            'learning_focus_text': NON_EMPTY_STRING,
+        },
+        'required': ['line_message_text', 'learning_focus_text'],
+    },
+}
+
+JSON_TYPES = {
+    'object': dict,
+    'array': list,
+    'string': str,
+    'integer': int,
+    'number': (int, float),
+    'boolean': bool,
+}
+
+
+class OutputSchemaError(ValueError):
+    """欄位重新生成後輸出仍不符合 schema（由重試機制整段重新生成）"""
+
+
+class SchemaError(NamedTuple):
+    """驗證錯誤：欄位路徑（key 與 index）與原因"""
+    path: Tuple
+    message: str
+
+    def __str__(self) -> str:
+        return f"{format_path(self.path)}: {self.message}"
+
+
+def format_path(path: Tuple) -> str:
+    """('a', 2, 'b') → a[2].b"""
+    text = ''
+    for part in path:
+        text += f"[{part}]" if isinstance(part, int) else (f".{part}" if text else part)
+    return text or '(root)'
+
+
+def get_schema(stage: str) -> Optional[Dict]:
+    """階段的輸出 schema（HTML 生成器等非 JSON 階段為 None；分片的 <stage>#<n> 以 <stage> 計）"""
+    return STAGE_SCHEMAS.get(stage.partition('#')[0])
+
+
+def apply_defaults(document: Dict, schema: Dict) -> Dict:
+    """補上缺少、但 schema 有 default 的最上層欄位"""
+    for key, subschema in schema.get('properties', {}).items():
+        if key not in document and 'default' in subschema:
+            document[key] = json.loads(json.dumps(subschema['default']))
+    return document
+
+
+def validate(instance: Any, schema: Dict, path: Tuple = ()) -> List[SchemaError]:
+    """
+    驗證 JSON 值
+
+    Args:
+        instance: 解析後的 JSON 值
+        schema: JSON Schema
+        path: 目前的欄位路徑（遞迴用）
+
+    Returns:
+        所有錯誤（空列表代表有效）
+    """
+    expected = schema.get('type')
+    if expected:
+        python_type = JSON_TYPES[expected]
+        # bool 是 int 的子類別，不算 integer / number
+        if not isinstance(instance, python_type) or (isinstance(instance, bool) and expected != 'boolean'):
+            return [SchemaError(path, f"應為 {expected}，實際為 {type(instance).__name__}")]
+
+    errors = []
+    if 'enum' in schema and instance not in schema['enum']:
+        errors.append(SchemaError(path, f"不在允許的值 {schema['enum']} 中"))
+    if isinstance(instance, str) and len(instance.strip()) < schema.get('minLength', 0):
+        errors.append(SchemaError(path, "不可為空"))
+
+    if isinstance(instance, dict):
+        for key in schema.get('required', []):
+            if key not in instance:
+                errors.append(SchemaError(path + (key,), "缺少必要欄位"))
+        for key, subschema in schema.get('properties', {}).items():
+            if key in instance:
+                errors.extend(validate(instance[key], subschema, path + (key,)))
+
+    if isinstance(instance, list):
+        if len(instance) < schema.get('minItems', 0):
+            errors.append(SchemaError(path, f"至少需要 {schema['minItems']} 項"))
+        if 'items' in schema:
+            for index, item in enumerate(instance):
+                errors.extend(validate(item, schema['items'], path + (index,)))
+
+    return errors
+
+
+def subschema_at(schema: Dict, path: Tuple) -> Dict:
+    """取得路徑所在位置的 schema"""
+    for part in path:
+        schema = schema['items'] if isinstance(part, int) else schema['properties'][part]
+    return schema
+
+
+def invalid_units(errors: List[SchemaError]) -> List[Tuple]:
+    """
+    把錯誤歸併成要重新生成的單位：
+    路徑中有陣列索引時為該陣列元素（例如某則新聞），否則為最上層欄位
+
+    Args:
+        errors: validate 的結果
+
+    Returns:
+        依出現順序、不重複的單位路徑
+    """
+    units = []
+    for error in errors:
+        unit = error.path[:1]
+        for position, part in enumerate(error.path):
+            if isinstance(part, int):
+                unit = error.path[:position + 1]
+                break
+        if unit and unit not in units:
+            units.append(unit)
+    return units
+
+
+def unit_key(unit: Tuple) -> str:
+    """單位路徑 → patch 物件的欄位名稱（只用英數與底線，provider 的 schema 都接受）"""
+    return '__'.join(str(part) for part in unit)
+
+
+def patch_schema(schema: Dict, units: List[Tuple]) -> Dict:
+    """
+    只包含要重新生成之單位的 schema
+
+    Args:
+        schema: 階段的完整 schema
+        units: invalid_units 的結果
+
+    Returns:
+        {'type': 'object', 'properties': {unit_key: 該位置的 schema}, 'required': [...]}
+    """
+    return {
+        'type': 'object',
+        'properties': {unit_key(unit): subschema_at(schema, unit) for unit in units},
+        'required': [unit_key(unit) for unit in units],
+    }
+
+
+def apply_patch(document: Dict, units: List[Tuple], patch: Dict) -> Dict:
+    """
+    把重新生成的單位寫回文件（patch 中缺少的單位維持原值，之後的驗證會再抓出來）
+
+    Args:
+        document: 原本的輸出
+        units: 重新生成的單位
+        patch: provider 回傳的 {unit_key: 新值}
+
+    Returns:
+        更新後的文件（原文件不修改）
+    """
+    document = json.loads(json.dumps(document))
+    for unit in units:
+        key = unit_key(unit)
+        if key not in patch:
+            continue
+        target = document
+        for part in unit[:-1]:
+            target = target[part]
+        target[unit[-1]] = patch[key]
+    return document
+
+
+def openai_response_format(name: str, schema: Dict) -> Dict:
+    """
+    OpenAI 的 json_schema response_format（strict 模式）
+
+    strict 模式要求每個物件都 additionalProperties: false 且列出全部欄位，
+    不支援 minLength / minItems / default（留給本地驗證）
+    """
+    return {
+        'type': 'json_schema',
+        'json_schema': {'name': name, 'strict': True, 'schema': _openai_schema(schema)},
+    }
+
+
+def _openai_schema(schema: Dict) -> Dict:
+    converted = {key: value for key, value in schema.items() if key not in ('minLength', 'minItems', 'default')}
+    if 'properties' in schema:
+        converted['properties'] = {key: _openai_schema(value) for key, value in schema['properties'].items()}
+        converted['required'] = list(schema['properties'])
+        converted['additionalProperties'] = False
+    if 'items' in schema:
+        converted['items'] = _openai_schema(schema['items'])
+    return converted
+
+
+def gemini_response_schema(schema: Dict) -> Dict:
+    """
+    Gemini 的 response_schema
+
+    只支援 OpenAPI schema 的子集合：minItems 改為 min_items，minLength 留給本地驗證
+    """
+    converted = {key: schema[key] for key in ('type', 'description', 'enum', 'required') if key in schema}
+    if 'minItems' in schema:
+        converted['min_items'] = schema['minItems']
+    if 'properties' in schema:
+        converted['properties'] = {key: gemini_response_schema(value) for key, value in schema['properties'].items()}
+    if 'items' in schema:
+        converted['items'] = gemini_response_schema(schema['items'])
+    return converted
+
+
+class OutputQuality:
+    """
+    各階段輸出品質統計：直接解析 / JSON 修復 / schema 無效 / 欄位重新生成 / 整段重新生成
+
+    本次執行的統計寫入執行日誌，累計值保存在 .cache 下，可觀察長期的修復率與重新生成率
+    """
+
+    COUNTERS = ('outputs', 'repaired', 'schema_invalid', 'fields_regenerated', 'field_regenerations',
+                'full_regenerations')
+
+    def __init__(self, path: str = AI_OUTPUT_QUALITY_HISTORY):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.run: Dict[str, Dict[str, int]] = {}
+
+    def count(self, stage: str, counter: str, amount: int = 1):
+        """
+        累計
+
+        Args:
+            stage: 處理階段（分片以 <stage> 計）
+            counter: COUNTERS 之一
+            amount: 增加量
+        """
+        with self._lock:
+            tally = self.run.setdefault(stage.partition('#')[0], dict.fromkeys(self.COUNTERS, 0))
+            tally[counter] += amount
+
+    def rates(self, stage: str) -> Dict[str, float]:
+        """本次執行的修復率與重新生成率（以輸出次數為分母）"""
+        tally = self.run.get(stage, {})
+        outputs = tally.get('outputs', 0)
+        if not outputs:
+            return {}
+        return {
+            'repair_rate': round(tally['repaired'] / outputs, 3),
+            'field_regeneration_rate': round(tally['field_regenerations'] / outputs, 3),
+            'full_regeneration_rate': round(tally['full_regenerations'] / outputs, 3),
+        }
+
+    def save(self) -> Dict:
+        """
+        把本次執行的統計加到累計值
+
+        Returns:
+            累計統計 {階段: {counter: 次數}}
+        """
+        with self._lock:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    history = json.load(f)
+            except FileNotFoundError:
+                history = {}
+            except Exception as e:
+                logger.warning(f"  ⚠️  輸出品質統計讀取失敗，重新累積: {str(e)}")
+                history = {}
+
+            for stage, tally in self.run.items():
+                total = history.setdefault(stage, dict.fromkeys(self.COUNTERS, 0))
+                for counter, amount in tally.items():
+                    total[counter] = total.get(counter, 0) + amount
+
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix('.json.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(history, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.warning(f"  ⚠️  輸出品質統計寫入失敗: {str(e)}")
+            return history
+
+
+# 程序共用的輸出品質統計
+output_quality = OutputQuality()
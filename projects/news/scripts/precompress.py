@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+預先壓縮網站檔案
+為產生的 HTML、JSON 與 CSS / JS 寫入最高壓縮等級的 .gz（與 .br）同名檔，
+支援預先壓縮檔的靜態主機或預覽伺服器（例如 nginx gzip_static / brotli_static）可以直接送出壓縮好的位元組，
+不必每次請求時壓縮
+
+壓縮檔是部署 / 預覽步驟的產物，不進版本控制（.gitignore 排除 *.gz、*.br），每日流程也不產生
+
+- gzip 以 level 9、mtime=0 壓縮（相同內容得到相同位元組，git 不會有差異）
+- brotli 以 quality 11 壓縮；未安裝 brotli 套件時只產生 .gz
+- 已存在的壓縮檔解壓後與原檔 hash 相同時略過（不需要另外保存狀態）
+- 以 thread pool 並行（zlib 與 brotli 壓縮時釋放 GIL）
+
+使用方式（在 projects/news 目錄下，部署或預覽前執行）：
+    python scripts/precompress.py                 # 或 npm run precompress
+    python scripts/precompress.py --site-dir /path/to/site
+"""
+
+import os
+import sys
+import gzip
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from site_archive import ARCHIVE_DIR, content_hash
+from templates import ASSETS_DIR
+
+logger = logging.getLogger(__name__)
+
+# 並行的 thread 數（0 = CPU 核心數）
+PRECOMPRESS_WORKERS = int(os.getenv('PRECOMPRESS_WORKERS', '0'))
+
+COMPRESSIBLE_SUFFIXES = ('.html', '.json', '.css', '.js')
+# 網站目錄中不對外提供的設定檔
+_NOT_SERVED = {'package.json', 'vercel.json'}
+
+_DECOMPRESS_ERRORS = (OSError, ValueError, EOFError) + ((brotli.error,) if brotli is not None else ())
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=11, mode=brotli.MODE_TEXT)
+
+
+def encodings() -> Dict[str, tuple]:
+    """可用的壓縮格式 {副檔名: (壓縮, 解壓)}"""
+    available = {'.gz': (_gzip, gzip.decompress)}
+    if brotli is not None:
+        available['.br'] = (_brotli, brotli.decompress)
+    return available
+
+
+def _is_current(sibling: Path, source_hash: str, decompress) -> bool:
+    """壓縮檔存在且解壓後與原檔相同"""
+    try:
+        return content_hash(decompress(sibling.read_bytes())) == source_hash
+    except FileNotFoundError:
+        return False
+    except _DECOMPRESS_ERRORS as e:
+        logger.debug(f"{sibling} 無法解壓，重新壓縮: {str(e)}")
+        return False
+
+
+def compress_file(path: Path) -> Dict:
+    """
+    為單一檔案寫入 .gz / .br（內容未改變時略過）
+
+    Args:
+        path: 原檔路徑
+
+    Returns:
+        {'path', 'bytes', 'written': [副檔名], 'compressed': {副檔名: 位元組}}
+    """
+    data = path.read_bytes()
+    source_hash = content_hash(data)
+    result = {'path': str(path), 'bytes': len(data), 'written': [], 'compressed': {}}
+    for suffix, (compress, decompress) in encodings().items():
+        sibling = path.with_name(path.name + suffix)
+        if not _is_current(sibling, source_hash, decompress):
+            compressed = compress(data)
+            tmp_path = sibling.with_name(f".{sibling.name}.tmp")
+            tmp_path.write_bytes(compressed)
+            os.replace(tmp_path, sibling)
+            result['written'].append(suffix)
+        result['compressed'][suffix] = sibling.stat().st_size
+    return result
+
+
+def site_files(site_dir: Path = Path('.')) -> List[Path]:
+    """
+    網站中所有要預先壓縮的檔案：根目錄、ARCHIVE_DIR 與 ASSETS_DIR 中的 HTML / JSON / CSS / JS
+
+    Args:
+        site_dir: 網站目錄
+
+    Returns:
+        檔案路徑（依路徑排序）
+    """
+    files = []
+    for directory in (site_dir, site_dir / ARCHIVE_DIR, site_dir / ASSETS_DIR):
+        if not directory.is_dir():
+            continue
+        files.extend(
+            path for path in directory.iterdir()
+            if path.is_file() and path.suffix in COMPRESSIBLE_SUFFIXES and path.name not in _NOT_SERVED
+            and not path.name.startswith('.')
+        )
+    return sorted(files)
+
+
+def precompress(paths: Iterable, workers: int = PRECOMPRESS_WORKERS) -> Dict:
+    """
+    並行預先壓縮檔案（不存在、不可壓縮的路徑略過）
+
+    Args:
+        paths: 檔案路徑
+        workers: thread 數（0 = CPU 核心數）
+
+    Returns:
+        {'files', 'written', 'unchanged', 'bytes', 'compressed': {副檔名: 位元組}, 'seconds'}
+    """
+    started_at = time.perf_counter()
+    targets = sorted({
+        Path(path) for path in paths
+        if Path(path).suffix in COMPRESSIBLE_SUFFIXES and Path(path).is_file()
+    })
+    workers = max(1, min(workers or os.cpu_count() or 1, len(targets) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(compress_file, targets))
+
+    written = [result['path'] for result in results if result['written']]
+    compressed = {suffix: sum(result['compressed'].get(suffix, 0) for result in results) for suffix in encodings()}
+    report = {
+        'files': len(results),
+        'written': written,
+        'unchanged': len(results) - len(written),
+        'bytes': sum(result['bytes'] for result in results),
+        'compressed': compressed,
+        'seconds': round(time.perf_counter() - started_at, 3)
+    }
+    sizes = '，'.join(f"{suffix} {size:,}" for suffix, size in compressed.items())
+    logger.info(
+        f"🗜️  預先壓縮 {len(results)} 個檔案：更新 {len(written)} 個、未改變 {report['unchanged']} 個，"
+        f"原始 {report['bytes']:,} bytes → {sizes} bytes（{report['seconds']:.2f} 秒）"
+    )
+    if brotli is None:
+        logger.info("ℹ️  未安裝 brotli 套件，只產生 .gz")
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="為網站的 HTML / JSON / CSS / JS 產生 .gz / .br")
+    parser.add_argument('--site-dir', default='.', help="網站目錄（預設為目前目錄）")
+    parser.add_argument('--workers', type=int, default=PRECOMPRESS_WORKERS,
+                        help="並行的 thread 數（0 = CPU 核心數）")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    report = precompress(site_files(Path(args.site_dir)), args.workers)
+    for path in report['written']:
+        print(f"  ✏️  {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""
+Prompt 壓縮與 token 預算模組
+數據煉金術師的輸入在送出前先壓縮：
+
+1. 去除 HTML（標籤、script/style、HTML entity）與多餘空白
+2. 去除樣板文字：已知的 RSS 結尾樣板，以及同一來源多則新聞重複出現的句子
+3. 依相關性分數分配每則新聞的 token 預算（分數越高保留越多內容），在句子邊界截斷
+4. 在本地估計整個 prompt 的 token 數與費用，寫入執行日誌
+
+token 數以字元類型估計（中日韓字元約 1 token、其他字元約 4 字元 1 token），
+不依賴特定模型的 tokenizer，誤差約 ±20%，足以控制 prompt 大小
+"""
+
+import os
+import re
+import html
+import math
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 每則新聞內容的 token 預算：相關性最低者 MIN，最高者 MAX，中間線性分配
+ALCHEMIST_ITEM_TOKENS_MIN = int(os.getenv('ALCHEMIST_ITEM_TOKENS_MIN', '80'))
+ALCHEMIST_ITEM_TOKENS_MAX = int(os.getenv('ALCHEMIST_ITEM_TOKENS_MAX', '400'))
+# 所有新聞內容合計的上限（超過時依比例縮減每則預算，0 為不限）
+ALCHEMIST_CONTENT_TOKEN_BUDGET = int(os.getenv('ALCHEMIST_CONTENT_TOKEN_BUDGET', '8000'))
+# 同一來源至少幾則新聞出現相同句子才視為樣板
+BOILERPLATE_MIN_REPEATS = 2
+
+# 每百萬 token 的價格（美元，輸入 / 輸出）；未列出的模型不估計費用
+MODEL_PRICES_PER_MILLION: Dict[str, Tuple[float, float]] = {
+    'gemini-2.5-flash': (0.30, 2.50),
+    'gemini-2.5-flash-lite': (0.10, 0.40),
+    'gemini-2.5-pro': (1.25, 10.00),
+    'gemini-2.0-flash': (0.10, 0.40),
+    'chatgpt-4o-latest': (5.00, 15.00),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4o-mini': (0.15, 0.60),
+}
+
+_SCRIPT_STYLE = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_BLOCK_TAGS = re.compile(r'<\s*(br|/p|/div|/li|/h[1-6]|/blockquote|/tr)\b[^>]*>', re.IGNORECASE)
+_TAGS = re.compile(r'<[^>]+>')
+_SPACES = re.compile(r'[ \t\r\f\v\u00a0\u3000]+')
+_NEWLINES = re.compile(r'\s*\n\s*')
+_SENTENCE_END = re.compile(r'(?<=[。！？!?])|(?<=[.;])\s+|\n')
+_CJK = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]')
+_CJK_SENTENCE_END = ('。', '！', '？')
+
+# 常見的 RSS 結尾樣板（WordPress / Feedburner 等）
+BOILERPLATE_PATTERNS = [
+    re.compile(r'The post .{0,300}? appeared first on .{0,100}?\.?$', re.IGNORECASE),
+    re.compile(r'(Continue reading|Read more|Read the full story|\[(?:…|\.\.\.)\]).{0,100}$', re.IGNORECASE),
+    re.compile(r'(閱讀全文|繼續閱讀|更多內容|完整內容請見).{0,50}$'),
+]
+
+
+def strip_html(text: str) -> str:
+    """
+    去除 HTML，保留段落換行
+
+    Args:
+        text: RSS 的 description / content（可能含 HTML）
+
+    Returns:
+        純文字
+    """
+    if not text:
+        return ''
+    text = _SCRIPT_STYLE.sub(' ', text)
+    text = _BLOCK_TAGS.sub('\n', text)
+    text = _TAGS.sub(' ', text)
+    text = html.unescape(text)
+    text = _SPACES.sub(' ', text)
+    return _NEWLINES.sub('\n', text).strip()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    估計文字的 token 數
+
+    Args:
+        text: 任意文字
+
+    Returns:
+        估計的 token 數
+    """
+    if not text:
+        return 0
+    cjk = len(_CJK.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+
+def split_sentences(text: str) -> List[str]:
+    """以中英文句尾標點與換行切句（保留標點）"""
+    return [sentence.strip() for sentence in _SENTENCE_END.split(text) if sentence and sentence.strip()]
+
+
+def join_sentences(sentences: List[str]) -> str:
+    """接回句子：中文句尾直接相接，其他以空白分隔"""
+    return ''.join(
+        sentence if sentence.endswith(_CJK_SENTENCE_END) else f"{sentence} " for sentence in sentences
+    ).strip()
+
+
+def trim_to_tokens(text: str, budget: int) -> str:
+    """
+    在句子邊界截斷到 token 預算內（第一句就超過時直接截斷字元）
+
+    Args:
+        text: 純文字
+        budget: token 預算
+
+    Returns:
+        截斷後的文字（有截斷時以「…」結尾）
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+
+    kept = []
+    used = 0
+    for sentence in split_sentences(text):
+        tokens = estimate_tokens(sentence)
+        if used + tokens > budget:
+            break
+        kept.append(sentence)
+        used += tokens
+
+    if kept:
+        return join_sentences(kept) + '…'
+
+    # 第一句就超過預算：逐字累計到預算為止
+    cut = 0
+    used = 0
+    for cut, char in enumerate(text):
+        used += 1 if _CJK.match(char) else 0.25
+        if used > budget:
+            break
+    return text[:cut].rstrip() + '…'
+
+
+def _boilerplate_sentences(items: List[Dict], contents: List[str]) -> Dict[str, set]:
+    """
+    找出同一來源多則新聞都出現的句子（例如每則都附上的版權宣告）
+    內容完全相同的新聞（重複轉載）只算一次，避免把整則新聞當成樣板
+    """
+    counts: Dict[str, Counter] = {}
+    seen = set()
+    for item, content in zip(items, contents):
+        key = (item.get('source', ''), content)
+        if key in seen:
+            continue
+        seen.add(key)
+        counts.setdefault(key[0], Counter()).update(set(split_sentences(content)))
+    return {
+        source: {sentence for sentence, count in counter.items() if count >= BOILERPLATE_MIN_REPEATS}
+        for source, counter in counts.items()
+    }
+
+
+def item_token_budgets(items: List[Dict], total_budget: int = ALCHEMIST_CONTENT_TOKEN_BUDGET,
+                       min_tokens: int = ALCHEMIST_ITEM_TOKENS_MIN,
+                       max_tokens: int = ALCHEMIST_ITEM_TOKENS_MAX) -> List[int]:
+    """
+    依相關性分數分配每則新聞的 token 預算
+
+    Args:
+        items: 新聞列表（relevance_score 缺少時視為最低分）
+        total_budget: 所有新聞合計的上限（0 為不限）
+        min_tokens: 最低分新聞的預算
+        max_tokens: 最高分新聞的預算
+
+    Returns:
+        與 items 對應的預算
+    """
+    scores = [item.get('relevance_score') or 0 for item in items]
+    if not scores:
+        return []
+    low, high = min(scores), max(scores)
+    budgets = [
+        max_tokens if high == low else min_tokens + (max_tokens - min_tokens) * (score - low) / (high - low)
+        for score in scores
+    ]
+    if total_budget and sum(budgets) > total_budget:
+        scale = total_budget / sum(budgets)
+        budgets = [budget * scale for budget in budgets]
+    return [max(1, int(budget)) for budget in budgets]
+
+
+def compact_news_items(items: List[Dict]) -> Tuple[List[Dict], Dict]:
+    """
+    壓縮新聞內容
+
+    Args:
+        items: 篩選後的新聞列表
+
+    Returns:
+        (壓縮後的新聞 {'title', 'link', 'content'}, 統計)
+    """
+    contents = [strip_html(item.get('content', '')) for item in items]
+    boilerplate = _boilerplate_sentences(items, contents)
+    budgets = item_token_budgets(items)
+
+    compacted = []
+    stats = {
+        'items': len(items),
+        'content_tokens_before': sum(estimate_tokens(item.get('content', '')) for item in items),
+        'html_stripped': sum(1 for item, content in zip(items, contents) if content != (item.get('content') or '').strip()),
+        'boilerplate_sentences': 0,
+        'trimmed': 0,
+    }
+    for item, content, budget in zip(items, contents, budgets):
+        repeated = boilerplate.get(item.get('source', ''), set())
+        sentences = []
+        for sentence in split_sentences(content):
+            if sentence in repeated:
+                stats['boilerplate_sentences'] += 1
+                continue
+            cleaned = sentence
+            for pattern in BOILERPLATE_PATTERNS:
+                cleaned = pattern.sub('', cleaned).strip()
+            stats['boilerplate_sentences'] += int(cleaned != sentence)
+            if cleaned:
+                sentences.append(cleaned)
+        cleaned = join_sentences(sentences)
+        # 內容只是重複標題時不必再送一次
+        if cleaned.strip() == item['title'].strip():
+            cleaned = ''
+
+        trimmed = trim_to_tokens(cleaned, budget)
+        stats['trimmed'] += int(trimmed != cleaned)
+        compacted.append({'title': item['title'], 'link': item['link'], 'content': trimmed})
+
+    stats['content_tokens_after'] = sum(estimate_tokens(item['content']) for item in compacted)
+    logger.info(
+        f"  ✂️  Prompt 壓縮: 內容 {stats['content_tokens_before']:,} → {stats['content_tokens_after']:,} tokens"
+        f"（去除 HTML {stats['html_stripped']} 則、樣板 {stats['boilerplate_sentences']} 句、截斷 {stats['trimmed']} 則）"
+    )
+    return compacted, stats
+
+
+def estimate_cost(model: str, prompt_tokens: int, output_tokens: int = 0) -> Optional[float]:
+    """
+    估計費用（美元）
+
+    Args:
+        model: 模型名稱
+        prompt_tokens: 輸入 token 數
+        output_tokens: 輸出 token 數
+
+    Returns:
+        費用，未知模型為 None
+    """
+    prices = MODEL_PRICES_PER_MILLION.get(model)
+    if prices is None:
+        return None
+    input_price, output_price = prices
+    return round((prompt_tokens * input_price + output_tokens * output_price) / 1_000_000, 6)
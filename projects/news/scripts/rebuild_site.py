@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+重建網站的所有日期頁面
+模板或樣式修改後，以保存的頁面來源資料（site_archive）和本地 Markdown 轉換器重新產生每一天的頁面與首頁，
+不重新讀取 RSS、不呼叫 AI
+
+- 首頁與每月的歷史日報頁由 archive_manifest.json 產生（缺少的日期先從頁面補入 manifest）
+
+- 以 process pool 並行渲染，每個 worker 一次處理一批日期
+- 只有內容 hash 改變的頁面才寫入（未改變的檔案維持原本的修改時間，git 也不會有差異）
+- 共用 CSS / JS 以指紋化檔名發佈一次；報告重建前後每次瀏覽的平均位元組數
+- 沒有來源資料的日期（早期以 AI 生成整頁、且已不在檢查點中的頁面）保留原檔並列出
+
+使用方式（在 projects/news 目錄下）：
+    python scripts/rebuild_site.py                          # 重建全部
+    python scripts/rebuild_site.py --dates 2026-02-01 2026-02-02
+    python scripts/rebuild_site.py --dry-run                # 只列出會改變的頁面
+    python scripts/rebuild_site.py --save-sources           # 把從檢查點補回的來源寫入 archive/
+    python scripts/rebuild_site.py --archive-only           # 只重建首頁與歷史日報頁
+"""
+
+import os
+import sys
+import math
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from html_generator import render_archive_month, render_daily_pages, render_index_html
+from templates import page_weight, publish_assets
+from site_archive import (
+    ARCHIVE_DIR,
+    backfill_manifest,
+    content_hash,
+    group_by_month,
+    dated_pages,
+    load_page_sources,
+    save_page_source,
+    to_final_output,
+    write_if_changed,
+)
+
+logger = logging.getLogger(__name__)
+
+# 並行的 worker 數（0 = CPU 核心數）
+REBUILD_WORKERS = int(os.getenv('REBUILD_WORKERS', '0'))
+# 每個 worker 平均分到幾批（批數越多，負載越平均；每批的 IPC 與模板載入成本越高）
+BATCHES_PER_WORKER = 4
+
+
+def _differs(path: Path, content: str) -> bool:
+    """dry-run 用：頁面是否不存在或內容 hash 不同"""
+    return not path.exists() or content_hash(path.read_bytes()) != content_hash(content.encode('utf-8'))
+
+
+def _rebuild_batch(site_dir: str, news_jsons: List[Dict], dry_run: bool) -> List[Tuple[str, bool, Dict, Dict]]:
+    """
+    worker：渲染一批日期的頁面，內容改變時才寫入
+
+    Returns:
+        [(日期, 是否改變, 重建前的 page_weight, 重建後的 page_weight)]
+    """
+    results = []
+    pages = render_daily_pages(to_final_output(news_json) for news_json in news_jsons)
+    for news_json, html in zip(news_jsons, pages):
+        path = Path(site_dir) / f"{news_json['date']}.html"
+        before = page_weight(path.read_text(encoding='utf-8'), path.parent) if path.exists() else None
+        after = page_weight(html, path.parent)
+        changed = _differs(path, html) if dry_run else write_if_changed(path, html)
+        results.append((news_json['date'], changed, before, after))
+    return results
+
+
+def _average_weight(weights: List[Dict]) -> Optional[Dict]:
+    """page_weight 的平均值（四捨五入到位元組）"""
+    if not weights:
+        return None
+    return {key: round(sum(weight[key] for weight in weights) / len(weights)) for key in weights[0]}
+
+
+def _rebuild_archive(site_dir: Path, dry_run: bool) -> Tuple[str, List[str]]:
+    """
+    由 archive_manifest.json 重建首頁與所有月份的歷史日報頁
+
+    Returns:
+        (首頁狀態 written / unchanged / -, 改變的歷史日報頁)
+    """
+    manifest = backfill_manifest(site_dir, save=not dry_run)
+    issues = manifest['issues']
+    if not issues:
+        return '-', []
+
+    pages = {site_dir / 'index.html': render_index_html(max(issue['date'] for issue in issues), issues)}
+    grouped = group_by_month(issues)
+    archive_dir = site_dir / ARCHIVE_DIR
+    if not dry_run:
+        archive_dir.mkdir(parents=True, exist_ok=True)
+    for i, month in enumerate(grouped):
+        pages[archive_dir / f"{month['month']}.html"] = render_archive_month(
+            month,
+            newer=grouped[i - 1] if i > 0 else None,
+            older=grouped[i + 1] if i + 1 < len(grouped) else None
+        )
+
+    changed = {
+        path: _differs(path, content) if dry_run else write_if_changed(path, content)
+        for path, content in pages.items()
+    }
+    index_status = 'written' if changed.pop(site_dir / 'index.html') else 'unchanged'
+    return index_status, [path.name for path, was_changed in changed.items() if was_changed]
+
+
+def rebuild_site(site_dir: Path = Path('.'), dates: Optional[List[str]] = None, workers: int = REBUILD_WORKERS,
+                 dry_run: bool = False, save_sources: bool = False, archive_only: bool = False) -> Dict:
+    """
+    重建日期頁面與首頁
+
+    Args:
+        site_dir: 網站目錄（projects/news）
+        dates: 只重建這些日期（None 為全部已存在的頁面與有來源資料的日期）
+        workers: process pool 大小（0 = CPU 核心數，1 = 不使用 process pool）
+        dry_run: 只比較，不寫入
+        save_sources: 把從 latest.json / 檢查點補回的來源寫入 archive/
+        archive_only: 只重建首頁與歷史日報頁，不重建日期頁面
+
+    Returns:
+        {'pages', 'written', 'unchanged', 'missing_source', 'index', 'archive', 'assets', 'weight_before',
+         'weight_after', 'workers', 'seconds', 'pages_per_second'}
+    """
+    started_at = time.perf_counter()
+    asset_paths = [] if dry_run else publish_assets(site_dir)
+    sources = load_page_sources(site_dir)
+    targets = [] if archive_only else sorted(dates or set(dated_pages(site_dir)) | set(sources))
+    missing = [date for date in targets if date not in sources]
+    news_jsons = [
+        {key: value for key, value in sources[date].items() if key != 'origin'}
+        for date in targets if date in sources
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(news_jsons) or 1))
+    batch_size = max(1, math.ceil(len(news_jsons) / (workers * BATCHES_PER_WORKER)))
+    batches = [news_jsons[i:i + batch_size] for i in range(0, len(news_jsons), batch_size)]
+
+    logger.info(f"🏗️  重建 {len(news_jsons)} 個日期頁面（{workers} 個 worker，{len(batches)} 批）...")
+    results: List[Tuple[str, bool, Dict, Dict]] = []
+    if workers == 1:
+        for batch in batches:
+            results.extend(_rebuild_batch(str(site_dir), batch, dry_run))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_rebuild_batch, str(site_dir), batch, dry_run) for batch in batches]
+            for future in futures:
+                results.extend(future.result())
+
+    # 首頁指向最新一期，歷史日報頁列出所有期
+    index_status, archive_written = _rebuild_archive(site_dir, dry_run)
+
+    if save_sources and not dry_run:
+        recovered = [date for date in targets if date in sources and sources[date]['origin'] != 'archive']
+        for date in recovered:
+            save_page_source({key: value for key, value in sources[date].items() if key != 'origin'}, site_dir)
+        if recovered:
+            logger.info(f"💾 已將 {len(recovered)} 天的來源資料寫入 {ARCHIVE_DIR}/")
+
+    seconds = time.perf_counter() - started_at
+    written = [date for date, changed, _, _ in results if changed]
+    # 重建前後每次瀏覽的位元組數（只比較原本就有頁面的日期）
+    compared = [(before, after) for _, _, before, after in results if before]
+    weight_before = _average_weight([before for before, _ in compared])
+    weight_after = _average_weight([after for _, after in compared])
+    report = {
+        'pages': len(results),
+        'written': written,
+        'unchanged': len(results) - len(written),
+        'missing_source': missing,
+        'index': index_status,
+        'archive': archive_written,
+        'assets': asset_paths,
+        'weight_before': weight_before,
+        'weight_after': weight_after,
+        'workers': workers,
+        'seconds': round(seconds, 3),
+        'pages_per_second': round(len(results) / seconds, 1) if seconds else None
+    }
+    verb = '需要更新' if dry_run else '已更新'
+    logger.info(
+        f"✅ 重建完成：{len(results)} 頁，{verb} {len(written)} 頁、未改變 {report['unchanged']} 頁，首頁 {index_status}，"
+        f"歷史日報頁{verb} {len(archive_written)} 頁，"
+        f"{seconds:.2f} 秒（{report['pages_per_second']} 頁/秒）"
+    )
+    if compared:
+        logger.info(
+            f"📦 每頁平均每次瀏覽（{len(compared)} 頁）: 第一次 {weight_before['first_view']:,} → "
+            f"{weight_after['first_view']:,} bytes，再次瀏覽 {weight_before['repeat_view']:,} → "
+            f"{weight_after['repeat_view']:,} bytes"
+        )
+    if missing:
+        logger.warning(f"⚠️  {len(missing)} 個日期沒有來源資料，保留原頁面: {', '.join(missing)}")
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="以保存的頁面來源資料重建所有日期頁面與首頁")
+    parser.add_argument('--site-dir', default='.', help="網站目錄（預設為目前目錄）")
+    parser.add_argument('--dates', nargs='+', metavar='YYYY-MM-DD', help="只重建指定日期")
+    parser.add_argument('--workers', type=int, default=REBUILD_WORKERS,
+                        help="並行的 worker 數（0 = CPU 核心數，1 = 不使用 process pool）")
+    parser.add_argument('--dry-run', action='store_true', help="只列出會改變的頁面，不寫入")
+    parser.add_argument('--save-sources', action='store_true',
+                        help=f"把從 latest.json / 檢查點補回的來源資料寫入 {ARCHIVE_DIR}/")
+    parser.add_argument('--archive-only', action='store_true', help="只重建首頁與歷史日報頁")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    report = rebuild_site(Path(args.site_dir), args.dates, args.workers, args.dry_run, args.save_sources,
+                          args.archive_only)
+    for date in report['written']:
+        print(f"  {'~' if args.dry_run else '✏️ '} {date}.html")
+    for path in report['assets']:
+        print(f"  ✏️  {path}")
+    for name in report['archive']:
+        print(f"  {'~' if args.dry_run else '✏️ '} {ARCHIVE_DIR}/{name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+重試與截止時間模組
+AI 呼叫的重試策略與整條流程的時間預算
+
+- 指數退避 + jitter，服務端有 Retry-After / rate limit 標頭時依標頭等待
+- 驗證失敗、參數錯誤等重試也不會成功的錯誤直接拋出
+- 流程截止時間：每次呼叫的逾時與重試等待都不超過剩餘時間，
+  時間不夠時放棄重試，讓 main.py 改走降級方案
+"""
+
+import os
+import re
+import time
+import random
+import logging
+from email.utils import parsedate_to_datetime
+from functools import wraps
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 單次退避的上限（秒）
+AI_RETRY_MAX_DELAY = float(os.getenv('AI_RETRY_MAX_DELAY', '60'))
+
+# 重試也不會成功的 HTTP 狀態碼（驗證、權限、參數錯誤）；其餘 4xx 中只有這些會重試
+RETRYABLE_4XX = {408, 409, 429}
+
+# OpenAI x-ratelimit-reset-* 的格式，例如 "1s"、"6m0s"、"20ms"
+DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+# Gemini 429 訊息中的建議等待時間，例如 "Please retry in 23.5s"、retryDelay: "23s"（REST）
+# 或 retry_delay { seconds: 23 }（gRPC）
+GEMINI_RETRY_HINT = re.compile(
+    r'(?:retry in|retryDelay)\D{0,20}?(\d+(?:\.\d+)?)\s*s|retry_delay\s*\{\s*seconds:\s*(\d+)',
+    re.IGNORECASE
+)
+
+
+class DeadlineExceededError(RuntimeError):
+    """流程剩餘時間不足以完成這次呼叫"""
+
+
+class Deadline:
+    """流程截止時間（None 代表不限時）"""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.reset(seconds)
+
+    def reset(self, seconds: Optional[float] = None):
+        """從現在開始計時"""
+        self.seconds = seconds if seconds and seconds > 0 else None
+        self.started_at = time.monotonic()
+
+    def remaining(self) -> float:
+        """剩餘秒數（不限時為 inf）"""
+        if self.seconds is None:
+            return float('inf')
+        return self.seconds - (time.monotonic() - self.started_at)
+
+    def check(self, what: str = ''):
+        """時間已到時拋出 DeadlineExceededError"""
+        if self.remaining() <= 0:
+            raise DeadlineExceededError(f"流程已超過 {self.seconds / 60:.0f} 分鐘的時間預算{f'（{what}）' if what else ''}")
+
+
+# 整條流程的截止時間，main.py 依 --deadline-minutes 設定
+pipeline_deadline = Deadline()
+
+
+def call_timeout(default: float, minimum: float = 1.0) -> float:
+    """
+    單次呼叫的逾時：預設值與流程剩餘時間取小者
+
+    Args:
+        default: provider 的預設逾時（秒）
+        minimum: 最短逾時（秒）
+
+    Returns:
+        逾時秒數
+    """
+    return max(minimum, min(default, pipeline_deadline.remaining()))
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    判斷錯誤是否值得重試
+
+    Args:
+        exc: 呼叫拋出的錯誤
+
+    Returns:
+        False 代表重試也不會成功（驗證失敗、參數錯誤、超過截止時間等）
+    """
+    if isinstance(exc, DeadlineExceededError):
+        return False
+    status = status_code(exc)
+    if status is None:
+        # 連線錯誤、逾時、輸出格式錯誤等
+        return True
+    return status >= 500 or status in RETRYABLE_4XX
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """
+    從錯誤中取出服務端建議的等待秒數
+
+    - OpenAI: retry-after-ms、retry-after（秒數或 HTTP 日期）、429 時的 x-ratelimit-reset-*
+    - Gemini: 429 訊息中的 "retry in Ns"
+
+    Args:
+        exc: 呼叫拋出的錯誤
+
+    Returns:
+        秒數，沒有提示時回傳 None
+    """
+    response = getattr(exc, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if headers:
+        if headers.get('retry-after-ms'):
+            try:
+                return float(headers['retry-after-ms']) / 1000
+            except ValueError:
+                pass
+        if headers.get('retry-after'):
+            value = headers['retry-after']
+            try:
+                return float(value)
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+        if status_code(exc) == 429:
+            resets = [
+                _parse_duration(headers.get(name, ''))
+                for name in ('x-ratelimit-reset-requests', 'x-ratelimit-reset-tokens')
+            ]
+            resets = [reset for reset in resets if reset is not None]
+            if resets:
+                return max(resets)
+
+    if status_code(exc) == 429:
+        match = GEMINI_RETRY_HINT.search(str(exc))
+        if match:
+            return float(match.group(1) or match.group(2))
+    return None
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float = AI_RETRY_MAX_DELAY) -> float:
+    """
+    指數退避 + jitter：在 [d/2, d] 之間隨機，d = base_delay * 2^attempt
+
+    Args:
+        attempt: 第幾次失敗（從 0 開始）
+        base_delay: 基礎延遲（秒）
+        max_delay: 上限（秒）
+
+    Returns:
+        等待秒數
+    """
+    ceiling = min(max_delay, base_delay * (2 ** attempt))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def retry_on_failure(max_retries: int = 2, delay: float = 3, max_delay: float = AI_RETRY_MAX_DELAY,
+                     immediate: Callable[[BaseException], bool] = lambda e: False):
+    """
+    重試裝飾器
+
+    Args:
+        max_retries: 最大重試次數
+        delay: 退避的基礎延遲（秒）
+        max_delay: 單次等待上限（秒）
+        immediate: 回傳 True 的錯誤立即重試，不等待（例如串流中途中止的格式錯誤）
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            for attempt in range(max_retries + 1):
+                pipeline_deadline.check(func.__name__)
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if not is_retryable(e):
+                        logger.error(f"❌ {func.__name__} 發生無法重試的錯誤: {str(e)}")
+                        raise
+                    if attempt >= max_retries:
+                        logger.error(f"❌ {func.__name__} 在 {max_retries + 1} 次嘗試後仍然失敗")
+                        raise
+
+                    logger.warning(f"⚠️  {func.__name__} 第 {attempt + 1} 次嘗試失敗: {str(e)}")
+                    if immediate(e):
+                        logger.info("🔄 立即重新生成...")
+                        continue
+
+                    hint = retry_after_seconds(e)
+                    wait = min(hint, max_delay) if hint is not None else backoff_delay(attempt, delay, max_delay)
+                    if wait >= pipeline_deadline.remaining():
+                        logger.error(f"❌ {func.__name__} 剩餘時間不足以等待 {wait:.1f} 秒後重試")
+                        raise
+                    source = "依服務端建議" if hint is not None else "指數退避"
+                    logger.info(f"🔄 {source}等待 {wait:.1f} 秒後重試...")
+                    time.sleep(wait)
+            return None
+        return wrapper
+    return decorator
+
+
+def status_code(exc: BaseException) -> Optional[int]:
+    """OpenAI 的 status_code 或 google.api_core 的 code（HTTP 狀態碼）"""
+    for attr in ('status_code', 'code'):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int) and 100 <= value < 600:
+            return value
+    return None
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    parts = DURATION_PART.findall(value or '')
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
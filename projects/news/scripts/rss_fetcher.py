@@ -3,11 +3,17 @@ RSS Feed 讀取模組
 從多個來源讀取 RSS feeds
 """
 
+import os
+import asyncio
 import feedparser
+import httpx
 import logging
-from datetime import datetime
-from typing import List, Dict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+from feed_cache import FeedCache
+from feed_stream import DateWindow, parse_entries, stream_feed_entries
+from item_store import ItemStore
 
 logger = logging.getLogger(__name__)
 
@@ -22,88 +28,297 @@ RSS_SOURCES = {
     'ithome': 'https://www.ithome.com.tw/rss',
 }
 
+# 單一來源的下載逾時（秒）
+RSS_FETCH_TIMEOUT = int(os.getenv('RSS_FETCH_TIMEOUT', '30'))
 
-def fetch_single_feed(source_name: str, url: str) -> List[Dict]:
+# 同時進行的請求上限
+RSS_MAX_CONCURRENCY = int(os.getenv('RSS_MAX_CONCURRENCY', '16'))
+
+# 整個讀取階段的期限（秒）
+RSS_STAGE_DEADLINE = int(os.getenv('RSS_STAGE_DEADLINE', '90'))
+
+# 串流解析模式：只解析目標日期區間內的新聞（1 啟用）
+RSS_STREAMING = os.getenv('RSS_STREAMING', '0') == '1'
+
+USER_AGENT = f"ThinkerNews/1.0 feedparser/{feedparser.__version__}"
+
+
+def target_date_window(today_date: str) -> DateWindow:
     """
-    讀取單一 RSS feed
+    篩選器的目標日期區間（昨日 00:00 至今日 00:00，UTC）
+
+    Args:
+        today_date: 今日日期 (YYYY-MM-DD)
+
+    Returns:
+        日期區間 [start, end)
+    """
+    end = datetime.strptime(today_date, '%Y-%m-%d')
+    return end - timedelta(days=1), end
+
+
+def _window_key(window: Optional[DateWindow]) -> Optional[str]:
+    """日期區間在快取中的識別字串（None 代表完整解析）"""
+    if window is None:
+        return None
+    return f"{window[0].isoformat()}/{window[1].isoformat()}"
+
+
+def _load_cached(cache: Optional[FeedCache], source_name: str, url: str,
+                 window: Optional[DateWindow]) -> Optional[Dict]:
+    """讀取快取紀錄；解析模式不同且沒有原始內容可重新解析時視為無快取"""
+    if not cache:
+        return None
+    cached = cache.load(source_name, url)
+    if cached and cached.get('window') != _window_key(window) and cache.load_body(source_name) is None:
+        return None
+    return cached
+
+
+def _parse_body(source_name: str, body: bytes, response_headers: Dict,
+                window: Optional[DateWindow]) -> List[Dict]:
+    """解析 RSS 內容：有日期區間時串流解析，否則交給 feedparser 完整解析"""
+    if window is not None:
+        return stream_feed_entries(source_name, body, window, response_headers)
+
+    feed = feedparser.parse(body, response_headers=response_headers)
+
+    if feed.bozo:
+        logger.warning(f"  ⚠️  {source_name} RSS 格式有問題")
+
+    return parse_entries(source_name, feed)
+
+
+def _build_headers(cache: Optional[FeedCache], cached: Optional[Dict]) -> Dict[str, str]:
+    """組出請求標頭（含快取的條件式標頭）"""
+    headers = {'User-Agent': USER_AGENT}
+    if cache:
+        headers.update(cache.conditional_headers(cached))
+    return headers
+
+
+def _reuse_cached(source_name: str, url: str, cached: Dict, cache: FeedCache,
+                  window: Optional[DateWindow] = None) -> List[Dict]:
+    """304: 內容未變更，直接重用上次解析的新聞（日期區間不同時從快取的原始內容重新解析）"""
+    window_key = _window_key(window)
+    if cached.get('window') == window_key:
+        news_items = cached['entries']
+    else:
+        body = cache.load_body(source_name)
+        news_items = _parse_body(source_name, body, {}, window)
+        cache.store(
+            source_name, url,
+            etag=cached.get('etag'),
+            last_modified=cached.get('last_modified'),
+            body=body,
+            entries=news_items,
+            window=window_key
+        )
+    cache.record(source_name, 'hit', bytes_saved=cached.get('body_size', 0))
+    logger.info(f"  ♻️  {source_name}: 未變更，重用快取 {len(news_items)} 則")
+    return news_items
+
+
+def _parse_and_store(source_name: str, url: str, body: bytes, response_headers: Dict,
+                     cache: Optional[FeedCache], window: Optional[DateWindow] = None) -> List[Dict]:
+    """
+    解析下載的 RSS 內容並寫入快取
+
+    Args:
+        source_name: 來源名稱
+        url: RSS feed URL
+        body: 原始 RSS 內容
+        response_headers: HTTP 回應標頭
+        cache: Feed 快取（可選）
+        window: 目標日期區間（可選），提供時以串流模式解析
+
+    Returns:
+        新聞列表
+    """
+    response_headers = {key.lower(): value for key, value in response_headers.items()}
+    news_items = _parse_body(source_name, body, response_headers, window)
+
+    if cache:
+        cache.store(
+            source_name, url,
+            etag=response_headers.get('etag'),
+            last_modified=response_headers.get('last-modified'),
+            body=body,
+            entries=news_items,
+            window=_window_key(window)
+        )
+        cache.record(source_name, 'miss', bytes_downloaded=len(body))
+
+    logger.info(f"  ✅ {source_name}: 讀取 {len(news_items)} 則")
+    return news_items
+
+
+def fetch_single_feed(source_name: str, url: str, cache: Optional[FeedCache] = None,
+                      window: Optional[DateWindow] = None) -> List[Dict]:
+    """
+    讀取單一 RSS feed（同步版本，供單獨測試使用）
     
     Args:
         source_name: 來源名稱
         url: RSS feed URL
+        cache: Feed 快取（可選），提供時發送條件式請求
+        window: 目標日期區間（可選），提供時以串流模式解析
         
     Returns:
         新聞列表
     """
     try:
         logger.info(f"  📡 讀取 {source_name}...")
-        feed = feedparser.parse(url)
-        
-        if feed.bozo:
-            logger.warning(f"  ⚠️  {source_name} RSS 格式有問題")
-        
-        news_items = []
-        for entry in feed.entries:
-            try:
-                # 提取新聞資訊
-                item = {
-                    'title': entry.get('title', ''),
-                    'link': entry.get('link', ''),
-                    'content': entry.get('summary', entry.get('description', '')),
-                    'pubDate': entry.get('published', entry.get('updated', '')),
-                    'isoDate': entry.get('published_parsed', entry.get('updated_parsed', None)),
-                    'source': source_name
-                }
-                
-                # 轉換日期格式
-                if item['isoDate']:
-                    try:
-                        dt = datetime(*item['isoDate'][:6])
-                        item['isoDate'] = dt.isoformat()
-                    except:
-                        item['isoDate'] = ''
-                
-                news_items.append(item)
-                
-            except Exception as e:
-                logger.warning(f"  ⚠️  處理 {source_name} 的某則新聞時出錯: {str(e)}")
-                continue
-        
-        logger.info(f"  ✅ {source_name}: 讀取 {len(news_items)} 則")
-        return news_items
+
+        cached = _load_cached(cache, source_name, url, window)
+        response = requests.get(url, headers=_build_headers(cache, cached), timeout=RSS_FETCH_TIMEOUT)
+
+        if response.status_code == 304 and cached and cached.get('entries') is not None:
+            return _reuse_cached(source_name, url, cached, cache, window)
+
+        if response.status_code == 304:
+            # 快取紀錄遺失但伺服器回 304，改發無條件請求
+            response = requests.get(url, headers=_build_headers(None, None), timeout=RSS_FETCH_TIMEOUT)
+
+        response.raise_for_status()
+        return _parse_and_store(source_name, url, response.content, dict(response.headers), cache, window)
         
     except Exception as e:
         logger.error(f"  ❌ 讀取 {source_name} 失敗: {str(e)}")
+        if cache:
+            cache.record(source_name, 'error')
         return []
 
 
-def fetch_all_rss_feeds(today_date: str) -> List[Dict]:
+async def _download_feed(client: httpx.AsyncClient, source_name: str, url: str,
+                         cache: Optional[FeedCache], window: Optional[DateWindow]) -> List[Dict]:
+    """
+    非同步下載單一 RSS feed，解析交給執行緒池以免阻塞 event loop
+
+    Args:
+        client: 共用的 HTTP client（同 host 重用 keep-alive 連線）
+        source_name: 來源名稱
+        url: RSS feed URL
+        cache: Feed 快取（可選）
+        window: 目標日期區間（可選）
+
+    Returns:
+        新聞列表
+    """
+    logger.info(f"  📡 讀取 {source_name}...")
+
+    cached = _load_cached(cache, source_name, url, window)
+    response = await client.get(url, headers=_build_headers(cache, cached))
+
+    if response.status_code == 304 and cached and cached.get('entries') is not None:
+        return await asyncio.to_thread(_reuse_cached, source_name, url, cached, cache, window)
+
+    if response.status_code == 304:
+        # 快取紀錄遺失但伺服器回 304，改發無條件請求
+        response = await client.get(url, headers=_build_headers(None, None))
+
+    response.raise_for_status()
+    return await asyncio.to_thread(
+        _parse_and_store, source_name, url, response.content, dict(response.headers), cache, window
+    )
+
+
+async def _fetch_feed_limited(client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                              source_name: str, url: str, cache: Optional[FeedCache],
+                              timeout: float, window: Optional[DateWindow]) -> List[Dict]:
+    """在並行上限與單一來源逾時內讀取 RSS feed，失敗時回傳空列表"""
+    async with semaphore:
+        try:
+            return await asyncio.wait_for(_download_feed(client, source_name, url, cache, window), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"  ❌ 讀取 {source_name} 逾時（{timeout} 秒）")
+        except Exception as e:
+            logger.error(f"  ❌ 讀取 {source_name} 失敗: {str(e)}")
+
+    if cache:
+        cache.record(source_name, 'error')
+    return []
+
+
+async def fetch_feeds_async(sources: Dict[str, str],
+                            cache: Optional[FeedCache] = None,
+                            max_concurrency: int = None,
+                            source_timeout: float = None,
+                            stage_deadline: float = None,
+                            window: Optional[DateWindow] = None) -> List[Dict]:
+    """
+    以 asyncio 並行讀取多個 RSS feeds
+
+    Args:
+        sources: {來源名稱: URL}
+        cache: Feed 快取（可選）
+        max_concurrency: 同時進行的請求上限
+        source_timeout: 單一來源逾時（秒）
+        stage_deadline: 整個讀取階段的期限（秒），逾期未完成的來源直接放棄
+        window: 目標日期區間（可選），提供時以串流模式只解析區間內的新聞
+
+    Returns:
+        所有新聞的列表（依 sources 的順序）
+    """
+    max_concurrency = max_concurrency or RSS_MAX_CONCURRENCY
+    source_timeout = source_timeout or RSS_FETCH_TIMEOUT
+    stage_deadline = stage_deadline or RSS_STAGE_DEADLINE
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=source_timeout, follow_redirects=True) as client:
+        tasks = {
+            name: asyncio.create_task(
+                _fetch_feed_limited(client, semaphore, name, url, cache, source_timeout, window)
+            )
+            for name, url in sources.items()
+        }
+
+        done, pending = await asyncio.wait(tasks.values(), timeout=stage_deadline)
+
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        all_news = []
+        for name, task in tasks.items():
+            if task in done:
+                all_news.extend(task.result())
+            else:
+                logger.error(f"❌ {name} 超過讀取階段期限（{stage_deadline} 秒），已放棄")
+                if cache:
+                    cache.record(name, 'error')
+
+    return all_news
+
+
+def fetch_all_rss_feeds(today_date: str, cache: Optional[FeedCache] = None,
+                        store: Optional[ItemStore] = None,
+                        streaming: bool = None) -> List[Dict]:
     """
     並行讀取所有 RSS feeds
     
     Args:
-        today_date: 今日日期（用於日誌）
+        today_date: 今日日期（串流模式用來決定目標日期區間）
+        cache: Feed 快取（可選）
+        store: 新聞項目儲存（可選），讀取結果會寫入其中
+        streaming: 是否只串流解析昨日的新聞（預設依 RSS_STREAMING）
         
     Returns:
         所有新聞的列表
     """
-    all_news = []
-    
-    # 使用 ThreadPoolExecutor 並行讀取
-    with ThreadPoolExecutor(max_workers=7) as executor:
-        # 提交所有任務
-        future_to_source = {
-            executor.submit(fetch_single_feed, name, url): name
-            for name, url in RSS_SOURCES.items()
-        }
-        
-        # 收集結果
-        for future in as_completed(future_to_source):
-            source_name = future_to_source[future]
-            try:
-                news_items = future.result()
-                all_news.extend(news_items)
-            except Exception as e:
-                logger.error(f"❌ {source_name} 讀取任務失敗: {str(e)}")
+    if streaming is None:
+        streaming = RSS_STREAMING
+    window = target_date_window(today_date) if streaming else None
+
+    all_news = asyncio.run(fetch_feeds_async(RSS_SOURCES, cache=cache, window=window))
     
     logger.info(f"📊 總共讀取 {len(all_news)} 則新聞")
+
+    if store is not None:
+        ingest = store.upsert_items(all_news)
+        logger.info(f"🗄️  寫入項目儲存: 新增 {ingest['new']} 則，更新 {ingest['updated']} 則")
+
     return all_news
@@ -0,0 +1,268 @@
+"""
+每日頁面的來源資料
+每天的頁面內容（科技導讀人、總編輯的輸出）保存在 archive/<日期>.json，
+與頁面一起提交，模板修改後可由 rebuild_site.py 以本地轉換器重建所有歷史頁面
+
+- archive/<日期>.json 與 latest.json 格式相同（date、notion_content、line_content、learning_focus…）
+- 還沒有 archive 檔的日期，從 .cache/runs 的檢查點（narrator / editor）與 latest.json 補回
+- archive_manifest.json 記錄每一期的日期與標題，首頁與每月的歷史日報頁由它產生，
+  每天只需加入一筆、重寫首頁與當月（及相鄰月份）的頁面
+"""
+
+import os
+import re
+import json
+import html
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from checkpoint import RUNS_DIR
+from md_renderer import page_subtitle, DEFAULT_SUBTITLE
+
+logger = logging.getLogger(__name__)
+
+# 每日頁面來源資料的目錄（相對於網站目錄）
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', 'archive')
+
+# 每期標題與日期的清單（相對於網站目錄）
+ARCHIVE_MANIFEST = os.getenv('ARCHIVE_MANIFEST', 'archive_manifest.json')
+
+DATED_PAGE = re.compile(r'^(\d{4}-\d{2}-\d{2})\.html$')
+
+SITE_URL = 'https://thinkercafe-tw.github.io/thinker-news'
+
+# 舊頁面的 meta description 為「副標題 - 今日AI科技重點新聞精選」
+_PAGE_DESCRIPTION = re.compile(r'<meta name="description" content="([^"]*?)(?: - 今日AI科技重點新聞精選)?"')
+
+
+def dated_pages(site_dir: Path) -> List[str]:
+    """網站目錄中所有 <日期>.html 的日期（依日期排序）"""
+    return sorted(
+        match.group(1) for match in (DATED_PAGE.match(path.name) for path in site_dir.iterdir()) if match
+    )
+
+
+def to_final_output(news_json: Dict) -> Dict:
+    """latest.json / archive 格式 → html_generator 使用的 final_output"""
+    date = news_json['date']
+    return {
+        'final_date': date,
+        'notion_content': news_json.get('notion_content', ''),
+        'line_content': news_json.get('line_content', ''),
+        'learning_focus': news_json.get('learning_focus', ''),
+        'website_url': news_json.get('website_url') or f"{SITE_URL}/{date}.html",
+        'news_json': news_json
+    }
+
+
+def save_page_source(news_json: Dict, site_dir: Path = Path('.')) -> Path:
+    """
+    保存當天頁面的來源資料
+
+    Args:
+        news_json: main.py 組裝的 news_json（與 latest.json 相同）
+        site_dir: 網站目錄
+
+    Returns:
+        archive 檔路徑
+    """
+    archive_dir = site_dir / ARCHIVE_DIR
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"{news_json['date']}.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(news_json, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def _checkpoint_sources(runs_dir: Path) -> Dict[str, Dict]:
+    """從各次執行的檢查點組出 news_json（同一天多次執行時取最後一次）"""
+    sources = {}
+    if not runs_dir.exists():
+        return sources
+    for run_dir in sorted(path for path in runs_dir.iterdir() if path.is_dir()):
+        try:
+            with open(run_dir / 'manifest.json', 'r', encoding='utf-8') as f:
+                date = json.load(f)['date']
+            with open(run_dir / 'narrator.json', 'r', encoding='utf-8') as f:
+                narrator = json.load(f)['output']
+            with open(run_dir / 'editor.json', 'r', encoding='utf-8') as f:
+                editor = json.load(f)['output']
+        except (OSError, KeyError, ValueError):
+            continue
+        sources[date] = {
+            'date': date,
+            'line_content': editor.get('line_message_text', ''),
+            'notion_content': narrator.get('notion_daily_report_text', ''),
+            'learning_focus': editor.get('learning_focus_text', ''),
+            'website_url': f"{SITE_URL}/{date}.html"
+        }
+    return sources
+
+
+def load_page_sources(site_dir: Path = Path('.'), runs_dir: Optional[Path] = None) -> Dict[str, Dict]:
+    """
+    讀取所有日期的頁面來源資料
+
+    優先順序：archive/<日期>.json > latest.json > 執行檢查點
+
+    Args:
+        site_dir: 網站目錄
+        runs_dir: 執行檢查點目錄（預設為 RUNS_DIR，相對於網站目錄）
+
+    Returns:
+        {日期: news_json}，每筆另加 'origin'（archive / latest / checkpoint）
+    """
+    sources = {
+        date: {**news_json, 'origin': 'checkpoint'}
+        for date, news_json in _checkpoint_sources(runs_dir or site_dir / RUNS_DIR).items()
+    }
+
+    latest_path = site_dir / 'latest.json'
+    if latest_path.exists():
+        try:
+            with open(latest_path, 'r', encoding='utf-8') as f:
+                latest = json.load(f)
+            sources[latest['date']] = {**latest, 'origin': 'latest'}
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"⚠️  latest.json 無法讀取: {str(e)}")
+
+    archive_dir = site_dir / ARCHIVE_DIR
+    for path in sorted(archive_dir.glob('*.json')) if archive_dir.exists() else []:
+        if not DATED_PAGE.match(f"{path.stem}.html"):
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                sources[path.stem] = {**json.load(f), 'date': path.stem, 'origin': 'archive'}
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  {path} 無法讀取: {str(e)}")
+
+    return sources
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 hex"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    內容與現有檔案不同時才寫入（先寫暫存檔再替換，避免留下寫一半的頁面）
+
+    Args:
+        path: 檔案路徑
+        content: 文字內容
+
+    Returns:
+        是否寫入
+    """
+    data = content.encode('utf-8')
+    try:
+        if content_hash(path.read_bytes()) == content_hash(data):
+            return False
+    except FileNotFoundError:
+        pass
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+# ============================================
+# archive_manifest.json
+# ============================================
+
+def issue_entry(news_json: Dict) -> Dict:
+    """一期日報在 manifest 中的紀錄（標題與頁面副標題相同：LINE 快訊的第一行）"""
+    return {'date': news_json['date'], 'title': page_subtitle(news_json.get('line_content', ''))}
+
+
+def load_manifest(site_dir: Path = Path('.')) -> Dict:
+    """
+    讀取 archive_manifest.json
+
+    Returns:
+        {'issues': [{'date', 'title'}]}（依日期由新到舊）；檔案不存在時為空清單
+    """
+    path = site_dir / ARCHIVE_MANIFEST
+    if not path.exists():
+        return {'issues': []}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: Dict, site_dir: Path = Path('.')):
+    """依日期由新到舊寫回 archive_manifest.json"""
+    manifest['issues'] = sorted(manifest['issues'], key=lambda issue: issue['date'], reverse=True)
+    write_if_changed(site_dir / ARCHIVE_MANIFEST, json.dumps(manifest, ensure_ascii=False, indent=2) + '\n')
+
+
+def record_issue(entry: Dict, site_dir: Path = Path('.')) -> Dict:
+    """
+    加入（或更新同一天的）一期日報並保存
+
+    Args:
+        entry: issue_entry 的結果
+        site_dir: 網站目錄
+
+    Returns:
+        更新後的 manifest
+    """
+    manifest = load_manifest(site_dir)
+    manifest['issues'] = [issue for issue in manifest['issues'] if issue['date'] != entry['date']] + [entry]
+    save_manifest(manifest, site_dir)
+    return manifest
+
+
+def backfill_manifest(site_dir: Path = Path('.'), save: bool = True) -> Dict:
+    """
+    把 manifest 中還沒有的日期頁面補進去（標題取自頁面來源資料，沒有時取自頁面的 meta description）
+
+    Args:
+        site_dir: 網站目錄
+        save: 是否寫回 archive_manifest.json（dry-run 時為 False）
+
+    Returns:
+        更新後的 manifest
+    """
+    manifest = load_manifest(site_dir)
+    known = {issue['date'] for issue in manifest['issues']}
+    sources = load_page_sources(site_dir)
+    added = 0
+    for date in dated_pages(site_dir):
+        if date in known:
+            continue
+        if date in sources:
+            entry = issue_entry(sources[date])
+        else:
+            head = (site_dir / f"{date}.html").read_text(encoding='utf-8', errors='replace')[:8192]
+            match = _PAGE_DESCRIPTION.search(head)
+            entry = {'date': date, 'title': html.unescape(match.group(1)) if match else DEFAULT_SUBTITLE}
+        manifest['issues'].append(entry)
+        added += 1
+    if added and save:
+        save_manifest(manifest, site_dir)
+        logger.info(f"📒 archive_manifest.json 補入 {added} 期")
+    return manifest
+
+
+def month_of(date: str) -> str:
+    """YYYY-MM-DD → YYYY-MM"""
+    return date[:7]
+
+
+def group_by_month(issues: Iterable[Dict]) -> List[Dict]:
+    """
+    依月份分組（由新到舊）
+
+    Returns:
+        [{'month': 'YYYY-MM', 'label': 'YYYY年M月', 'count', 'issues'}]
+    """
+    months: Dict[str, List[Dict]] = {}
+    for issue in sorted(issues, key=lambda issue: issue['date'], reverse=True):
+        months.setdefault(month_of(issue['date']), []).append(issue)
+    return [
+        {'month': month, 'label': f"{month[:4]}年{int(month[5:7])}月", 'count': len(items), 'issues': items}
+        for month, items in months.items()
+    ]
@@ -0,0 +1,199 @@
+"""
+HTML 模板套件
+模板以檔案保存在本目錄，由程序共用的 Jinja2 Environment 載入：
+
+- 每個模板在同一程序中只讀取、編譯一次（auto_reload 關閉，不再檢查檔案時間）
+- 編譯後的 bytecode 寫入 TEMPLATE_BYTECODE_CACHE（.cache 由 GitHub Actions 保留），
+  下次執行不必重新解析模板；模板內容改變時 Jinja2 以 checksum 判斷並重新編譯
+- render_many 以同一個已編譯的模板連續渲染多頁（重建歷史頁面用）
+- 各頁共用的 CSS / JS 放在 assets/，發佈到網站的 ASSETS_DIR/<名稱>.<內容 hash>.<副檔名>；
+  模板以 {{ asset('daily.css') }} 引用，內容改變時檔名跟著改變，瀏覽器與 CDN 可以永久快取
+"""
+
+import os
+import re
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+from site_archive import content_hash, write_if_changed
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).resolve().parent
+ASSET_SOURCES_DIR = TEMPLATES_DIR / 'assets'
+
+# 編譯後模板的 bytecode 快取目錄（空字串 = 不使用磁碟快取）
+TEMPLATE_BYTECODE_CACHE = os.getenv('TEMPLATE_BYTECODE_CACHE', '.cache/jinja2')
+
+DAILY_NEWS_TEMPLATE = 'daily_news.html'
+INDEX_TEMPLATE = 'index.html'
+ARCHIVE_MONTH_TEMPLATE = 'archive_month.html'
+
+# 網站中存放指紋化 CSS / JS 的目錄（相對於網站目錄）
+ASSETS_DIR = os.getenv('ASSETS_DIR', 'assets')
+
+# 頁面引用的本地 CSS / JS（page_weight 用）
+_LOCAL_RESOURCE = re.compile(r'<(?:link rel="stylesheet" href|script src)="(?!https?:|//)([^"]+)"')
+
+_environment: Optional[Environment] = None
+_asset_paths: Dict[str, str] = {}
+
+
+def _bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    """建立磁碟 bytecode 快取（目錄無法建立時只使用記憶體中的模板快取）"""
+    if not TEMPLATE_BYTECODE_CACHE:
+        return None
+    try:
+        directory = Path(TEMPLATE_BYTECODE_CACHE)
+        directory.mkdir(parents=True, exist_ok=True)
+        return FileSystemBytecodeCache(str(directory))
+    except OSError as e:
+        logger.warning(f"⚠️  模板 bytecode 快取目錄無法使用，改為只在記憶體中快取: {str(e)}")
+        return None
+
+
+def environment() -> Environment:
+    """
+    程序共用的 Jinja2 Environment（第一次呼叫時建立）
+
+    不自動跳脫（內容已是轉換好的 HTML，文字欄位在模板中以 | e 跳脫）、去除結尾的一個換行；
+    {% %} 區塊標籤所在的行不輸出
+
+    Returns:
+        Jinja2 Environment
+    """
+    global _environment
+    if _environment is None:
+        _environment = Environment(
+            loader=FileSystemLoader(str(TEMPLATES_DIR), encoding='utf-8'),
+            bytecode_cache=_bytecode_cache(),
+            auto_reload=False,
+            autoescape=False,
+            trim_blocks=True,
+            lstrip_blocks=True,
+        )
+        _environment.globals['asset'] = asset
+    return _environment
+
+
+def asset(name: str) -> str:
+    """
+    共用 CSS / JS 在網站中的路徑（以內容 hash 命名；同一程序中每個檔案只計算一次）
+
+    Args:
+        name: assets/ 中的檔名（例如 'daily.css'）
+
+    Returns:
+        '<ASSETS_DIR>/<名稱>.<hash>.<副檔名>'
+    """
+    if name not in _asset_paths:
+        stem, ext = os.path.splitext(name)
+        digest = content_hash((ASSET_SOURCES_DIR / name).read_bytes())[:10]
+        _asset_paths[name] = f"{ASSETS_DIR}/{stem}.{digest}{ext}"
+    return _asset_paths[name]
+
+
+def publish_assets(site_dir: Path = Path('.')) -> List[str]:
+    """
+    把共用 CSS / JS 以指紋化的檔名寫入網站目錄
+
+    已存在的檔案不重寫；舊版本保留（仍被快取的舊頁面可能引用）
+
+    Args:
+        site_dir: 網站目錄
+
+    Returns:
+        新寫入的檔案路徑
+    """
+    (site_dir / ASSETS_DIR).mkdir(parents=True, exist_ok=True)
+    written = []
+    for source in sorted(ASSET_SOURCES_DIR.iterdir()):
+        if source.suffix not in ('.css', '.js'):
+            continue
+        path = site_dir / asset(source.name)
+        if write_if_changed(path, source.read_text(encoding='utf-8')):
+            written.append(str(path))
+    if written:
+        logger.info(f"🎨 已發佈共用 CSS / JS: {', '.join(written)}")
+    return written
+
+
+def page_weight(html: str, page_dir: Path = Path('.')) -> Dict[str, int]:
+    """
+    一次頁面瀏覽需要下載的位元組數
+
+    Args:
+        html: 頁面 HTML
+        page_dir: 頁面所在目錄（解析相對路徑的本地 CSS / JS）
+
+    Returns:
+        {'html': HTML 位元組,
+         'assets': 引用的本地 CSS / JS 位元組,
+         'first_view': 第一次瀏覽（HTML + 全部 CSS / JS）,
+         'repeat_view': 再次瀏覽（指紋化的檔案已在快取中，只計 HTML 與未指紋化的檔案）}
+    """
+    html_bytes = len(html.encode('utf-8'))
+    sources = {path: name for name, path in _asset_paths.items()}
+    assets = uncached = 0
+    for reference in _LOCAL_RESOURCE.findall(html):
+        path = page_dir / reference.split('?')[0]
+        published = reference.lstrip('./')
+        if not path.is_file() and published in sources:
+            # 尚未發佈（dry-run、基準測試）時以來源檔計算
+            path = ASSET_SOURCES_DIR / sources[published]
+        size = path.stat().st_size if path.is_file() else 0
+        assets += size
+        if not published.startswith(f"{ASSETS_DIR}/"):
+            uncached += size
+    return {
+        'html': html_bytes,
+        'assets': assets,
+        'first_view': html_bytes + assets,
+        'repeat_view': html_bytes + uncached
+    }
+
+
+def get_template(name: str) -> Template:
+    """
+    取得已編譯的模板
+
+    Args:
+        name: 模板檔名（例如 DAILY_NEWS_TEMPLATE）
+
+    Returns:
+        Jinja2 Template
+    """
+    return environment().get_template(name)
+
+
+def render(name: str, **context) -> str:
+    """
+    渲染單一頁面
+
+    Args:
+        name: 模板檔名
+        **context: 模板變數
+
+    Returns:
+        HTML
+    """
+    return get_template(name).render(**context)
+
+
+def render_many(name: str, contexts: Iterable[Dict]) -> Iterator[str]:
+    """
+    以同一個模板依序渲染多個頁面（逐頁產生，不會一次把所有頁面留在記憶體）
+
+    Args:
+        name: 模板檔名
+        contexts: 每頁的模板變數
+
+    Yields:
+        每頁的 HTML（與 contexts 順序相同）
+    """
+    template = get_template(name)
+    for context in contexts:
+        yield template.render(**context)
@@ -6,7 +6,7 @@ import json
 import logging
 import re
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, Tuple
 from json_repair import repair_json
 
 logger = logging.getLogger(__name__)
@@ -43,6 +43,20 @@ def validate_json_output(raw_output: str, agent_name: str) -> Dict:
     Returns:
         解析後的 JSON 對象
     """
+    return parse_json_output(raw_output, agent_name)[0]
+
+
+def parse_json_output(raw_output: str, agent_name: str) -> Tuple[Dict, bool]:
+    """
+    同 validate_json_output，另外回傳是否經過 json-repair 修復（統計修復率用）
+
+    Args:
+        raw_output: AI 的原始輸出
+        agent_name: Agent 名稱（用於日誌）
+
+    Returns:
+        (解析後的 JSON 對象, 是否經過修復)
+    """
     logger.info(f"🔧 驗證 {agent_name} 的輸出...")
 
     try:
@@ -63,7 +77,7 @@ def validate_json_output(raw_output: str, agent_name: str) -> Dict:
         try:
             parsed_json = json.loads(json_string)
             logger.info(f"✅ {agent_name} 輸出驗證成功（直接解析）")
-            return parsed_json
+            return parsed_json, False
         except json.JSONDecodeError as e:
             logger.warning(f"⚠️  {agent_name} JSON 直接解析失敗: {str(e)}")
             logger.info(f"🔧 嘗試使用 json-repair 修復...")
@@ -73,7 +87,7 @@ def validate_json_output(raw_output: str, agent_name: str) -> Dict:
                 repaired_string = repair_json(json_string)
                 parsed_json = json.loads(repaired_string)
                 logger.info(f"✅ {agent_name} 輸出驗證成功（使用修復）")
-                return parsed_json
+                return parsed_json, True
             except Exception as repair_error:
                 logger.error(f"❌ {agent_name} JSON 修復也失敗: {str(repair_error)}")
                 logger.error(f"原始輸出前 500 字: {raw_output[:500]}...")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+串流 JSON 驗證的測試
+IncrementalJSONValidator 會在生成途中拋出 MalformedJSONError 中止請求，
+這裡確認它只擋下真正無法修復的輸出，且結果與分段方式無關
+
+執行：python test_json_stream.py 或 pytest test_json_stream.py
+"""
+
+import sys
+import os
+import json
+from typing import List
+
+# 添加 scripts 目錄到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scripts'))
+
+from json_stream import IncrementalJSONValidator, MalformedJSONError, MAX_PREAMBLE_CHARS
+
+# 字串中含括號、跳脫的引號與反斜線
+TRICKY_OBJECT = json.dumps({
+    'title': '括號 { [ 與 } ] 都在字串裡',
+    'quote': 'He said "}" and \\"]\\"',
+    'path': 'C:\\new\\]',
+    'items': [{'a': '"{'}, ['}', ']'], {}]
+}, ensure_ascii=False)
+
+FENCED = f"```json\n{TRICKY_OBJECT}\n```\n以上是今天的整理。"
+
+
+def chunked(text: str, size: int) -> List[str]:
+    return [text[index:index + size] for index in range(0, len(text), size)]
+
+
+def feed_all(text: str, size: int) -> IncrementalJSONValidator:
+    validator = IncrementalJSONValidator()
+    for chunk in chunked(text, size):
+        validator.feed(chunk)
+    return validator
+
+
+def raises_malformed(text: str, size: int = 7) -> bool:
+    try:
+        feed_all(text, size)
+    except MalformedJSONError:
+        return True
+    return False
+
+
+def test_fenced_object_completes():
+    validator = feed_all(FENCED, len(FENCED))
+    assert validator.complete
+    assert validator.depth == 0
+    # end 是最外層 } 的位置（從 1 起算），截到 end 就是完整的物件
+    start = FENCED.index('{')
+    assert json.loads(FENCED[start:validator.end]) == json.loads(TRICKY_OBJECT)
+
+
+def test_complete_reported_once_outer_object_closes():
+    validator = IncrementalJSONValidator()
+    closing = FENCED.index(TRICKY_OBJECT) + len(TRICKY_OBJECT)
+    assert validator.feed(FENCED[:closing - 1]) is False
+    assert not validator.complete and validator.end is None
+    assert validator.depth == 1
+    assert validator.feed(FENCED[closing - 1]) is True
+    assert validator.end == closing
+    # 結束後的內容（結尾標記、甚至不成對的括號）不再檢查，end 也不變
+    assert validator.feed("\n```\n]]}}") is True
+    assert validator.end == closing
+
+
+def test_every_chunk_size_gives_same_result():
+    # 分段邊界落在跳脫序列（\\ 與 \"）的中間也不影響結果
+    expected_end = feed_all(FENCED, len(FENCED)).end
+    for size in range(1, 40):
+        validator = feed_all(FENCED, size)
+        assert validator.complete, size
+        assert validator.end == expected_end, size
+
+
+def test_escape_split_across_chunks():
+    text = '{"a": "x\\', '"}', '"}'
+    validator = IncrementalJSONValidator()
+    assert validator.feed(text[0]) is False
+    assert validator.escaped
+    # \" 是跳脫的引號，字串尚未結束，後面的 } 還在字串裡
+    assert validator.feed(text[1]) is False
+    assert validator.in_string
+    assert validator.feed(text[2]) is True
+
+
+def test_mismatched_bracket_raises():
+    assert raises_malformed('{"items": [1, 2}')
+    assert raises_malformed('```json\n{"a": {"b": 1]}')
+    # 物件已結束，之後的 ] 不檢查
+    assert not raises_malformed('{"a": 1}]', size=1)
+    try:
+        IncrementalJSONValidator().feed('{"items": [1, 2}')
+    except MalformedJSONError as e:
+        assert '預期 ]' in str(e) and '收到 }' in str(e)
+    else:
+        raise AssertionError("應該拋出 MalformedJSONError")
+
+
+def test_brackets_inside_strings_are_ignored():
+    for size in (1, 3, len(TRICKY_OBJECT)):
+        assert not raises_malformed(TRICKY_OBJECT, size)
+
+
+def test_preamble_limit():
+    # 空白不計入前言
+    assert not raises_malformed(' \n' * 500 + '{}')
+    assert not raises_malformed('x' * MAX_PREAMBLE_CHARS + '{}')
+    assert raises_malformed('x' * (MAX_PREAMBLE_CHARS + 1) + '{}')
+    # 前言中的 [ 或 } 不算 JSON 開始，也不會被當成括號不成對
+    assert not raises_malformed('] 以下是結果 [' + '{"a": 1}')
+
+    validator = IncrementalJSONValidator(max_preamble=3)
+    validator.feed('abc')
+    try:
+        validator.feed('d')
+    except MalformedJSONError:
+        pass
+    else:
+        raise AssertionError("超過前言上限應該拋出 MalformedJSONError")
+
+
+def test_truncated_output_is_not_rejected():
+    # 被截斷的輸出交給 json-repair，串流檢查不擋
+    validator = feed_all(TRICKY_OBJECT[:-5], 4)
+    assert not validator.complete
+    assert validator.depth > 0
+
+
+if __name__ == "__main__":
+    test_fenced_object_completes()
+    test_complete_reported_once_outer_object_closes()
+    test_every_chunk_size_gives_same_result()
+    test_escape_split_across_chunks()
+    test_mismatched_bracket_raises()
+    test_brackets_inside_strings_are_ignored()
+    test_preamble_limit()
+    test_truncated_output_is_not_rejected()
+    print("✅ 串流 JSON 驗證測試通過")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+本地 Markdown 轉換器的 golden file 測試
+以過去由 Gemini 生成的頁面為標準，比對本地轉換器輸出的內容結構
+
+比對方式：從兩份 HTML 抽出內容區塊的 (標籤, 文字) 序列
+- 日報內容區塊必須完全一致
+- LINE 精華版：Gemini 版本的每個區塊都必須依序出現在本地版本中
+  （Gemini 偶爾會漏掉 LINE 快訊的句子，本地版本不會）
+
+執行：python test_md_renderer.py 或 pytest test_md_renderer.py
+"""
+
+import sys
+import os
+import json
+from html.parser import HTMLParser
+
+# 添加 scripts 目錄到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scripts'))
+
+from html_generator import render_daily_html
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (輸入 fixture, Gemini 生成的頁面；保存在 test_fixtures，重建網站時不會被覆蓋)
+GOLDEN_CASES = [
+    ('test_fixtures/2026-02-02.json', 'test_fixtures/2026-02-02.golden.html'),
+]
+
+BLOCK_TAGS = {'h2', 'h3', 'p', 'li'}
+
+
+class ContentBlocks(HTMLParser):
+    """收集各個 content-section 內的 (標籤, 文字) 區塊"""
+
+    def __init__(self):
+        super().__init__()
+        self.sections = []
+        self._section_depth = 0
+        self._div_depth = 0
+        self._block = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'div':
+            self._div_depth += 1
+            if 'content-section' in (attrs.get('class') or '').split() and not self._section_depth:
+                self._section_depth = self._div_depth
+                self.sections.append([])
+            elif 'highlight-box' in (attrs.get('class') or '').split() and self._section_depth:
+                self._block = ['highlight', []]
+        elif tag in BLOCK_TAGS and self._section_depth and self._block is None:
+            self._block = [tag, []]
+        elif tag == 'a' and self._block is not None:
+            self._block[1].append(f"[{attrs.get('href', '')}]")
+
+    def handle_endtag(self, tag):
+        if tag == 'div':
+            if self._block and self._block[0] == 'highlight':
+                self._close_block()
+            if self._div_depth == self._section_depth:
+                self._section_depth = 0
+            self._div_depth -= 1
+        elif self._block and tag == self._block[0]:
+            self._close_block()
+
+    def handle_data(self, data):
+        if self._block is not None:
+            self._block[1].append(data)
+
+    def _close_block(self):
+        tag, parts = self._block
+        text = ' '.join(''.join(parts).split())
+        if text:
+            self.sections[-1].append((tag, text))
+        self._block = None
+
+
+def extract_sections(html):
+    parser = ContentBlocks()
+    parser.feed(html)
+    return parser.sections
+
+
+def is_ordered_subsequence(expected, actual):
+    remaining = iter(actual)
+    return all(block in remaining for block in expected)
+
+
+def render_fixture(fixture_path):
+    with open(os.path.join(BASE_DIR, fixture_path), 'r', encoding='utf-8') as f:
+        fixture = json.load(f)
+    return render_daily_html({
+        'final_date': fixture['date'],
+        'notion_content': fixture['notion_content'],
+        'line_content': fixture['line_content'],
+        'learning_focus': fixture['learning_focus']
+    })
+
+
+def test_golden_pages():
+    for fixture_path, golden_path in GOLDEN_CASES:
+        with open(os.path.join(BASE_DIR, golden_path), 'r', encoding='utf-8') as f:
+            golden_notion, golden_line = extract_sections(f.read())
+        rendered_notion, rendered_line = extract_sections(render_fixture(fixture_path))
+
+        assert rendered_notion == golden_notion, f"{golden_path}: 日報內容區塊不一致"
+        assert is_ordered_subsequence(golden_line, rendered_line), f"{golden_path}: LINE 精華版缺少區塊"
+
+
+def test_rendering_is_deterministic():
+    for fixture_path, _ in GOLDEN_CASES:
+        assert render_fixture(fixture_path) == render_fixture(fixture_path)
+
+
+if __name__ == "__main__":
+    test_golden_pages()
+    test_rendering_is_deterministic()
+    print("✅ 本地 Markdown 轉換器與 golden file 一致")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+模擬 LLM 伺服器測試
+以真正的 OpenAI / Gemini SDK 連到 scripts/mock_llm_server.py，確認協定相容：
+串流、429 + Retry-After、數據煉金術師的預設回應
+
+執行：python test_mock_llm_server.py 或 pytest test_mock_llm_server.py
+"""
+
+import sys
+import os
+import json
+
+# 添加 scripts 目錄到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scripts'))
+
+import openai
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+from mock_llm_server import MockLLMServer, MockLLMConfig
+from retry_policy import retry_after_seconds
+
+
+def start_server(**config) -> MockLLMServer:
+    return MockLLMServer(MockLLMConfig(seed=1, **config)).start()
+
+
+def test_openai_streaming():
+    server = start_server(chunk_chars=5)
+    try:
+        client = openai.OpenAI(api_key='mock', base_url=f"{server.url}/v1", max_retries=0)
+        stream = client.chat.completions.create(
+            model='mock-model',
+            messages=[{'role': 'user', 'content': 'hi'}],
+            stream=True,
+            stream_options={'include_usage': True}
+        )
+        deltas = []
+        usage = None
+        for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if chunk.choices and chunk.choices[0].delta.content:
+                deltas.append(chunk.choices[0].delta.content)
+        assert len(deltas) > 1
+        assert json.loads(''.join(deltas)) == {'ok': True}
+        assert usage is not None and usage.completion_tokens > 0
+    finally:
+        server.stop()
+
+
+def test_openai_rate_limit_has_retry_after():
+    server = start_server(fail_first=1, retry_after=2)
+    try:
+        client = openai.OpenAI(api_key='mock', base_url=f"{server.url}/v1", max_retries=0)
+        messages = [{'role': 'user', 'content': 'hi'}]
+        try:
+            client.chat.completions.create(model='mock-model', messages=messages)
+            raise AssertionError("應該回傳 429")
+        except openai.RateLimitError as e:
+            assert retry_after_seconds(e) == 2
+        assert client.chat.completions.create(model='mock-model', messages=messages).choices[0].message.content
+    finally:
+        server.stop()
+
+
+def test_gemini_rest_generate_and_stream():
+    server = start_server(fail_first=1, retry_after=3, chunk_chars=50)
+    try:
+        genai.configure(api_key='mock', transport='rest', client_options={'api_endpoint': server.url})
+        model = genai.GenerativeModel('gemini-mock', system_instruction="# 數據煉金術師 (Data Alchemist)")
+        prompt = '新聞標題\n["A", "B"]\n\n超鏈結\n["https://a", "https://b"]\n\n今日日期\n2026-02-02'
+
+        try:
+            model.generate_content(prompt)
+            raise AssertionError("應該回傳 429")
+        except google_exceptions.GoogleAPICallError as e:
+            # REST 傳輸對應為 TooManyRequests（gRPC 為 ResourceExhausted），兩者 code 都是 429
+            assert e.code == 429
+            assert retry_after_seconds(e) == 3
+
+        output = json.loads(model.generate_content(prompt).text)
+        assert [item['link'] for items in output.values() for item in items] == ['https://a', 'https://b']
+
+        chunks = [chunk.text for chunk in model.generate_content(prompt, stream=True)]
+        assert len(chunks) > 1
+        assert json.loads(''.join(chunks)) == output
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    test_openai_streaming()
+    test_openai_rate_limit_has_retry_after()
+    test_gemini_rest_generate_and_stream()
+    print("✅ 模擬 LLM 伺服器與 OpenAI / Gemini SDK 相容")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+篩選使用新聞項目儲存時的一致性測試
+filter_and_score_news(all_news, store=...) 以儲存的日期索引檢查日期，
+入選的新聞必須與不使用儲存時完全相同：
+
+- 儲存中較早讀取、已不在這次 feed 的項目（輪出 feed、來源讀取失敗、已移除的來源）不會入選
+- 同分時依這次讀取的 feed 順序入選（feed 順序打亂後仍相同）
+- 沒有日期的項目照常納入，日期無法解析或不是昨日的項目照常排除
+
+執行：python test_news_filter_store.py 或 pytest test_news_filter_store.py
+"""
+
+import sys
+import os
+import random
+import tempfile
+from typing import Dict, List
+
+# 添加 scripts 目錄到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scripts'))
+
+from item_store import ItemStore
+from news_filter import FILTERS, filter_and_score_news
+
+SEED = 20260202
+TARGET_DATE = '2026-02-02'
+
+# 昨日（2026-02-01）以各種時區格式表示，以及不是昨日、沒有日期與無法解析的日期
+YESTERDAY_DATES = ['2026-02-01T00:00:00+08:00', '2026-02-01T10:30:00Z', '2026-02-01T23:59:59-08:00',
+                   '2026-02-01T12:00:00']
+OTHER_DATES = ['2026-02-02T01:00:00Z', '2026-01-31T23:59:59Z', '2026-01-31T20:00:00-08:00', '', 'not a date']
+
+# 少量關鍵字讓大量新聞同分
+KEYWORDS = ['AI', '台灣', '開源', 'OpenAI', 'startup', '教學', 'GPU', '股價']
+
+
+def make_item(rng: random.Random, source: str, index: int, iso_date: str, title: str = '') -> Dict:
+    return {
+        'title': title or ' '.join(rng.sample(KEYWORDS, rng.randint(1, 3))),
+        'link': f"https://example.com/{source}/{index}",
+        'content': ' '.join(rng.choice(KEYWORDS) for _ in range(rng.randint(0, 5))),
+        'pubDate': iso_date,
+        'isoDate': iso_date,
+        'source': source
+    }
+
+
+def build_feeds(seed: int = SEED):
+    """
+    產生較早一次讀取（只寫入儲存）與這次讀取的新聞
+
+    Returns:
+        (較早讀取的新聞, 這次讀取的新聞, 只存在於較早讀取的連結)
+    """
+    rng = random.Random(seed)
+    sources = list(FILTERS['sources'])
+    failed_source = sources[-1]
+
+    earlier = []
+    current = []
+    for source in sources:
+        for index in range(40):
+            iso_date = rng.choice(YESTERDAY_DATES * 2 + OTHER_DATES)
+            item = make_item(rng, source, index, iso_date)
+            if index < 10:
+                # 輪出 feed 的舊項目：標題含必留關鍵字（100 分），若被納入一定會入選
+                earlier.append(make_item(rng, source, index, rng.choice(YESTERDAY_DATES), 'TSMC 先進製程'))
+            elif source == failed_source:
+                # 這次讀取失敗的來源
+                earlier.append(make_item(rng, source, index, rng.choice(YESTERDAY_DATES), 'TSMC 先進製程'))
+            else:
+                earlier.append(item)
+                current.append(item)
+    # 已從 RSS_SOURCES 移除的來源
+    earlier.extend(
+        make_item(rng, 'retired', index, rng.choice(YESTERDAY_DATES), 'TSMC 先進製程') for index in range(5)
+    )
+    # 上次讀取時日期不同、這次更新為昨日的項目
+    moved = make_item(rng, sources[0], 999, '2026-01-30T08:00:00Z', 'AI 教學')
+    earlier.append(moved)
+    current.append({**moved, 'isoDate': YESTERDAY_DATES[0], 'pubDate': YESTERDAY_DATES[0]})
+
+    current_links = {item['link'] for item in current}
+    stale_links = {item['link'] for item in earlier} - current_links
+    return earlier, current, stale_links
+
+
+def filter_with_store(earlier: List[Dict], current: List[Dict]) -> List[Dict]:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with ItemStore(os.path.join(tmp_dir, 'items.db')) as store:
+            store.upsert_items(earlier)
+            store.upsert_items(current)
+            return filter_and_score_news(current, TARGET_DATE, store=store)
+
+
+def links(items: List[Dict]) -> List[str]:
+    return [item['link'] for item in items]
+
+
+def test_store_filter_matches_plain_filter():
+    earlier, current, stale_links = build_feeds()
+    expected = filter_and_score_news(current, TARGET_DATE)
+    result = filter_with_store(earlier, current)
+
+    assert expected, "測試資料應該有新聞入選"
+    assert links(result) == links(expected)
+    assert result == expected
+    assert not stale_links & set(links(result))
+
+
+def test_store_filter_matches_plain_filter_shuffled():
+    earlier, current, _ = build_feeds()
+    rng = random.Random(SEED + 1)
+    for _ in range(5):
+        rng.shuffle(current)
+        assert links(filter_with_store(earlier, current)) == links(filter_and_score_news(current, TARGET_DATE))
+
+
+if __name__ == "__main__":
+    test_store_filter_matches_plain_filter()
+    test_store_filter_matches_plain_filter_shuffled()
+    print("✅ 使用新聞項目儲存的篩選結果與直接篩選 RSS 結果完全相同")
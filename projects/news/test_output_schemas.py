@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+輸出 schema 與欄位重新生成的測試
+只重新生成無效欄位時，單位路徑必須經過 unit_key → patch_schema → apply_patch 正確往返：
+
+- 缺少的分類補上 default（空列表），不需要重新生成
+- alchemist.security_alerts[2] 無效時只重新生成這一則，其他新聞不變
+- integer 欄位不接受 bool
+- OpenAI strict 模式的 schema：每個物件 additionalProperties: false 且列出全部欄位為 required
+
+執行：python test_output_schemas.py 或 pytest test_output_schemas.py
+"""
+
+import sys
+import os
+import json
+from typing import Dict, List
+
+# 添加 scripts 目錄到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scripts'))
+
+from output_schemas import (
+    ALCHEMIST_CATEGORIES, OutputSchemaError, apply_defaults, apply_patch, format_path, get_schema,
+    invalid_units, openai_response_format, patch_schema, unit_key, validate
+)
+from ai_processor import enforce_schema
+
+ALCHEMIST_SCHEMA = get_schema('alchemist')
+
+
+def news_item(rank: int, title: str = '') -> Dict:
+    return {
+        'rank': rank,
+        'title': title or f"新聞 {rank}",
+        'detailed_content': f"第 {rank} 則新聞的內容",
+        'practical_takeaways': [f"重點 {rank}"],
+        'link': f"https://example.com/{rank}",
+    }
+
+
+def alchemist_document() -> Dict:
+    return {
+        'ai_applications_and_tools': [news_item(1), news_item(2)],
+        'industry_trends_and_news': [news_item(3)],
+        'security_alerts': [news_item(4), news_item(5), news_item(6), news_item(7)],
+        'perspectives_and_analysis': [],
+        'other': [news_item(8)],
+    }
+
+
+def test_valid_document():
+    assert validate(alchemist_document(), ALCHEMIST_SCHEMA) == []
+    # 分片的 <stage>#<n> 使用同一個 schema
+    assert get_schema('alchemist#3') is ALCHEMIST_SCHEMA
+    assert get_schema('html_generator') is None
+
+
+def test_missing_category_gets_default():
+    document = alchemist_document()
+    del document['perspectives_and_analysis']
+    del document['other']
+
+    errors = validate(document, ALCHEMIST_SCHEMA)
+    assert [error.path for error in errors] == [('perspectives_and_analysis',), ('other',)]
+
+    document = apply_defaults(document, ALCHEMIST_SCHEMA)
+    assert document['perspectives_and_analysis'] == [] and document['other'] == []
+    assert validate(document, ALCHEMIST_SCHEMA) == []
+    # default 是複製的，不會和 schema 共用同一個列表
+    document['other'].append(news_item(9))
+    assert ALCHEMIST_SCHEMA['properties']['other']['default'] == []
+
+
+def test_bool_rejected_for_integer():
+    document = alchemist_document()
+    document['security_alerts'][1]['rank'] = True
+    errors = validate(document, ALCHEMIST_SCHEMA)
+    assert len(errors) == 1
+    assert errors[0].path == ('security_alerts', 1, 'rank')
+    assert '應為 integer' in errors[0].message and 'bool' in errors[0].message
+
+    assert validate(True, {'type': 'number'}) != []
+    assert validate(1.5, {'type': 'integer'}) != []
+    assert validate(False, {'type': 'boolean'}) == []
+    assert validate(3, {'type': 'number'}) == []
+
+
+def test_unit_paths():
+    assert format_path(('security_alerts', 2, 'practical_takeaways', 0)) == 'security_alerts[2].practical_takeaways[0]'
+    assert format_path(()) == '(root)'
+
+    document = alchemist_document()
+    document['security_alerts'][2]['practical_takeaways'] = ['']
+    document['security_alerts'][2]['link'] = 42
+    document['other'][0]['title'] = '   '
+    document['industry_trends_and_news'] = 'not a list'
+    units = invalid_units(validate(document, ALCHEMIST_SCHEMA))
+    # 同一則新聞的多個錯誤歸併為一個單位；陣列元素以第一個索引為單位；非陣列錯誤以最上層欄位為單位
+    assert units == [('industry_trends_and_news',), ('security_alerts', 2), ('other', 0)]
+    assert [unit_key(unit) for unit in units] == [
+        'industry_trends_and_news', 'security_alerts__2', 'other__0'
+    ]
+
+
+def test_single_item_patch_round_trip():
+    document = alchemist_document()
+    document['security_alerts'][2]['title'] = ''
+    document['security_alerts'][2]['practical_takeaways'] = []
+
+    errors = validate(document, ALCHEMIST_SCHEMA)
+    units = invalid_units(errors)
+    assert units == [('security_alerts', 2)]
+
+    schema = patch_schema(ALCHEMIST_SCHEMA, units)
+    assert schema['required'] == ['security_alerts__2']
+    assert schema['properties']['security_alerts__2'] is ALCHEMIST_SCHEMA['properties']['security_alerts']['items']
+
+    fixed = news_item(6, '修正後的標題')
+    patched = apply_patch(document, units, {'security_alerts__2': fixed, 'security_alerts__3': news_item(99)})
+    assert validate(patched, ALCHEMIST_SCHEMA) == []
+    assert patched['security_alerts'][2] == fixed
+    # 只有這一則被替換（patch 中多出的欄位不會寫入），原文件不修改
+    expected = alchemist_document()
+    expected['security_alerts'][2] = fixed
+    assert patched == expected
+    assert document['security_alerts'][2]['title'] == ''
+
+    # patch 缺少單位時維持原值
+    assert apply_patch(document, units, {}) == document
+
+
+def test_enforce_schema_regenerates_only_invalid_item():
+    document = alchemist_document()
+    document['security_alerts'][2]['detailed_content'] = ''
+    del document['other']
+    requests: List[Dict] = []
+
+    def regenerate(fix_schema: Dict, instruction: str) -> str:
+        requests.append(fix_schema)
+        assert 'security_alerts__2' in instruction
+        return json.dumps({'security_alerts__2': news_item(6, '重新生成')}, ensure_ascii=False)
+
+    output = enforce_schema('alchemist#1', f"```json\n{json.dumps(document, ensure_ascii=False)}\n```",
+                            '數據煉金術師', regenerate)
+    result = json.loads(output)
+
+    assert [schema['required'] for schema in requests] == [['security_alerts__2']]
+    assert result['security_alerts'][2]['title'] == '重新生成'
+    assert result['other'] == []
+    for category in ALCHEMIST_CATEGORIES:
+        if category not in ('security_alerts', 'other'):
+            assert result[category] == document[category]
+    assert [item['rank'] for item in result['security_alerts']] == [4, 5, 6, 7]
+
+
+def test_enforce_schema_raises_when_patch_stays_invalid():
+    document = alchemist_document()
+    document['security_alerts'][2]['rank'] = 'three'
+
+    def regenerate(fix_schema: Dict, instruction: str) -> str:
+        return json.dumps({'security_alerts__2': {**news_item(6), 'rank': False}})
+
+    try:
+        enforce_schema('alchemist', json.dumps(document), '數據煉金術師', regenerate)
+    except OutputSchemaError as e:
+        assert 'security_alerts[2].rank' in str(e)
+    else:
+        raise AssertionError("重新生成後仍無效應該拋出 OutputSchemaError")
+
+
+def assert_strict(schema: Dict, path: str = '(root)'):
+    """OpenAI strict 模式：每個物件都 additionalProperties: false 且全部欄位為 required"""
+    for keyword in ('minLength', 'minItems', 'default'):
+        assert keyword not in schema, f"{path}: {keyword}"
+    if schema.get('type') == 'object':
+        assert schema['additionalProperties'] is False, path
+        assert schema['required'] == list(schema['properties']), path
+        for key, subschema in schema['properties'].items():
+            assert_strict(subschema, f"{path}.{key}")
+    if 'items' in schema:
+        assert_strict(schema['items'], f"{path}[]")
+
+
+def test_openai_strict_schema():
+    for stage in ('alchemist', 'narrator', 'editor'):
+        response_format = openai_response_format(stage, get_schema(stage))
+        assert response_format['type'] == 'json_schema'
+        assert response_format['json_schema']['strict'] is True
+        assert_strict(response_format['json_schema']['schema'])
+
+    # 原本不是每個欄位都 required 的物件，轉換後也全部列出
+    converted = openai_response_format('partial', {
+        'type': 'object',
+        'properties': {'a': {'type': 'string'}, 'b': {'type': 'integer', 'default': 0}},
+        'required': ['a'],
+    })['json_schema']['schema']
+    assert converted['required'] == ['a', 'b']
+    assert converted['properties']['b'] == {'type': 'integer'}
+
+    # patch schema 也能轉為 strict 模式（欄位名稱只有英數與底線）
+    patch = patch_schema(ALCHEMIST_SCHEMA, [('security_alerts', 2), ('other',)])
+    strict_patch = openai_response_format('alchemist_fix', patch)['json_schema']['schema']
+    assert_strict(strict_patch)
+    assert strict_patch['required'] == ['security_alerts__2', 'other']
+
+    # 轉換不修改原本的 schema
+    assert ALCHEMIST_SCHEMA['properties']['other']['default'] == []
+    assert 'additionalProperties' not in ALCHEMIST_SCHEMA
+
+
+if __name__ == "__main__":
+    test_valid_document()
+    test_missing_category_gets_default()
+    test_bool_rejected_for_integer()
+    test_unit_paths()
+    test_single_item_patch_round_trip()
+    test_enforce_schema_regenerates_only_invalid_item()
+    test_enforce_schema_raises_when_patch_stays_invalid()
+    test_openai_strict_schema()
+    print("✅ 輸出 schema 與欄位重新生成測試通過")
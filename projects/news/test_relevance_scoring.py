@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+相關性分數的一致性測試
+以原本逐一關鍵字比對的 calculate_relevance 為標準，在固定種子產生的新聞上比對：
+- Aho–Corasick 比對（pyahocorasick C 實作）
+- 純 Python 的 Aho–Corasick（未安裝 pyahocorasick 時的版本）
+- batch_scoring.score_batch（NumPy 命中矩陣）
+
+每一則的分數都必須完全相同
+
+執行：python test_relevance_scoring.py 或 pytest test_relevance_scoring.py
+"""
+
+import sys
+import os
+import random
+from typing import Dict, List
+
+import pytest
+
+# 添加 scripts 目錄到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scripts'))
+
+import keyword_matcher
+from news_filter import FILTERS, CompiledFilters
+from batch_scoring import score_batch
+
+SEED = 20260202
+CORPUS_SIZE = 3000
+
+
+def baseline_relevance(item: Dict) -> int:
+    """重構前 news_filter.calculate_relevance 的逐一關鍵字比對（比對標準，請勿修改）"""
+    title = item.get('title', '').lower()
+    content = item.get('content', '').lower()
+    full_text = f"{title} {content}"
+
+    source = item.get('source', 'unknown')
+    config = FILTERS['sources'].get(source, {
+        'priority_keywords': [],
+        'exclude': [],
+        'base_score': 0
+    })
+
+    score = config.get('base_score', 0)
+
+    for phrase in FILTERS['must_keep_phrases']:
+        if phrase.lower() in full_text:
+            return 100
+
+    for keyword in config.get('exclude', []):
+        if keyword.lower() in full_text:
+            score -= 5
+
+    for keyword in config.get('priority_keywords', []):
+        keyword_lower = keyword.lower()
+        if keyword_lower in title:
+            score += 10
+        elif keyword_lower in content:
+            score += 5
+
+    for keyword in FILTERS['taiwan_interests']:
+        if keyword.lower() in full_text:
+            score += 4
+
+    for keyword in FILTERS['global_taiwan_focus']:
+        if keyword.lower() in full_text:
+            score += 6
+
+    is_taiwan_source = source in ['technews', 'ithome', 'inside']
+    is_international_source = source in ['hackernews', 'techcrunch', 'openai']
+
+    if is_taiwan_source:
+        score += 5
+        if '國際' in full_text or 'global' in full_text:
+            score += 8
+
+    if is_international_source:
+        if 'taiwan' in full_text or 'asia' in full_text:
+            score += 10
+
+    practical_keywords = ['教學', 'tutorial', 'guide', '實測', '評測', '比較']
+    for keyword in practical_keywords:
+        if keyword in title:
+            score += 7
+
+    if len(content) > 300:
+        score += 2
+    if len(content) > 500:
+        score += 2
+
+    return score
+
+
+def build_corpus(seed: int = SEED, size: int = CORPUS_SIZE) -> List[Dict]:
+    """
+    產生測試新聞：隨機混入所有規則的關鍵字（含大小寫變化與跨越標題 / 內容邊界的片段），
+    內容長度集中在 300 / 500 字附近
+    """
+    rng = random.Random(seed)
+    keywords = list(FILTERS['must_keep_phrases']) + FILTERS['taiwan_interests'] + FILTERS['global_taiwan_focus']
+    for config in FILTERS['sources'].values():
+        keywords += config.get('priority_keywords', []) + config.get('exclude', [])
+    keywords += ['國際', 'global', 'taiwan', 'asia', '教學', 'tutorial', 'guide', '實測', '評測', '比較', 'Guide']
+    filler = ['the', 'new', 'model', '發布', '更新', 'data', '模型', 'open', 'source', '工具', 'a', 'of']
+    sources = list(FILTERS['sources']) + ['unknown', 'reddit']
+
+    def text(words: int, keyword_rate: float) -> str:
+        parts = []
+        for _ in range(words):
+            if rng.random() < keyword_rate:
+                keyword = rng.choice(keywords)
+                parts.append(rng.choice([keyword, keyword.upper(), keyword.lower(), keyword.title()]))
+            else:
+                parts.append(rng.choice(filler))
+        return rng.choice([' ', '', '-']).join(parts)
+
+    corpus = []
+    for _ in range(size):
+        title = text(rng.randint(0, 12), 0.15)
+        content = text(rng.randint(0, 40), 0.05)
+        target_length = rng.choice([0, 299, 300, 301, 499, 500, 501, rng.randint(0, 800)])
+        content = (content + ' ' + text(200, 0.02))[:target_length] if target_length else content
+        if rng.random() < 0.1 and title:
+            # 關鍵字跨越標題與內容的邊界
+            keyword = rng.choice(keywords)
+            cut = rng.randint(1, max(1, len(keyword) - 1))
+            title, content = title + keyword[:cut], keyword[cut:] + content
+        corpus.append({
+            'title': title,
+            'content': content,
+            'link': f"https://example.com/{len(corpus)}",
+            'source': rng.choice(sources)
+        })
+    return corpus
+
+
+def compile_without_pyahocorasick() -> CompiledFilters:
+    """以純 Python 的 Aho–Corasick 編譯 FILTERS"""
+    original = keyword_matcher.ahocorasick
+    keyword_matcher.ahocorasick = None
+    try:
+        return CompiledFilters(FILTERS)
+    finally:
+        keyword_matcher.ahocorasick = original
+
+
+def assert_same_scores(name: str, scores: List[int], expected: List[int], corpus: List[Dict]):
+    mismatches = [index for index, (score, want) in enumerate(zip(scores, expected)) if score != want]
+    assert len(scores) == len(expected), f"{name}: 分數數量不同"
+    assert not mismatches, (
+        f"{name}: {len(mismatches)} 則分數不同，例如 {corpus[mismatches[0]]!r}: "
+        f"{scores[mismatches[0]]} != {expected[mismatches[0]]}"
+    )
+
+
+CORPUS = build_corpus()
+EXPECTED = [baseline_relevance(item) for item in CORPUS]
+
+
+def test_corpus_covers_rules():
+    # 語料要涵蓋 must_keep（100 分）、扣分與一般加分
+    assert 100 in EXPECTED
+    assert min(EXPECTED) < 0
+    assert len(set(EXPECTED)) > 20
+
+
+def test_pyahocorasick_matches_baseline():
+    pytest.importorskip('ahocorasick')
+    compiled = CompiledFilters(FILTERS)
+    assert compiled.matcher._automaton is not None
+    assert_same_scores('pyahocorasick', [compiled.score(item) for item in CORPUS], EXPECTED, CORPUS)
+
+
+def test_pure_python_matches_baseline():
+    compiled = compile_without_pyahocorasick()
+    assert compiled.matcher._automaton is None
+    assert_same_scores('純 Python', [compiled.score(item) for item in CORPUS], EXPECTED, CORPUS)
+
+
+def test_score_batch_matches_baseline():
+    assert_same_scores('score_batch', score_batch(CORPUS), EXPECTED, CORPUS)
+    assert_same_scores('score_batch（純 Python）', score_batch(CORPUS, compile_without_pyahocorasick()),
+                       EXPECTED, CORPUS)
+
+
+if __name__ == "__main__":
+    test_corpus_covers_rules()
+    if keyword_matcher.ahocorasick is not None:
+        test_pyahocorasick_matches_baseline()
+    else:
+        print("⚠️  未安裝 pyahocorasick，略過 C 實作的比對")
+    test_pure_python_matches_baseline()
+    test_score_batch_matches_baseline()
+    print(f"✅ {len(CORPUS)} 則新聞的相關性分數與原本的逐一比對完全相同")
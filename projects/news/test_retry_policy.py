@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+重試策略測試
+以真正的 OpenAI / google.api_core 例外類型確認：
+- 哪些錯誤會重試（408 / 409 / 429 / 5xx、連線錯誤）與哪些直接拋出
+- 服務端建議的等待秒數：retry-after-ms、retry-after（秒數與 HTTP 日期）、
+  429 時的 x-ratelimit-reset-*、Gemini 訊息中的 "retry in Ns" 與 retry_delay
+- 流程截止時間對單次逾時與重試等待的限制
+
+執行：python test_retry_policy.py 或 pytest test_retry_policy.py
+"""
+
+import sys
+import os
+import time
+from contextlib import contextmanager
+from email.utils import formatdate
+from typing import Dict, List, Optional
+
+# 添加 scripts 目錄到路徑
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scripts'))
+
+import httpx
+import openai
+from google.api_core import exceptions as google_exceptions
+
+import retry_policy
+from retry_policy import (
+    Deadline, DeadlineExceededError, call_timeout, is_retryable, pipeline_deadline,
+    retry_after_seconds, retry_on_failure, status_code
+)
+
+REQUEST = httpx.Request('POST', 'https://api.openai.com/v1/chat/completions')
+
+OPENAI_ERRORS = {
+    400: openai.BadRequestError,
+    401: openai.AuthenticationError,
+    403: openai.PermissionDeniedError,
+    404: openai.NotFoundError,
+    409: openai.ConflictError,
+    422: openai.UnprocessableEntityError,
+    429: openai.RateLimitError,
+    500: openai.InternalServerError,
+}
+
+
+def openai_error(status: int, headers: Optional[Dict[str, str]] = None) -> openai.APIStatusError:
+    """SDK 收到非 2xx 回應時拋出的例外（沒有專屬類型的狀態碼為 APIStatusError）"""
+    response = httpx.Response(status, headers=headers or {}, request=REQUEST)
+    error_type = OPENAI_ERRORS.get(status, openai.APIStatusError)
+    return error_type(f"Error code: {status}", response=response, body=None)
+
+
+def google_error(status: int, message: str = 'error') -> google_exceptions.GoogleAPICallError:
+    return google_exceptions.from_http_status(status, message)
+
+
+@contextmanager
+def pipeline_time_budget(seconds: Optional[float]):
+    """暫時設定流程截止時間，結束後恢復為不限時"""
+    pipeline_deadline.reset(seconds)
+    try:
+        yield pipeline_deadline
+    finally:
+        pipeline_deadline.reset(None)
+
+
+@contextmanager
+def recorded_sleeps():
+    """以紀錄取代 time.sleep，回傳每次等待的秒數"""
+    sleeps: List[float] = []
+    original = retry_policy.time.sleep
+    retry_policy.time.sleep = sleeps.append
+    try:
+        yield sleeps
+    finally:
+        retry_policy.time.sleep = original
+
+
+# (錯誤, 狀態碼, 是否重試)
+RETRYABLE_CASES = [
+    (openai_error(400), 400, False),
+    (openai_error(401), 401, False),
+    (openai_error(403), 403, False),
+    (openai_error(404), 404, False),
+    (openai_error(408), 408, True),
+    (openai_error(409), 409, True),
+    (openai_error(422), 422, False),
+    (openai_error(429), 429, True),
+    (openai_error(500), 500, True),
+    (openai_error(502), 502, True),
+    (openai_error(503), 503, True),
+    (openai.APIConnectionError(request=REQUEST), None, True),
+    (openai.APITimeoutError(request=REQUEST), None, True),
+    (google_exceptions.InvalidArgument('bad'), 400, False),
+    (google_exceptions.Unauthenticated('key'), 401, False),
+    (google_exceptions.PermissionDenied('denied'), 403, False),
+    (google_exceptions.NotFound('model'), 404, False),
+    (google_error(408), 408, True),
+    (google_exceptions.Conflict('conflict'), 409, True),
+    (google_exceptions.Aborted('aborted'), 409, True),
+    (google_exceptions.TooManyRequests('quota'), 429, True),
+    (google_exceptions.ResourceExhausted('quota'), 429, True),
+    (google_exceptions.InternalServerError('oops'), 500, True),
+    (google_exceptions.ServiceUnavailable('down'), 503, True),
+    (google_exceptions.DeadlineExceeded('slow'), 504, True),
+    (ValueError('JSON 格式錯誤'), None, True),
+    (DeadlineExceededError('時間到'), None, False),
+]
+
+# (錯誤, 建議等待秒數)
+RETRY_AFTER_CASES = [
+    (openai_error(429, {'retry-after-ms': '1500'}), 1.5),
+    (openai_error(429, {'retry-after': '7'}), 7.0),
+    (openai_error(503, {'retry-after': '2.5'}), 2.5),
+    # retry-after-ms 優先於 retry-after；格式錯誤時改用 retry-after
+    (openai_error(429, {'retry-after-ms': '250', 'retry-after': '9'}), 0.25),
+    (openai_error(429, {'retry-after-ms': 'soon', 'retry-after': '9'}), 9.0),
+    # 429 沒有 retry-after 時取 x-ratelimit-reset-* 中較長者
+    (openai_error(429, {'x-ratelimit-reset-requests': '1s', 'x-ratelimit-reset-tokens': '6m0s'}), 360.0),
+    (openai_error(429, {'x-ratelimit-reset-tokens': '20ms'}), 0.02),
+    (openai_error(429, {'x-ratelimit-reset-requests': '1h2m3.5s'}), 3723.5),
+    (openai_error(429, {'x-ratelimit-reset-requests': 'unknown'}), None),
+    # 只有 429 的 reset 標頭代表要等待
+    (openai_error(500, {'x-ratelimit-reset-requests': '30s'}), None),
+    (openai_error(429), None),
+    (openai_error(400, {'retry-after': 'not a date'}), None),
+    (openai.APIConnectionError(request=REQUEST), None),
+    # Gemini：429 訊息中的建議等待時間
+    (google_exceptions.ResourceExhausted('Quota exceeded. Please retry in 23.5s.'), 23.5),
+    (google_exceptions.TooManyRequests('429 ... retryDelay: "41s" ...'), 41.0),
+    # gRPC 傳輸的錯誤細節
+    (google_exceptions.ResourceExhausted('429 Quota exceeded [violations {\n}\n, retry_delay {\n  seconds: 12\n}\n]'),
+     12.0),
+    (google_exceptions.ResourceExhausted('Resource has been exhausted'), None),
+    (google_exceptions.InternalServerError('Please retry in 5s'), None),
+]
+
+
+def test_status_code():
+    for error, status, _ in RETRYABLE_CASES:
+        assert status_code(error) == status, repr(error)
+
+
+def test_is_retryable():
+    for error, status, retryable in RETRYABLE_CASES:
+        assert is_retryable(error) is retryable, f"{type(error).__name__} ({status})"
+
+
+def test_retry_after_seconds():
+    for error, expected in RETRY_AFTER_CASES:
+        hint = retry_after_seconds(error)
+        if expected is None:
+            assert hint is None, f"{error!r}: {hint}"
+        else:
+            assert hint is not None and abs(hint - expected) < 1e-9, f"{error!r}: {hint} != {expected}"
+
+
+def test_retry_after_http_date():
+    future = openai_error(429, {'retry-after': formatdate(time.time() + 30, usegmt=True)})
+    assert 28 <= retry_after_seconds(future) <= 30
+    past = openai_error(503, {'retry-after': formatdate(time.time() - 60, usegmt=True)})
+    assert retry_after_seconds(past) == 0.0
+
+
+def test_deadline():
+    unlimited = Deadline()
+    assert unlimited.remaining() == float('inf')
+    unlimited.check()
+
+    deadline = Deadline(60)
+    assert 59 < deadline.remaining() <= 60
+    deadline.started_at -= 61
+    assert deadline.remaining() < 0
+    try:
+        deadline.check('數據煉金術師')
+    except DeadlineExceededError as e:
+        assert '數據煉金術師' in str(e)
+    else:
+        raise AssertionError("超過截止時間應該拋出 DeadlineExceededError")
+
+    # 0 或負數代表不限時
+    assert Deadline(0).remaining() == float('inf')
+
+
+def test_call_timeout_clamped_to_deadline():
+    with pipeline_time_budget(None):
+        assert call_timeout(120) == 120
+    with pipeline_time_budget(30):
+        assert 29 < call_timeout(120) <= 30
+        assert call_timeout(10) == 10
+    with pipeline_time_budget(30) as deadline:
+        deadline.started_at -= 29.5
+        # 剩餘時間少於最短逾時時仍給最短逾時
+        assert call_timeout(120) == 1.0
+        assert call_timeout(120, minimum=0.1) <= 0.5
+
+
+def test_retry_waits_for_server_hint():
+    calls = []
+
+    @retry_on_failure(max_retries=2, delay=100)
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise openai_error(429, {'retry-after': '4'})
+        return 'ok'
+
+    with pipeline_time_budget(None), recorded_sleeps() as sleeps:
+        assert flaky() == 'ok'
+    assert sleeps == [4.0, 4.0]
+
+
+def test_retry_hint_clamped_to_max_delay():
+    @retry_on_failure(max_retries=1, delay=1, max_delay=10)
+    def limited():
+        raise google_exceptions.ResourceExhausted('Please retry in 3600s')
+
+    with pipeline_time_budget(None), recorded_sleeps() as sleeps:
+        try:
+            limited()
+        except google_exceptions.ResourceExhausted:
+            pass
+    assert sleeps == [10]
+
+
+def test_retry_gives_up_when_wait_exceeds_deadline():
+    calls = []
+
+    @retry_on_failure(max_retries=3, delay=1)
+    def slow_quota():
+        calls.append(1)
+        raise openai_error(429, {'retry-after': '45'})
+
+    with pipeline_time_budget(30), recorded_sleeps() as sleeps:
+        try:
+            slow_quota()
+        except openai.RateLimitError:
+            pass
+        else:
+            raise AssertionError("剩餘時間不足時應該直接拋出")
+    assert calls == [1] and sleeps == []
+
+
+def test_non_retryable_raises_immediately():
+    calls = []
+
+    @retry_on_failure(max_retries=3, delay=1)
+    def bad_request():
+        calls.append(1)
+        raise openai_error(400)
+
+    with pipeline_time_budget(None), recorded_sleeps() as sleeps:
+        try:
+            bad_request()
+        except openai.BadRequestError:
+            pass
+    assert calls == [1] and sleeps == []
+
+
+def test_backoff_without_hint_is_bounded():
+    @retry_on_failure(max_retries=4, delay=2, max_delay=5)
+    def unavailable():
+        raise google_exceptions.ServiceUnavailable('down')
+
+    with pipeline_time_budget(None), recorded_sleeps() as sleeps:
+        try:
+            unavailable()
+        except google_exceptions.ServiceUnavailable:
+            pass
+    # d = 2, 4, 8→5, 16→5，各在 [d/2, d] 之間
+    ceilings = [2, 4, 5, 5]
+    assert len(sleeps) == len(ceilings)
+    for wait, ceiling in zip(sleeps, ceilings):
+        assert ceiling / 2 <= wait <= ceiling
+
+
+if __name__ == "__main__":
+    test_status_code()
+    test_is_retryable()
+    test_retry_after_seconds()
+    test_retry_after_http_date()
+    test_deadline()
+    test_call_timeout_clamped_to_deadline()
+    test_retry_waits_for_server_hint()
+    test_retry_hint_clamped_to_max_delay()
+    test_retry_gives_up_when_wait_exceeds_deadline()
+    test_non_retryable_raises_immediately()
+    test_backoff_without_hint_is_bounded()
+    print(f"✅ 重試策略測試通過（{len(RETRYABLE_CASES)} 種錯誤、{len(RETRY_AFTER_CASES)} 種等待提示）")